@@ -0,0 +1,200 @@
+"""
+封装解析服务API客户端
+所有请求共用一个 requests.Session（复用连接），批量保存使用有界线程池
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlencode
+
+import requests
+
+from .package_model import json_dumps, json_loads
+
+# 封装解析服务地址
+DEFAULT_API_BASE_URL = "https://aicomplib.top/api/packages"
+
+
+class SaveError(Exception):
+    """
+    保存失败；permanent 为 True 表示服务器明确拒绝了这条数据（重试也不会成功）
+    """
+
+    def __init__(self, message, permanent=False):
+        super().__init__(message)
+        self.permanent = permanent
+
+    @classmethod
+    def from_status(cls, status_code):
+        # 4xx 为请求本身的问题，超时（408）和限流（429）除外
+        permanent = 400 <= status_code < 500 and status_code not in (408, 429)
+        return cls(f"HTTP {status_code}", permanent)
+
+
+class PackageApiClient:
+    """
+    封装解析服务的HTTP客户端
+    """
+
+    def __init__(self, api_base_url, max_workers=4, batch_save=False):
+        """
+        Args:
+            batch_save: 服务器是否提供批量保存接口 PUT {api_base_url}/batch；
+                        该路径与 PUT {api_base_url}/{packageId} 重叠，无法可靠探测，只在明确配置时使用
+        """
+        self.api_base_url = api_base_url
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        # 连接池大小与线程池保持一致，避免并发保存时丢弃连接
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers,
+                                                pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # 是否使用批量保存接口；首次调用未成功时关闭，改为逐个保存
+        self.batch_save_supported = batch_save
+        # 批量接口是否已经成功调用过
+        self._batch_save_confirmed = False
+
+    def set_batch_save(self, enabled):
+        """
+        开启或关闭批量保存接口（重新开启时不沿用之前自动关闭的判断）
+        """
+        self.batch_save_supported = enabled
+        self._batch_save_confirmed = False
+
+    def upload_pdf(self, pdf_path, timeout=60):
+        """
+        上传PDF数据手册，返回原始响应
+        """
+        with open(pdf_path, 'rb') as f:
+            filename = os.path.basename(f.name)
+            files = {'file': (filename, f, 'application/pdf')}
+            return self.session.post(self.api_base_url + "/upload", files=files, timeout=timeout)
+
+    def fetch_packages(self, datasheet_uuid, timeout=30):
+        """
+        获取数据手册的封装解析结果，返回原始响应
+        """
+        url = f"{self.api_base_url}/{datasheet_uuid}"
+        return self.session.get(url, timeout=timeout)
+
+    def save_package(self, package_data, timeout=30):
+        """
+        保存单个封装数据，成功返回True
+
+        Raises:
+            SaveError: 服务器返回错误
+        """
+        params = {
+            'packageName': package_data['packageName'],
+            'pageNumbers': package_data['pageNumbers']
+        }
+        package_id = package_data['packageId']
+        url = f"{self.api_base_url}/{package_id}?{urlencode(params)}"
+
+        payload = {
+            'packageResult': json_dumps(package_data['packageResult'])
+        }
+
+        response = self.session.put(url, json=payload, timeout=timeout)
+        if response.status_code != 200:
+            raise SaveError.from_status(response.status_code)
+        return True
+
+    def save_packages_batch(self, package_data_list, timeout=60):
+        """
+        通过批量接口一次保存多个封装
+
+        Returns:
+            {packageId: (成功与否, 错误信息)}；批量接口调用失败时返回None（由调用方逐个保存）
+        """
+        payload = [{
+            'packageId': data['packageId'],
+            'packageName': data['packageName'],
+            'pageNumbers': data['pageNumbers'],
+            'packageResult': json_dumps(data['packageResult'])
+        } for data in package_data_list]
+
+        response = self.session.put(self.api_base_url + "/batch", json=payload, timeout=timeout)
+
+        if not 200 <= response.status_code < 300:
+            print(f"批量保存接口返回 HTTP {response.status_code}，改为逐个保存")
+            if not self._batch_save_confirmed:
+                # 从未成功过：视为服务器不支持批量接口，以后不再尝试
+                self.batch_save_supported = False
+            return None
+
+        self._batch_save_confirmed = True
+
+        # 服务器可以返回逐条结果 [{packageId, success, message}]，否则视为全部成功
+        results = {data['packageId']: (True, None) for data in package_data_list}
+        try:
+            body = json_loads(response.content)
+        except ValueError:
+            body = None
+        if isinstance(body, list):
+            for item in body:
+                if isinstance(item, dict) and item.get('packageId') in results:
+                    ok = bool(item.get('success', True))
+                    # 服务器对这条数据明确返回失败，重试也不会成功
+                    results[item['packageId']] = (
+                        ok, None if ok else SaveError(item.get('message', '未知错误'), permanent=True))
+        return results
+
+    def save_packages(self, package_data_list, on_result=None):
+        """
+        批量保存封装：配置了批量接口时优先使用，否则（或调用失败时）通过有界线程池并发保存
+
+        Args:
+            package_data_list: 封装数据列表
+            on_result: 每个封装完成时的回调 on_result(package_data, success, error)，
+                       在工作线程中调用；失败时 error 为 SaveError
+
+        Returns:
+            与 package_data_list 顺序一致的 [(package_data, success, error)]
+        """
+        if not package_data_list:
+            return []
+
+        if self.batch_save_supported and len(package_data_list) > 1:
+            try:
+                batch_results = self.save_packages_batch(package_data_list)
+            except Exception as e:
+                print(f"批量保存接口调用失败，改为逐个保存: {str(e)}")
+                batch_results = None
+
+            if batch_results is not None:
+                results = []
+                for data in package_data_list:
+                    success, error = batch_results[data['packageId']]
+                    if on_result:
+                        on_result(data, success, error)
+                    results.append((data, success, error))
+                return results
+
+        def save_one(data):
+            try:
+                self.save_package(data)
+                return True, None
+            except SaveError as e:
+                return False, e
+            except Exception as e:
+                # 网络错误等，稍后可以重试
+                return False, SaveError(str(e))
+
+        results = [None] * len(package_data_list)
+        workers = min(self.max_workers, len(package_data_list))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(save_one, data): idx
+                       for idx, data in enumerate(package_data_list)}
+            for future in as_completed(futures):
+                idx = futures[future]
+                data = package_data_list[idx]
+                success, error = future.result()
+                if on_result:
+                    on_result(data, success, error)
+                results[idx] = (data, success, error)
+        return results
+
+    def close(self):
+        """关闭会话"""
+        self.session.close()
@@ -0,0 +1,164 @@
+"""
+BGA/LGA 球阵列的植球图
+每一字母行用一个整数位图表示（第c位为1表示第c列有球），
+由去球描述（Ball Depopulation 参数）生成，生成封装时只处理实际存在的球
+"""
+import re
+
+from .geometry import bga_row_labels
+
+# 图案字符串中表示有球 / 无球的字符
+PRESENT_CHARS = '1Xx#'
+ABSENT_CHARS = '0.-_'
+
+
+class BallMap:
+    """
+    球阵列的位图，rows[k] 对应第k个字母行（A, B, ...）
+    """
+
+    __slots__ = ('count_x', 'count_y', 'rows')
+
+    def __init__(self, count_x, count_y):
+        self.count_x = count_x
+        self.count_y = count_y
+        full_row = (1 << count_x) - 1
+        self.rows = [full_row] * count_y
+
+    def remove_block(self, row_start, row_end, col_start, col_end):
+        """移除 [row_start, row_end) x [col_start, col_end) 范围内的球（超出阵列的部分忽略）"""
+        col_start = max(col_start, 0)
+        col_end = min(col_end, self.count_x)
+        if col_start >= col_end:
+            return
+        mask = ~(((1 << (col_end - col_start)) - 1) << col_start)
+        for row in range(max(row_start, 0), min(row_end, self.count_y)):
+            self.rows[row] &= mask
+
+    def keep_perimeter(self, rings):
+        """只保留最外面的 rings 圈"""
+        self.remove_block(rings, self.count_y - rings, rings, self.count_x - rings)
+
+    def remove_center(self, size_x, size_y):
+        """移除中心 size_x x size_y 的区域"""
+        row_start = (self.count_y - size_y) // 2
+        col_start = (self.count_x - size_x) // 2
+        self.remove_block(row_start, row_start + size_y, col_start, col_start + size_x)
+
+    def remove_corners(self, size):
+        """移除四个角各 size x size 的区域"""
+        for row_start in (0, self.count_y - size):
+            for col_start in (0, self.count_x - size):
+                self.remove_block(row_start, row_start + size, col_start, col_start + size)
+
+    def remove_ball(self, row, col):
+        self.rows[row] &= ~(1 << col)
+
+    @property
+    def is_full(self):
+        full_row = (1 << self.count_x) - 1
+        return all(row == full_row for row in self.rows)
+
+    def count(self):
+        """实际存在的球数"""
+        return sum(bin(row).count('1') for row in self.rows)
+
+    def columns(self, row):
+        """第 row 行存在的列号（从小到大），耗时与该行的球数成正比"""
+        bits = self.rows[row]
+        columns = []
+        while bits:
+            lowest = bits & -bits
+            columns.append(lowest.bit_length() - 1)
+            bits ^= lowest
+        return columns
+
+    def row_bytes(self, row):
+        """第 row 行位图的字节表示（低位在前，用于 NumPy 解包）"""
+        return self.rows[row].to_bytes((self.count_x + 7) // 8, 'little')
+
+
+def _int_arg(args, clause):
+    try:
+        value = int(args[0])
+    except (IndexError, ValueError):
+        raise ValueError(f"去球描述无效: {clause}")
+    if value <= 0:
+        raise ValueError(f"去球描述无效: {clause}")
+    return value
+
+
+def _size_arg(args, clause):
+    """解析 'N' 或 'WxH'"""
+    text = ''.join(args).lower().replace('×', 'x')
+    if 'x' in text:
+        width, _, height = text.partition('x')
+        return _int_arg([width], clause), _int_arg([height], clause)
+    size = _int_arg([text], clause)
+    return size, size
+
+
+def _apply_pattern(ball_map, rows, clause):
+    if len(rows) != ball_map.count_y:
+        raise ValueError(f"植球图行数({len(rows)})与Y方向球个数({ball_map.count_y})不一致")
+    for row, pattern in enumerate(rows):
+        if len(pattern) != ball_map.count_x:
+            raise ValueError(f"植球图第{row + 1}行的列数({len(pattern)})与X方向球个数"
+                             f"({ball_map.count_x})不一致")
+        for col, char in enumerate(pattern):
+            if char in ABSENT_CHARS:
+                ball_map.remove_ball(row, col)
+            elif char not in PRESENT_CHARS:
+                raise ValueError(f"植球图包含无效字符 '{char}': {clause}")
+
+
+def _apply_missing(ball_map, names, clause):
+    labels = {label: row for row, label in enumerate(bga_row_labels(ball_map.count_y))}
+    for name in names:
+        match = re.fullmatch(r'([A-Z]+)(\d+)', name.upper())
+        row = labels.get(match.group(1)) if match else None
+        col = int(match.group(2)) - 1 if match else -1
+        if row is None or not 0 <= col < ball_map.count_x:
+            raise ValueError(f"去球描述中的球编号无效: {name}")
+        ball_map.remove_ball(row, col)
+
+
+def parse_ball_map(text, count_x, count_y):
+    """
+    根据去球描述生成植球图，多条描述用分号分隔，依次应用：
+        perimeter N     只保留最外面的N圈（中心挖空）
+        center N / WxH  移除中心 NxN 或 WxH 的区域
+        corners N       移除四个角各 NxN 的区域
+        missing A1 B2   移除指定编号的球（逗号或空格分隔）
+        map XX.X/X..X   按行给出植球图（从A行开始，'/'分隔行；1/X/# 有球，0/./-/_ 无球）
+
+    Returns:
+        BallMap；描述为空时返回 None（完整阵列）
+    """
+    text = str(text or '').strip()
+    if not text:
+        return None
+
+    ball_map = BallMap(count_x, count_y)
+    for clause in re.split(r'[;；\n]', text):
+        clause = clause.strip()
+        if not clause:
+            continue
+        keyword, _, rest = clause.partition(' ')
+        keyword = keyword.lower()
+        args = [arg for arg in re.split(r'[,，\s]+', rest.strip()) if arg]
+
+        if keyword in ('perimeter', 'ring', 'rings'):
+            ball_map.keep_perimeter(_int_arg(args, clause))
+        elif keyword in ('center', 'centre', 'void'):
+            ball_map.remove_center(*_size_arg(args, clause))
+        elif keyword in ('corner', 'corners'):
+            ball_map.remove_corners(_int_arg(args, clause))
+        elif keyword == 'missing':
+            _apply_missing(ball_map, args, clause)
+        elif keyword == 'map':
+            _apply_pattern(ball_map, rest.replace(' ', '').split('/'), clause)
+        else:
+            raise ValueError(f"不支持的去球描述: {clause}")
+
+    return ball_map
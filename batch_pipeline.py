@@ -0,0 +1,305 @@
+"""
+批量数据手册处理流水线
+上传 -> 轮询解析结果 -> 生成封装，各阶段并发数独立限制，队列持久化以便中断后继续
+"""
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+
+from .families import FAMILIES
+from .package_model import PackageRecord, json_loads
+from .validation import validate_packages
+
+# 条目状态
+STATUS_PENDING = 'pending'
+STATUS_UPLOADING = 'uploading'
+STATUS_PARSING = 'parsing'
+STATUS_GENERATING = 'generating'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+
+def package_data_from_api(package):
+    """
+    将服务器返回的封装条目转换为生成封装所需的数据（packageResult 解析为字典）
+    """
+    return PackageRecord.from_api(package).to_package_data()
+
+
+def prepare_packages(package_list):
+    """
+    转换并一次性校验封装列表
+
+    Returns:
+        (可以生成的封装数据列表, 错误信息列表)
+    """
+    errors = []
+    packages = []
+    for package in package_list:
+        try:
+            packages.append(package_data_from_api(package))
+        except ValueError as e:
+            errors.append(f"{package.get('packageName', '')}: 参数解析失败 {str(e)}")
+
+    valid = []
+    results = validate_packages([(data['packageType'], data['packageResult']) for data in packages])
+    for package_data, package_errors in zip(packages, results):
+        package_type = str(package_data['packageType'] or '').upper()
+        if package_type not in FAMILIES:
+            errors.append(f"{package_data['packageName']}: 不支持的封装类型 {package_type}")
+        elif package_errors:
+            errors.extend(f"{package_data['packageName']}: {message}"
+                          for _, message in package_errors)
+        else:
+            valid.append(package_data)
+    return valid, errors
+
+
+class BatchQueue:
+    """
+    持久化的批量处理队列
+
+    每个条目：{pdfPath, pdfHash, uuid, status, packageCount, error, updatedAt}
+    """
+
+    def __init__(self, queue_path):
+        self.queue_path = queue_path
+        self._lock = threading.RLock()
+        self.items = []
+
+        queue_dir = os.path.dirname(queue_path)
+        if queue_dir:
+            os.makedirs(queue_dir, exist_ok=True)
+        try:
+            with open(queue_path, 'r', encoding='utf-8') as f:
+                self.items = json.load(f)
+        except (OSError, ValueError):
+            self.items = []
+
+    def save(self):
+        """原子写入队列文件"""
+        with self._lock:
+            tmp_path = self.queue_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.items, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.queue_path)
+
+    def add_paths(self, paths):
+        """
+        添加PDF文件，已在队列中的路径会被跳过
+
+        Returns:
+            新增的条目数
+        """
+        with self._lock:
+            known = {os.path.abspath(item['pdfPath']) for item in self.items}
+            added = 0
+            for path in paths:
+                path = os.path.abspath(path)
+                if path in known or not path.lower().endswith('.pdf'):
+                    continue
+                known.add(path)
+                self.items.append({
+                    'pdfPath': path,
+                    'pdfHash': None,
+                    'uuid': None,
+                    'status': STATUS_PENDING,
+                    'packageCount': 0,
+                    'error': '',
+                    'updatedAt': time.time()
+                })
+                added += 1
+            self.save()
+            return added
+
+    def add_directory(self, directory):
+        """添加目录下的所有PDF文件（不递归）"""
+        paths = [os.path.join(directory, name) for name in sorted(os.listdir(directory))]
+        return self.add_paths(p for p in paths if os.path.isfile(p))
+
+    def update(self, index, **fields):
+        """更新条目字段并持久化"""
+        with self._lock:
+            self.items[index].update(fields)
+            self.items[index]['updatedAt'] = time.time()
+            self.save()
+
+    def remove_finished(self):
+        """移除已完成的条目"""
+        with self._lock:
+            self.items = [item for item in self.items if item['status'] != STATUS_DONE]
+            self.save()
+
+    def reset_failed(self):
+        """将失败的条目重新排队"""
+        with self._lock:
+            for item in self.items:
+                if item['status'] == STATUS_FAILED:
+                    item['status'] = STATUS_PENDING if not item.get('uuid') else STATUS_PARSING
+                    item['error'] = ''
+            self.save()
+
+
+class BatchPipeline:
+    """
+    批量处理流水线
+
+    generate 回调签名为 generate(item, package_list) -> (成功数, 错误列表)，
+    在生成阶段的工作线程中调用（需要主线程的调用方自行转发）。
+    """
+
+    def __init__(self, batch_queue, api_client, generate, result_cache=None,
+                 upload_workers=2, poll_workers=4, generate_workers=1,
+                 poll_interval=3, poll_timeout=300, on_update=None):
+        self.batch_queue = batch_queue
+        self.api_client = api_client
+        self.generate = generate
+        self.result_cache = result_cache
+        self.upload_workers = upload_workers
+        self.poll_workers = poll_workers
+        self.generate_workers = generate_workers
+        self.poll_interval = poll_interval
+        self.poll_timeout = poll_timeout
+        self.on_update = on_update
+
+        self._upload_queue = queue.Queue()
+        self._poll_queue = queue.PriorityQueue()
+        self._generate_queue = queue.Queue()
+        self._poll_seq = itertools.count()
+        self._poll_started = {}
+        self._stopped = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """
+        启动流水线，按条目状态恢复到相应阶段
+        """
+        self._stopped.clear()
+        for index, item in enumerate(self.batch_queue.items):
+            self._enqueue(index, item['status'])
+
+        stages = ((self._upload_worker, self.upload_workers),
+                  (self._poll_worker, self.poll_workers),
+                  (self._generate_worker, self.generate_workers))
+        for target, count in stages:
+            for _ in range(max(1, count)):
+                thread = threading.Thread(target=target, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        """停止流水线（进行中的请求完成后退出，状态已持久化）"""
+        self._stopped.set()
+
+    def is_running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def _enqueue(self, index, status):
+        if status in (STATUS_PENDING, STATUS_UPLOADING):
+            self._upload_queue.put(index)
+        elif status in (STATUS_PARSING, STATUS_GENERATING):
+            self._schedule_poll(index, 0)
+
+    def _schedule_poll(self, index, delay):
+        self._poll_queue.put((time.time() + delay, next(self._poll_seq), index))
+
+    def _update(self, index, **fields):
+        self.batch_queue.update(index, **fields)
+        if self.on_update:
+            self.on_update(index, self.batch_queue.items[index])
+
+    def _upload_worker(self):
+        """上传阶段"""
+        while not self._stopped.is_set():
+            try:
+                index = self._upload_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            item = self.batch_queue.items[index]
+            self._update(index, status=STATUS_UPLOADING, error='')
+            try:
+                pdf_hash = item.get('pdfHash')
+                if self.result_cache:
+                    pdf_hash = pdf_hash or self.result_cache.file_hash(item['pdfPath'])
+                    cached = self.result_cache.lookup_by_hash(pdf_hash)
+                    if cached:
+                        # 已上传过的数据手册无需重复上传
+                        self._update(index, pdfHash=pdf_hash, uuid=cached['uuid'], status=STATUS_PARSING)
+                        self._schedule_poll(index, 0)
+                        continue
+
+                response = self.api_client.upload_pdf(item['pdfPath'], timeout=60)
+                if response.status_code != 200:
+                    raise Exception(f"上传失败: HTTP {response.status_code}")
+                result = json_loads(response.content)
+                if not result.get('success'):
+                    raise Exception(f"上传失败: {result.get('message', '未知错误')}")
+
+                datasheet_uuid = result.get('uuid')
+                if self.result_cache and pdf_hash:
+                    self.result_cache.remember_upload(pdf_hash, datasheet_uuid)
+                self._update(index, pdfHash=pdf_hash, uuid=datasheet_uuid, status=STATUS_PARSING)
+                self._schedule_poll(index, self.poll_interval)
+            except Exception as e:
+                self._update(index, status=STATUS_FAILED, error=str(e))
+
+    def _poll_worker(self):
+        """轮询解析结果阶段"""
+        while not self._stopped.is_set():
+            try:
+                due, seq, index = self._poll_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            wait = due - time.time()
+            if wait > 0:
+                # 还没到时间，放回队列（等待期间可被停止）
+                self._poll_queue.put((due, seq, index))
+                self._stopped.wait(min(wait, 0.5))
+                continue
+
+            item = self.batch_queue.items[index]
+            started = self._poll_started.setdefault(index, time.time())
+            try:
+                response = self.api_client.fetch_packages(item['uuid'], timeout=10)
+                package_list = json_loads(response.content) if response.status_code == 200 else None
+            except Exception as e:
+                print(f"批量获取解析结果错误: {str(e)}")
+                package_list = None
+
+            if package_list:
+                self._poll_started.pop(index, None)
+                if self.result_cache:
+                    self.result_cache.store_results(item['uuid'], item.get('pdfHash'), package_list)
+                self._update(index, status=STATUS_GENERATING, packageCount=len(package_list))
+                self._generate_queue.put((index, package_list))
+            elif time.time() - started > self.poll_timeout:
+                self._poll_started.pop(index, None)
+                self._update(index, status=STATUS_FAILED, error="解析超时")
+            else:
+                self._schedule_poll(index, self.poll_interval)
+
+    def _generate_worker(self):
+        """生成封装阶段"""
+        while not self._stopped.is_set():
+            try:
+                index, package_list = self._generate_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            item = self.batch_queue.items[index]
+            try:
+                generated, errors = self.generate(item, package_list)
+            except Exception as e:
+                self._update(index, status=STATUS_FAILED, error=str(e))
+                continue
+
+            if errors:
+                self._update(index, status=STATUS_FAILED,
+                             error=f"生成 {generated}/{len(package_list)}: " + "; ".join(errors))
+            else:
+                self._update(index, status=STATUS_DONE, error='')
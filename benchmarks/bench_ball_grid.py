@@ -0,0 +1,94 @@
+"""
+BGA球阵列计算耗时：逐个球计算（改为整体计算之前的做法）与 bga_ball_grid 在有/没有
+NumPy 时的耗时，并检查各种结果一致
+
+    python benchmarks/bench_ball_grid.py
+    python benchmarks/bench_ball_grid.py --sizes 100,316 --repeat 10
+"""
+import argparse
+
+from harness import best_of, load, print_table
+
+geometry = load('geometry')
+package_specs = load('package_specs')
+
+
+def bga_spec(count):
+    """count x count 的满阵列，A1在左下角（逐行倒序添加）"""
+    return package_specs.BgaSpec.from_params({
+        'Ball Pitch X': 0.8, 'Ball Pitch Y': 0.8,
+        'Ball Count X': count, 'Ball Count Y': count,
+        'Ball Diameter': 0.4,
+        'Package Body Size X': count * 0.8 + 1, 'Package Body Size Y': count * 0.8 + 1,
+        'A1 Ball Visual Location': 'lower left',
+    })
+
+
+def per_ball_grid(spec):
+    """
+    参照实现：从最上面一行开始逐个球计算编号和坐标，每个球单独判断A1方向
+    （A1在下方时最上面一行是最后一个字母行，A1在右侧时第1列在最右边）
+    """
+    row_letters = geometry.bga_row_labels(spec.count_y)
+    from_bottom = spec.a1_location not in ('upper left', 'upper right')
+    from_right = spec.a1_location in ('upper right', 'lower right')
+    numbers, x, y = [], [], []
+    for row in range(spec.count_y):
+        for col in range(spec.count_x):
+            letter_index = spec.count_y - 1 - row if from_bottom else row
+            numbers.append(f"{row_letters[letter_index]}{col + 1}")
+            x_pos = -spec.span_x / 2 + col * spec.pitch_x
+            x.append(-x_pos if from_right else x_pos)
+            y.append(-spec.span_y / 2 + row * spec.pitch_y)
+    return numbers, x, y
+
+
+def ball_grid(spec, use_numpy):
+    """bga_ball_grid，use_numpy 为 False 时临时停用 NumPy"""
+    saved = geometry.numpy
+    if not use_numpy:
+        geometry.numpy = None
+    try:
+        return geometry.bga_ball_grid(spec)
+    finally:
+        geometry.numpy = saved
+
+
+def as_lists(result):
+    """x、y 转为列表并按1nm取整（与写入文件时的精度一致），以便比较不同算法的结果"""
+    numbers, x, y = result
+    return numbers, [round(float(v), 6) for v in x], [round(float(v), 6) for v in y]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BGA球阵列计算耗时")
+    parser.add_argument('--sizes', default='100,200,316',
+                        help="每边球数，逗号分隔（默认 100,200,316，即1万到约10万个球）")
+    parser.add_argument('--repeat', type=int, default=5, help="每项重复次数，取最短耗时")
+    args = parser.parse_args(argv)
+
+    modes = [('Per-ball loop', per_ball_grid),
+             ('NumPy', lambda spec: ball_grid(spec, True)),
+             ('Pure Python', lambda spec: ball_grid(spec, False))]
+    if geometry.numpy is None:
+        print("未安装 NumPy，只测试纯Python实现")
+        del modes[1]
+
+    rows = []
+    for count in (int(n) for n in args.sizes.split(',')):
+        spec = bga_spec(count)
+        timings = []
+        results = []
+        for _, func in modes:
+            elapsed, result = best_of(lambda: func(spec), args.repeat)
+            timings.append(f"{elapsed * 1000:.1f} ms")
+            results.append(as_lists(result))
+        if any(result != results[0] for result in results):
+            raise SystemExit(f"{count}x{count}: 各实现的结果不一致")
+        rows.append([f"{count * count:,}".replace(',', ' ')] + timings)
+
+    print_table(["Balls"] + [name for name, _ in modes], rows)
+
+
+if __name__ == '__main__':
+    main()
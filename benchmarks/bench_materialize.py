@@ -0,0 +1,67 @@
+"""
+materializer 每个焊盘的 pcbnew 调用数和耗时（使用计数用的 pcbnew 替身，不需要KiCad）
+
+    python benchmarks/bench_materialize.py
+    python benchmarks/bench_materialize.py --baseline 52cd149^     # 与焊盘原型复制之前对比
+"""
+import argparse
+
+import pcbnew_stub
+from harness import best_of, load, load_revision, print_table
+
+pcbnew_stub.install()
+geometry = load('geometry')
+package_specs = load('package_specs')
+materializer = load('materializer')
+
+
+def bga_geometry(count):
+    """count x count 的满阵列BGA"""
+    spec = package_specs.BgaSpec.from_params({
+        'Ball Pitch X': 0.8, 'Ball Pitch Y': 0.8,
+        'Ball Count X': count, 'Ball Count Y': count,
+        'Ball Diameter': 0.4,
+        'Package Body Size X': count * 0.8 + 1, 'Package Body Size Y': count * 0.8 + 1,
+    })
+    return geometry.bga_geometry(f"BGA{count * count}", spec)
+
+
+def measure(module, footprint_geometry, repeat):
+    """
+    Returns:
+        (每个焊盘的调用数, 最短耗时秒)
+    """
+    pcbnew_stub.reset()
+    module.materialize(footprint_geometry, None)
+    calls = pcbnew_stub.calls
+    elapsed, _ = best_of(lambda: module.materialize(footprint_geometry, None), repeat)
+    return calls / len(footprint_geometry.pads), elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="materializer 每个焊盘的 pcbnew 调用数")
+    parser.add_argument('--count', type=int, default=100, help="BGA每边球数（默认100，即1万个焊盘）")
+    parser.add_argument('--repeat', type=int, default=5, help="重复次数，取最短耗时")
+    parser.add_argument('--baseline', metavar='REV',
+                        help="同时测试 git 历史中该版本的 materializer.py，如 52cd149^")
+    args = parser.parse_args(argv)
+
+    footprint_geometry = bga_geometry(args.count)
+    # 直接计算的几何数据没有内容哈希，不经过封装模板缓存，每次都完整创建
+    assert footprint_geometry.key is None
+
+    versions = []
+    if args.baseline:
+        versions.append((args.baseline, load_revision('materializer', args.baseline)))
+    versions.append(("Current", materializer))
+
+    rows = []
+    for name, module in versions:
+        per_pad, elapsed = measure(module, footprint_geometry, args.repeat)
+        rows.append([name, f"{per_pad:.1f}", f"{elapsed * 1000:.0f} ms"])
+    print_table(["Version", "pcbnew calls per pad",
+                 f"Time for {len(footprint_geometry.pads)} pads"], rows)
+
+
+if __name__ == '__main__':
+    main()
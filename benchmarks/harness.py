@@ -0,0 +1,60 @@
+"""
+性能测试公共部分
+插件目录本身就是Python包（目录名由安装位置决定），这里把上级目录加入 sys.path，
+测试脚本通过 load() 按模块名导入插件模块
+
+    python benchmarks/bench_ball_grid.py
+    python benchmarks/bench_materialize.py --baseline 52cd149^
+"""
+import importlib
+import os
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(ROOT)
+
+if os.path.dirname(ROOT) not in sys.path:
+    sys.path.insert(0, os.path.dirname(ROOT))
+
+
+def load(module_name):
+    """导入插件中的模块，如 load('geometry')"""
+    return importlib.import_module(f"{PACKAGE}.{module_name}")
+
+
+def load_revision(module_name, revision):
+    """
+    从 git 历史中的某个版本导入插件模块（与当前版本并存，用于对比优化前后）
+    """
+    source = subprocess.run(['git', 'show', f"{revision}:{module_name}.py"], cwd=ROOT,
+                            capture_output=True, text=True, encoding='utf-8', check=True).stdout
+    module = types.ModuleType(f"{PACKAGE}._{module_name}_at_{revision.replace('^', '_').replace('~', '_')}")
+    module.__package__ = PACKAGE
+    module.__file__ = f"{revision}:{module_name}.py"
+    exec(compile(source, module.__file__, 'exec'), module.__dict__)
+    return module
+
+
+def best_of(func, repeat=5):
+    """
+    重复运行 func，返回 (最短耗时秒, 最后一次的返回值)
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def print_table(headers, rows):
+    """以 Markdown 表格输出结果（可直接贴到提交说明中）"""
+    print("| " + " | ".join(headers) + " |")
+    print("|" + "|".join("-" * (len(header) + 2) for header in headers) + "|")
+    for row in rows:
+        print("| " + " | ".join(str(cell) for cell in row) + " |")
@@ -0,0 +1,115 @@
+"""
+计数用的 pcbnew 替身
+在没有KiCad的环境中代替 pcbnew，统计 materializer 调用 pcbnew 的次数
+（每次构造对象、调用方法或模块函数计一次），用来衡量每个焊盘跨越 SWIG 边界的调用数
+
+    import pcbnew_stub
+    pcbnew_stub.install()      # 必须在导入 materializer 之前
+    pcbnew_stub.reset()
+    ...
+    pcbnew_stub.calls          # 调用次数
+"""
+import sys
+import types
+
+import harness
+
+calls = 0
+
+CONSTANTS = ('F_Cu', 'F_Paste', 'F_Mask', 'F_SilkS', 'F_Fab', 'F_CrtYd',
+             'PAD_SHAPE_RECT', 'PAD_SHAPE_CIRCLE', 'PAD_ATTRIB_SMD',
+             'S_SEGMENT', 'S_RECT', 'S_CIRCLE', 'GR_TEXT_H_ALIGN_CENTER')
+
+
+def reset():
+    global calls
+    calls = 0
+
+
+def _count():
+    global calls
+    calls += 1
+
+
+def _counted(func):
+    def wrapper(*args):
+        _count()
+        return func(*args)
+    return wrapper
+
+
+class StubObject:
+    """
+    任意 Set*/Add* 等方法都接受并记录参数；Duplicate 复制已设置的属性
+    """
+
+    def __init__(self, *args):
+        _count()
+        self.values = {}
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        def method(*args):
+            _count()
+            self.values[name] = args
+        return method
+
+    def Duplicate(self):
+        _count()
+        clone = object.__new__(type(self))
+        clone.values = dict(self.values)
+        return clone
+
+
+class FOOTPRINT(StubObject):
+    def __init__(self, *args):
+        StubObject.__init__(self, *args)
+        self.items = []
+        self.reference = StubObject()
+        self.value = StubObject()
+
+    def Add(self, item):
+        _count()
+        self.items.append(item)
+
+    def Reference(self):
+        _count()
+        return self.reference
+
+    def Value(self):
+        _count()
+        return self.value
+
+
+class PAD(StubObject):
+    pass
+
+
+class PCB_SHAPE(StubObject):
+    pass
+
+
+class LSET(StubObject):
+    pass
+
+
+def install():
+    """
+    注册为 pcbnew 模块
+    插件包的 __init__ 在能导入 pcbnew 时会加载界面（需要 wx），所以先在没有 pcbnew 时导入插件包
+    """
+    harness.load('geometry')
+    module = types.ModuleType('pcbnew')
+    for name in CONSTANTS:
+        setattr(module, name, name)
+    module.FromMM = _counted(lambda mm: int(round(mm * 1e6)))
+    module.VECTOR2I = _counted(lambda x, y: (x, y))
+    module.LIB_ID = _counted(lambda library, name: name)
+    module.FOOTPRINT = FOOTPRINT
+    module.PAD = PAD
+    module.PCB_SHAPE = PCB_SHAPE
+    module.LSET = LSET
+    sys.modules['pcbnew'] = module
+    return module
@@ -0,0 +1,234 @@
+"""
+命令行批量生成封装（不依赖 pcbnew 和 wx，可在构建服务器上运行）
+
+读取 package_list 的JSON文件（或按数据手册UUID从服务器获取），
+校验参数后将每个封装写为封装库中的 .kicad_mod 文件，并输出每个封装的耗时；
+封装较多时分配到多个进程并行生成，输出与进程数无关
+
+    python -m <插件目录名>.cli packages.json -o Footprints.pretty
+    python -m <插件目录名>.cli --uuid <UUID> -o Footprints.pretty -j 8
+    python -m <插件目录名>.cli packages.json --benchmark 1,2,4,8
+"""
+import argparse
+import contextlib
+import hashlib
+import itertools
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .api_client import DEFAULT_API_BASE_URL, PackageApiClient
+from .batch_pipeline import prepare_packages
+from .families import build_geometry
+from .footprint_library import FOOTPRINT_SUFFIX, ensure_library, footprint_file_name
+from .kicad_mod_writer import save_footprint
+from .package_model import json_loads
+from .param_schema import normalize_params
+
+
+def load_package_list(path):
+    """
+    读取 package_list 的JSON文件
+    支持服务器返回的列表，以及本地解析结果缓存的条目（{packageList: [...]}）
+    """
+    with open(path, 'rb') as f:
+        data = json_loads(f.read())
+    if isinstance(data, dict):
+        data = data.get('packageList')
+    if not isinstance(data, list):
+        raise ValueError(f"{path} 不是封装列表")
+    return data
+
+
+def fetch_package_list(datasheet_uuid, api_base_url=DEFAULT_API_BASE_URL):
+    """
+    从服务器获取数据手册的封装解析结果
+    """
+    response = PackageApiClient(api_base_url).fetch_packages(datasheet_uuid, timeout=30)
+    if response.status_code != 200:
+        raise RuntimeError(f"获取 {datasheet_uuid} 失败: HTTP {response.status_code}")
+    return json_loads(response.content) or []
+
+
+def generate_package(package_data, library):
+    """
+    生成一个封装并写入封装库
+
+    Returns:
+        库中的文件路径
+    """
+    package_type = str(package_data['packageType'] or '').upper()
+    params = normalize_params(package_type, package_data['packageResult'], fill_defaults=True)
+    geometry = build_geometry(package_type, package_data['packageName'], params)
+    return save_footprint(geometry, library)
+
+
+def _init_worker():
+    """
+    子进程中的提示信息（如参数使用计算值）改为输出到 stderr，
+    避免与主进程按顺序输出的结果交错
+    """
+    sys.stdout = sys.stderr
+
+
+def _generate_one(package_data, library):
+    """
+    生成一个封装并直接写入封装库（模块级函数，子进程可以导入）
+
+    Returns:
+        (文件路径, 错误信息, 耗时秒)
+    """
+    start = time.perf_counter()
+    try:
+        path = generate_package(package_data, library)
+    except Exception as e:
+        return None, str(e), time.perf_counter() - start
+    return path, None, time.perf_counter() - start
+
+
+def _last_by_file_name(packages, errors, report):
+    """
+    同名（文件名相同）的封装只保留最后一个，与逐个生成时后者覆盖前者的结果一致，
+    也避免多个进程同时写同一个文件
+    """
+    last = {}
+    for index, package_data in enumerate(packages):
+        try:
+            last[footprint_file_name(package_data['packageName'])] = index
+        except ValueError as e:
+            errors.append(f"{package_data['packageName']}: {str(e)}")
+
+    keep = set(last.values())
+    for index, package_data in enumerate(packages):
+        if index not in keep and package_data['packageName']:
+            report(f"{package_data['packageName']}: 与后面的同名封装重名，已跳过")
+    return [package_data for index, package_data in enumerate(packages) if index in keep]
+
+
+def generate_library(package_list, library, report=print, workers=1):
+    """
+    批量生成封装到封装库
+
+    Args:
+        report: 输出每个封装结果的函数
+        workers: 并行生成的进程数；为1时在当前进程中生成
+
+    Returns:
+        (成功数, 错误信息列表)
+    """
+    library = ensure_library(library)
+    packages, errors = prepare_packages(package_list)
+    packages = _last_by_file_name(packages, errors, report)
+
+    generated = 0
+
+    def collect(results):
+        # 结果按输入顺序返回，输出顺序与进程数无关
+        nonlocal generated
+        for package_data, (path, error, elapsed) in zip(packages, results):
+            name = package_data['packageName']
+            if error is not None:
+                errors.append(f"{name}: 生成失败 {error}")
+                continue
+            generated += 1
+            report(f"{name}: {elapsed * 1000:.2f} ms -> {path}")
+
+    if workers > 1 and len(packages) > 1:
+        # 每个进程一次领取一批封装，减少进程间通信
+        chunksize = max(1, len(packages) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            collect(executor.map(_generate_one, packages, itertools.repeat(library),
+                                 chunksize=chunksize))
+    else:
+        collect(_generate_one(package_data, library) for package_data in packages)
+    return generated, errors
+
+
+def library_digest(library):
+    """
+    封装库中全部 .kicad_mod 文件（名称和内容）的SHA-256，用于比较输出是否一致
+    """
+    sha = hashlib.sha256()
+    for file_name in sorted(os.listdir(library)):
+        if file_name.endswith(FOOTPRINT_SUFFIX):
+            sha.update(file_name.encode('utf-8') + b'\0')
+            with open(os.path.join(library, file_name), 'rb') as f:
+                sha.update(f.read())
+    return sha.hexdigest()
+
+
+def benchmark(package_list, worker_counts=(1, 2, 4, 8), report=print):
+    """
+    用不同进程数生成同一批封装（写入临时目录），输出耗时并检查结果是否一致
+
+    Returns:
+        是否所有进程数的输出都一致
+    """
+    digests = set()
+    for workers in worker_counts:
+        # 生成过程中的提示信息输出到 stderr，只在 stdout 输出测试结果
+        with tempfile.TemporaryDirectory() as tmp_dir, contextlib.redirect_stdout(sys.stderr):
+            start = time.perf_counter()
+            generated, _ = generate_library(package_list, os.path.join(tmp_dir, "benchmark"),
+                                            report=lambda message: None, workers=workers)
+            elapsed = time.perf_counter() - start
+            digests.add(library_digest(os.path.join(tmp_dir, "benchmark.pretty")))
+        report(f"{workers} 个进程: {generated} 个封装，耗时 {elapsed:.2f} s"
+               f"（{generated / elapsed if elapsed else 0:.0f} 个/秒）")
+
+    if len(digests) > 1:
+        report("不同进程数生成的封装不一致")
+    return len(digests) <= 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="从封装解析结果批量生成KiCad封装库")
+    parser.add_argument('inputs', nargs='*', help="package_list 的JSON文件")
+    parser.add_argument('--uuid', action='append', default=[],
+                        help="从服务器获取该数据手册的解析结果（可重复）")
+    parser.add_argument('--api-url', default=DEFAULT_API_BASE_URL, help="封装解析服务地址")
+    parser.add_argument('-o', '--output', help="输出的封装库目录（.pretty）")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="并行生成的进程数（默认为CPU核数）")
+    parser.add_argument('--benchmark', metavar='N,N,...',
+                        help="只测试不同进程数的生成速度，如 1,2,4,8（不写输出目录）")
+    args = parser.parse_args(argv)
+
+    if not args.inputs and not args.uuid:
+        parser.error("需要指定JSON文件或 --uuid")
+    if not args.output and not args.benchmark:
+        parser.error("需要指定输出目录 -o")
+    if args.jobs < 1:
+        parser.error("进程数必须大于0")
+    try:
+        worker_counts = [int(n) for n in args.benchmark.split(',')] if args.benchmark else []
+    except ValueError:
+        parser.error(f"进程数列表无效: {args.benchmark}")
+
+    try:
+        package_list = []
+        for path in args.inputs:
+            package_list.extend(load_package_list(path))
+        for datasheet_uuid in args.uuid:
+            package_list.extend(fetch_package_list(datasheet_uuid, args.api_url))
+    except Exception as e:
+        print(f"读取封装列表失败: {str(e)}", file=sys.stderr)
+        return 2
+
+    if worker_counts:
+        return 0 if benchmark(package_list, worker_counts) else 1
+
+    start = time.perf_counter()
+    generated, errors = generate_library(package_list, args.output, workers=args.jobs)
+    elapsed = time.perf_counter() - start
+
+    for message in errors:
+        print(message, file=sys.stderr)
+    print(f"成功生成 {generated}/{len(package_list)} 个封装，耗时 {elapsed:.2f} s")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+支持的封装类型
+每种类型由 规格类（参数解析和校验）+ 几何函数 组成，新增类型只需在这里登记；
+计算结果按 (类型, 规范化参数, 生成器版本) 的哈希缓存，相同外形的不同型号共用
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from .geometry import (bga_geometry, dfn_geometry, qfn_geometry, qfp_geometry,
+                       soic_geometry, sot_geometry, tssop_geometry)
+from .package_specs import BgaSpec, DfnSpec, QfnSpec, QfpSpec, SoicSpec, SotSpec
+
+# 生成器版本：几何算法或输出格式变化时递增，使旧的缓存结果失效
+GENERATOR_VERSION = 4
+
+# 封装类型 -> (规格类, 几何函数)
+FAMILIES = {
+    'SOIC': (SoicSpec, soic_geometry),
+    'TSSOP': (SoicSpec, tssop_geometry),
+    'SOT': (SotSpec, sot_geometry),
+    'DFN': (DfnSpec, dfn_geometry),
+    'QFN': (QfnSpec, qfn_geometry),
+    'QFP': (QfpSpec, qfp_geometry),
+    'BGA': (BgaSpec, bga_geometry),
+}
+
+
+class LruCache:
+    """
+    有容量上限的缓存，超出时淘汰最久未使用的条目（线程安全）
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+_geometry_cache = LruCache(256)
+
+
+def geometry_key(package_type, params):
+    """
+    封装内容的哈希：类型 + 规范化参数 + 生成器版本（与封装名称无关）
+    """
+    payload = json.dumps([GENERATOR_VERSION, str(package_type or '').upper(), params],
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def build_geometry(package_type, package_name, params):
+    """
+    解析参数并计算封装几何数据；相同内容只计算一次
+
+    Args:
+        params: 规范化后的参数字典（见 param_schema.normalize_params）
+
+    Raises:
+        ValueError: 不支持的封装类型或参数无效
+    """
+    family = FAMILIES.get(str(package_type or '').upper())
+    if family is None:
+        raise ValueError(f"不支持的封装类型: {package_type}")
+
+    key = geometry_key(package_type, params)
+    geometry = _geometry_cache.get(key)
+    if geometry is None:
+        spec_class, geometry_function = family
+        geometry = geometry_function(package_name, spec_class.from_params(params))
+        geometry.key = key
+        _geometry_cache.put(key, geometry)
+    return geometry.renamed(package_name)
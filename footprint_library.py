@@ -0,0 +1,78 @@
+"""
+封装库（.pretty 目录）输出
+每个封装是库目录中的一个 .kicad_mod 文件，写入时先写临时文件再原子替换，
+生成过程中KiCad或其他进程读到的始终是完整的旧文件或新文件
+"""
+import os
+import re
+
+LIBRARY_SUFFIX = ".pretty"
+FOOTPRINT_SUFFIX = ".kicad_mod"
+
+# 文件名中不允许的字符（按Windows规则，兼容所有平台）
+_INVALID_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+def library_path(path):
+    """
+    规范化封装库路径（补全 .pretty 后缀）
+    """
+    path = os.path.abspath(os.path.expanduser(path))
+    if not path.lower().endswith(LIBRARY_SUFFIX):
+        path += LIBRARY_SUFFIX
+    return path
+
+
+def ensure_library(path):
+    """
+    创建封装库目录（已存在时不做任何事）
+
+    Returns:
+        规范化后的封装库路径
+    """
+    path = library_path(path)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def footprint_file_name(name):
+    """
+    封装名称对应的文件名（不允许的字符替换为下划线）
+    """
+    name = _INVALID_CHARS.sub('_', str(name)).strip(' .')
+    if not name:
+        raise ValueError("封装名称为空")
+    return name + FOOTPRINT_SUFFIX
+
+
+def footprint_path(library, name):
+    return os.path.join(library, footprint_file_name(name))
+
+
+def write_footprint(library, name, text):
+    """
+    原子写入封装文件：先写临时文件再替换
+
+    Args:
+        text: 文件内容，字符串或逐段生成文本的可迭代对象
+
+    Returns:
+        库中的文件路径
+    """
+    target = footprint_path(library, name)
+    tmp_path = target + ".tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+            if isinstance(text, str):
+                f.write(text)
+            else:
+                f.writelines(text)
+        os.replace(tmp_path, target)
+    except BaseException:
+        # 生成文本出错（或被中断）时删除写了一半的临时文件，库中原有的文件保持不变
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return target
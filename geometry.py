@@ -0,0 +1,532 @@
+"""
+封装几何计算
+只根据封装规格计算焊盘和各层图形（单位mm），不依赖 pcbnew，可以在KiCad之外运行和测试；
+结果由 materializer 一次性转换为 pcbnew 对象
+"""
+from collections import namedtuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# 焊盘形状
+PAD_RECT = 'rect'
+PAD_CIRCLE = 'circle'
+
+# 标准SMD焊盘层：顶层铜、焊膏、阻焊
+SMD_LAYERS = ('F.Cu', 'F.Paste', 'F.Mask')
+
+# BGA行名字母（JEDEC JEP95：不使用 I、O、Q、S、X、Z）
+JEDEC_ROW_LETTERS = "ABCDEFGHJKLMNPRTUVWY"
+
+# 各层线宽
+SILK_WIDTH = 0.12
+FAB_WIDTH = 0.1
+COURTYARD_WIDTH = 0.05
+
+# 图元（坐标单位mm，width 为线宽）
+Segment = namedtuple('Segment', ['x1', 'y1', 'x2', 'y2', 'width'])
+Rect = namedtuple('Rect', ['x1', 'y1', 'x2', 'y2', 'width'])
+Circle = namedtuple('Circle', ['cx', 'cy', 'radius', 'width'])
+Text = namedtuple('Text', ['text', 'layer', 'x', 'y', 'size', 'thickness'])
+
+
+class PadArray:
+    """
+    按列存储的焊盘数组：编号、中心坐标、尺寸、形状和层
+    """
+
+    __slots__ = ('numbers', 'x', 'y', 'w', 'h', 'shapes', 'layers')
+
+    def __init__(self):
+        self.numbers = []
+        self.x = []
+        self.y = []
+        self.w = []
+        self.h = []
+        self.shapes = []
+        self.layers = []
+
+    def add(self, number, x, y, w, h, shape=PAD_RECT, layers=SMD_LAYERS):
+        self.numbers.append(str(number))
+        self.x.append(x)
+        self.y.append(y)
+        self.w.append(w)
+        self.h.append(h)
+        self.shapes.append(shape)
+        self.layers.append(layers)
+
+    def extend(self, numbers, x, y, w, h, shape=PAD_RECT, layers=SMD_LAYERS):
+        """
+        批量添加同尺寸、同形状的一组焊盘（x、y 可以是 NumPy 数组）
+        """
+        count = len(numbers)
+        self.numbers.extend(numbers)
+        self.x.extend(x.tolist() if hasattr(x, 'tolist') else x)
+        self.y.extend(y.tolist() if hasattr(y, 'tolist') else y)
+        self.w.extend([w] * count)
+        self.h.extend([h] * count)
+        self.shapes.extend([shape] * count)
+        self.layers.extend([layers] * count)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __iter__(self):
+        """逐个焊盘返回 (编号, x, y, w, h, 形状, 层)"""
+        return zip(self.numbers, self.x, self.y, self.w, self.h, self.shapes, self.layers)
+
+
+class FootprintGeometry:
+    """
+    一个封装的全部几何数据
+    """
+
+    __slots__ = ('name', 'description', 'keywords', 'reference', 'value', 'pads', 'graphics', 'key')
+
+    def __init__(self, name, description, keywords, reference, value):
+        self.name = name
+        self.description = description
+        self.keywords = keywords
+        self.reference = reference  # Text
+        self.value = value          # Text
+        self.pads = PadArray()
+        self.graphics = {}          # 层名 -> [Segment / Rect / Circle]
+        self.key = None             # 内容哈希（由 families.build_geometry 设置，用于缓存）
+
+    def renamed(self, name):
+        """
+        换一个封装名称（焊盘和图形与原对象共用，生成后不再修改）
+        """
+        if name == self.name:
+            return self
+        geometry = FootprintGeometry(name, self.description, self.keywords,
+                                     self.reference, self.value._replace(text=name))
+        geometry.pads = self.pads
+        geometry.graphics = self.graphics
+        geometry.key = self.key
+        return geometry
+
+    def add(self, layer, primitive):
+        self.graphics.setdefault(layer, []).append(primitive)
+
+    def segment(self, layer, x1, y1, x2, y2, width):
+        self.add(layer, Segment(x1, y1, x2, y2, width))
+
+    def rect(self, layer, x1, y1, x2, y2, width):
+        self.add(layer, Rect(x1, y1, x2, y2, width))
+
+    def circle(self, layer, cx, cy, radius, width):
+        self.add(layer, Circle(cx, cy, radius, width))
+
+
+def _labels(name, ref_y, value_y):
+    """参考标识在丝印层、值在装配层，均水平居中"""
+    return (Text("REF**", 'F.SilkS', 0, ref_y, 1.0, 0.15),
+            Text(name, 'F.Fab', 0, value_y, 1.0, 0.15))
+
+
+def pad_row(pads, first_number, count, pitch, x, y, dx, dy, w, h, slots=None):
+    """
+    添加一排等间距焊盘，编号连续递增
+
+    Args:
+        count: 这一排的槽位数，槽位以 (x, y) 为中心对称排列
+        dx, dy: 编号递增的方向（单位向量）
+        w, h: 焊盘尺寸
+        slots: 实际放置焊盘的槽位（默认全部），如SOT-23中间空缺的引脚
+
+    Returns:
+        下一个焊盘编号
+    """
+    slots = range(count) if slots is None else slots
+    center = (count - 1) / 2
+    if numpy is not None:
+        offsets = (numpy.asarray(slots, dtype=float) - center) * pitch
+        xs = x + dx * offsets
+        ys = y + dy * offsets
+    else:
+        offsets = [(slot - center) * pitch for slot in slots]
+        xs = [x + dx * offset for offset in offsets]
+        ys = [y + dy * offset for offset in offsets]
+    numbers = [str(first_number + i) for i in range(len(offsets))]
+    pads.extend(numbers, xs, ys, w, h)
+    return first_number + len(numbers)
+
+
+def dual_rows(pads, count, pitch, row_spacing, pad_width, pad_length, slots=(None, None)):
+    """
+    左右两排焊盘（SOIC/TSSOP/SOT/DFN）：左排从上到下编号，右排从下到上继续
+
+    Returns:
+        下一个焊盘编号
+    """
+    number = pad_row(pads, 1, count, pitch, -row_spacing / 2, 0, 0, 1,
+                     pad_length, pad_width, slots[0])
+    return pad_row(pads, number, count, pitch, row_spacing / 2, 0, 0, -1,
+                   pad_length, pad_width, slots[1])
+
+
+# Pin 1所在角 -> 第一条边（逆时针 / 顺时针时的边顺序中的序号）
+QUAD_START_CCW = {'upper left': 0, 'lower left': 1, 'lower right': 2, 'upper right': 3}
+QUAD_START_CW = {'upper left': 0, 'upper right': 1, 'lower right': 2, 'lower left': 3}
+# Pin 1（BGA为A1）所在角相对左上角的镜像方向 (x, y)
+PIN1_CORNER_MIRROR = {'upper left': (1, 1), 'upper right': (-1, 1),
+                    'lower left': (1, -1), 'lower right': (-1, -1)}
+
+
+def quad_rows(pads, count_x, count_y, pitch_x, pitch_y, offset_x, offset_y,
+              pad_width, pad_length, pin1='upper left', clockwise=False):
+    """
+    四边焊盘（QFN/QFP），俯视逆时针编号时从Pin 1所在角沿边依次编号；
+    count_x 为上下两边的焊盘数，count_y 为左右两边的焊盘数，无法识别的Pin 1位置按左上角处理
+
+    Returns:
+        下一个焊盘编号
+    """
+    # 逆时针顺序：左边从上到下、底边从左到右、右边从下到上、顶边从右到左
+    sides = [
+        (count_y, pitch_y, -offset_x, 0, 0, 1, pad_length, pad_width),
+        (count_x, pitch_x, 0, offset_y, 1, 0, pad_width, pad_length),
+        (count_y, pitch_y, offset_x, 0, 0, -1, pad_length, pad_width),
+        (count_x, pitch_x, 0, -offset_y, -1, 0, pad_width, pad_length),
+    ]
+    start = QUAD_START_CCW
+    if clockwise:
+        # 顺时针：边的顺序和每条边的方向都反过来（从顶边向右开始）
+        sides = [(n, p, x, y, -dx, -dy, w, h) for n, p, x, y, dx, dy, w, h in reversed(sides)]
+        start = QUAD_START_CW
+
+    first = start.get(str(pin1 or '').lower(), 0)
+    number = 1
+    for side in sides[first:] + sides[:first]:
+        number = pad_row(pads, number, *side)
+    return number
+
+
+def _dual_row_outline(geometry, body_x, body_y, pad_span, pad_width, court_x, court_y):
+    """
+    两排焊盘封装的丝印、禁止布线层和装配层
+    丝印左侧线避开焊盘，Pin 1圆点在左上角外部，装配层左上角斜角
+    """
+    # 丝印层
+    x_silk = body_x / 2
+    y_silk = body_y / 2
+    silk_offset = 0.15  # 距离焊盘的间隙
+    y_top_pad = -pad_span / 2 - pad_width / 2
+    y_bottom_pad = pad_span / 2 + pad_width / 2
+
+    # 左侧线（分两段，避开焊盘）
+    if y_top_pad - silk_offset > -y_silk:
+        geometry.segment('F.SilkS', -x_silk, -y_silk, -x_silk, y_top_pad - silk_offset, SILK_WIDTH)
+    if y_bottom_pad + silk_offset < y_silk:
+        geometry.segment('F.SilkS', -x_silk, y_bottom_pad + silk_offset, -x_silk, y_silk, SILK_WIDTH)
+    # 右侧、顶部、底部线
+    geometry.segment('F.SilkS', x_silk, -y_silk, x_silk, y_silk, SILK_WIDTH)
+    geometry.segment('F.SilkS', -x_silk, -y_silk, x_silk, -y_silk, SILK_WIDTH)
+    geometry.segment('F.SilkS', -x_silk, y_silk, x_silk, y_silk, SILK_WIDTH)
+    # Pin 1标记（封装左上角外部的圆点）
+    geometry.circle('F.SilkS', -x_silk - 0.4, -y_silk - 0.4, 0.2, SILK_WIDTH)
+
+    # 禁止布线层
+    geometry.rect('F.CrtYd', -court_x, -court_y, court_x, court_y, COURTYARD_WIDTH)
+
+    # 装配层：主体轮廓和Pin 1斜角
+    x_fab = body_x / 2
+    y_fab = body_y / 2
+    geometry.rect('F.Fab', -x_fab, -y_fab, x_fab, y_fab, FAB_WIDTH)
+    chamfer = 0.5
+    if body_x >= chamfer and body_y >= chamfer:
+        geometry.segment('F.Fab', -x_fab, -y_fab + chamfer, -x_fab + chamfer, -y_fab, FAB_WIDTH)
+
+
+def _quad_outline(geometry, body_x, body_y, span_x, span_y, pad_width, court_x, court_y,
+                  pin1='upper left'):
+    """
+    四边焊盘封装的丝印、禁止布线层和装配层
+    丝印只画在焊盘之外的角上；按左上角为Pin 1计算标记、留空和斜角，再镜像到Pin 1所在的角
+    """
+    mirror_x, mirror_y = PIN1_CORNER_MIRROR.get(str(pin1 or '').lower(), (1, 1))
+
+    def silk(x1, y1, x2, y2):
+        geometry.segment('F.SilkS', x1 * mirror_x, y1 * mirror_y, x2 * mirror_x, y2 * mirror_y,
+                         SILK_WIDTH)
+
+    silk_x = body_x / 2
+    silk_y = body_y / 2
+    silk_offset = 0.15  # 距离焊盘的间隙
+
+    # 左侧焊盘占据的Y范围
+    left_pad_y_start = -span_y / 2 - pad_width / 2 - silk_offset
+    left_pad_y_end = span_y / 2 + pad_width / 2 + silk_offset
+    if left_pad_y_end < silk_y:
+        silk(-silk_x, left_pad_y_end, -silk_x, silk_y)
+    if left_pad_y_start > -silk_y + 0.5:  # 为Pin1标记留出空间
+        silk(-silk_x, -silk_y, -silk_x, left_pad_y_start - 0.5)
+
+    silk(silk_x, -silk_y, silk_x, silk_y)
+
+    # 顶部和底部焊盘占据的X范围
+    top_pad_x_start = -span_x / 2 - pad_width / 2 - silk_offset
+    top_pad_x_end = span_x / 2 + pad_width / 2 + silk_offset
+    if top_pad_x_start > -silk_x + 0.5:  # 为Pin1标记留出空间
+        silk(-silk_x + 0.5, -silk_y, top_pad_x_start, -silk_y)
+    if top_pad_x_end < silk_x:
+        silk(top_pad_x_end, -silk_y, silk_x, -silk_y)
+    if top_pad_x_start > -silk_x:
+        silk(-silk_x, silk_y, top_pad_x_start, silk_y)
+    if top_pad_x_end < silk_x:
+        silk(top_pad_x_end, silk_y, silk_x, silk_y)
+
+    # Pin 1标记（Pin 1所在角外部的圆点）
+    geometry.circle('F.SilkS', (-silk_x - 0.4) * mirror_x, (-silk_y - 0.4) * mirror_y, 0.2,
+                    SILK_WIDTH)
+
+    # 禁止布线层
+    geometry.rect('F.CrtYd', -court_x, -court_y, court_x, court_y, COURTYARD_WIDTH)
+
+    # 装配层：主体和Pin 1斜角
+    x_fab = body_x / 2
+    y_fab = body_y / 2
+    geometry.rect('F.Fab', -x_fab, -y_fab, x_fab, y_fab, FAB_WIDTH)
+    chamfer = 0.5
+    if body_x >= chamfer * 2 and body_y >= chamfer * 2:
+        geometry.segment('F.Fab', -x_fab * mirror_x, (-y_fab + chamfer) * mirror_y,
+                         (-x_fab + chamfer) * mirror_x, -y_fab * mirror_y, FAB_WIDTH)
+
+
+def _exposed_pad(geometry, spec, number):
+    """中心散热焊盘及其装配层轮廓（QFN/DFN）"""
+    if not spec.has_exposed_pad:
+        return
+    if spec.ep_land_x > 0 and spec.ep_land_y > 0:
+        geometry.pads.add(number, 0, 0, spec.ep_land_x, spec.ep_land_y)
+    geometry.rect('F.Fab', -spec.ep_size_x / 2, -spec.ep_size_y / 2,
+                  spec.ep_size_x / 2, spec.ep_size_y / 2, FAB_WIDTH)
+
+
+def soic_geometry(name, spec, family='SOIC', keywords="SOIC SO"):
+    """
+    SOIC封装（TSSOP等同类双排鸥翼封装共用）：左侧引脚从上到下为1..n/2，右侧从下到上继续编号
+    """
+    geometry = FootprintGeometry(
+        name, f"{family}, {spec.pin_count} Pin, pitch {spec.pitch}mm", keywords,
+        *_labels(name, -spec.body_length / 2 - 1.0, spec.body_length / 2 + 1.0))
+    dual_rows(geometry.pads, spec.pins_per_side, spec.pitch, spec.row_spacing,
+              spec.pad_width, spec.pad_length)
+    _dual_row_outline(geometry, spec.body_width, spec.body_length, spec.pad_span, spec.pad_width,
+                      spec.overall_width / 2 + 0.25, spec.body_length / 2 + 0.25)
+    return geometry
+
+
+def tssop_geometry(name, spec):
+    return soic_geometry(name, spec, 'TSSOP', "TSSOP SSOP")
+
+
+def sot_geometry(name, spec):
+    """
+    SOT-23 系列：两侧各3个槽位，按 SOT_SLOTS 放置引脚
+    """
+    geometry = FootprintGeometry(
+        name, f"SOT-23-{spec.pin_count}, pitch {spec.pitch}mm", "SOT SOT-23",
+        *_labels(name, -spec.body_length / 2 - 1.0, spec.body_length / 2 + 1.0))
+    dual_rows(geometry.pads, 3, spec.pitch, spec.row_spacing,
+              spec.pad_width, spec.pad_length, spec.slots)
+    _dual_row_outline(geometry, spec.body_width, spec.body_length, spec.pad_span, spec.pad_width,
+                      spec.overall_width / 2 + 0.25, spec.body_length / 2 + 0.25)
+    return geometry
+
+
+def dfn_geometry(name, spec):
+    """
+    DFN封装：左右两排焊盘，编号方式与SOIC相同，散热焊盘编号接在最后
+    """
+    geometry = FootprintGeometry(
+        name,
+        f"DFN, {spec.pin_count} Pin, pitch {spec.pitch}mm, body size {spec.body_x}x{spec.body_y}mm",
+        "DFN SON",
+        *_labels(name, -spec.body_y / 2 - 1.0, spec.body_y / 2 + 1.0))
+    number = dual_rows(geometry.pads, spec.pins_per_side, spec.pitch, spec.row_spacing,
+                       spec.pad_width, spec.pad_length)
+    _dual_row_outline(geometry, spec.body_x, spec.body_y, spec.pad_span, spec.pad_width,
+                      spec.body_x / 2 + spec.pad_length + 0.25, spec.body_y / 2 + 0.25)
+    _exposed_pad(geometry, spec, number)
+    return geometry
+
+
+def qfn_geometry(name, spec):
+    """
+    QFN封装：默认Pin 1在左上角，俯视逆时针编号（左侧从上到下、底部从左到右、右侧从下到上、顶部从右到左）
+    """
+    geometry = FootprintGeometry(
+        name,
+        f"QFN, {spec.total_pins} Pin ({spec.pin_count_x}x{spec.pin_count_y}), "
+        f"pitch {spec.pitch_x}mm x {spec.pitch_y}mm, "
+        f"body size {spec.body_x}x{spec.body_y}mm",
+        "QFN DFN",
+        *_labels(name, -spec.body_y / 2 - 1.0, spec.body_y / 2 + 1.0))
+    number = quad_rows(geometry.pads, spec.pin_count_x, spec.pin_count_y, spec.pitch_x, spec.pitch_y,
+                       spec.pad_offset_x, spec.pad_offset_y, spec.pad_width, spec.pad_length,
+                       spec.pin1_location, spec.clockwise)
+    _quad_outline(geometry, spec.body_x, spec.body_y, spec.span_x, spec.span_y, spec.pad_width,
+                  spec.body_x / 2 + spec.pad_length + 0.25, spec.body_y / 2 + spec.pad_length + 0.25,
+                  spec.pin1_location)
+    # 中心散热焊盘，编号接在周边焊盘之后
+    _exposed_pad(geometry, spec, number)
+    return geometry
+
+
+def qfp_geometry(name, spec):
+    """
+    QFP封装：编号方式与QFN相同，焊盘在封装体外、外端与引脚末端对齐
+    """
+    geometry = FootprintGeometry(
+        name,
+        f"QFP, {spec.total_pins} Pin ({spec.pin_count_x}x{spec.pin_count_y}), "
+        f"pitch {spec.pitch_x}mm x {spec.pitch_y}mm, "
+        f"body size {spec.body_x}x{spec.body_y}mm",
+        "QFP LQFP TQFP",
+        *_labels(name, -spec.overall_y / 2 - 1.0, spec.overall_y / 2 + 1.0))
+    quad_rows(geometry.pads, spec.pin_count_x, spec.pin_count_y, spec.pitch_x, spec.pitch_y,
+              spec.pad_offset_x, spec.pad_offset_y, spec.pad_width, spec.pad_length,
+              spec.pin1_location, spec.clockwise)
+    _quad_outline(geometry, spec.body_x, spec.body_y, spec.span_x, spec.span_y, spec.pad_width,
+                  spec.overall_x / 2 + 0.25, spec.overall_y / 2 + 0.25, spec.pin1_location)
+    return geometry
+
+
+_row_labels = []
+
+
+def _row_label(index):
+    """第 index 行（从0开始）的行名：A…Y, AA…AY, BA…BY, …, YY, AAA…"""
+    base = len(JEDEC_ROW_LETTERS)
+    label = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, base)
+        label = JEDEC_ROW_LETTERS[remainder] + label
+    return label
+
+
+def bga_row_labels(count):
+    """
+    返回前 count 个BGA行名
+    行名表只在需要更多行时扩展，所有封装共用
+    """
+    if count > len(_row_labels):
+        _row_labels.extend(_row_label(i) for i in range(len(_row_labels), count))
+    return _row_labels[:count]
+
+
+def bga_a1_mirror(spec):
+    """
+    A1所在角的镜像方向；无法识别的位置按默认的左下角处理
+    """
+    return PIN1_CORNER_MIRROR.get(spec.a1_location, PIN1_CORNER_MIRROR['lower left'])
+
+
+def bga_ball_grid(spec):
+    """
+    一次计算整个球阵列的编号和坐标（按添加顺序逐行排列）
+    按A1在左上角计算：第k个字母行位于 y = -span_y/2 + k*pitch_y，第c列位于 x = -span_x/2 + c*pitch_x，
+    再镜像到A1所在的角（A1在下方时A行在最下面，A1在右侧时第1列在最右边）；
+    添加顺序始终从最上面一行开始；有植球图时只计算实际存在的球
+
+    Returns:
+        (编号列表, x, y)，安装了 NumPy 时 x、y 为数组
+    """
+    row_letters = bga_row_labels(spec.count_y)
+    mirror_x, mirror_y = bga_a1_mirror(spec)
+    if mirror_y > 0:
+        letter_order = range(spec.count_y)
+    else:
+        letter_order = range(spec.count_y - 1, -1, -1)
+    col_names = [str(col + 1) for col in range(spec.count_x)]
+    if spec.ball_map is not None:
+        return _depopulated_ball_grid(spec, row_letters, letter_order, col_names,
+                                      mirror_x, mirror_y)
+
+    numbers = [row_letters[k] + col for k in letter_order for col in col_names]
+
+    if numpy is not None:
+        xs = (-spec.span_x / 2 + numpy.arange(spec.count_x) * spec.pitch_x) * mirror_x
+        ys = (-spec.span_y / 2 + numpy.array(letter_order) * spec.pitch_y) * mirror_y
+        return numbers, numpy.tile(xs, spec.count_y), numpy.repeat(ys, spec.count_x)
+
+    xs = [(-spec.span_x / 2 + col * spec.pitch_x) * mirror_x for col in range(spec.count_x)]
+    x = xs * spec.count_y
+    y = [(-spec.span_y / 2 + k * spec.pitch_y) * mirror_y for k in letter_order for _ in xs]
+    return numbers, x, y
+
+
+def _depopulated_ball_grid(spec, row_letters, letter_order, col_names, mirror_x, mirror_y):
+    """
+    按植球图逐行取出存在的球
+    """
+    ball_map = spec.ball_map
+    if numpy is not None:
+        # 每行位图解包为布尔掩码，再一次性取出所有存在的球
+        mask = numpy.unpackbits(
+            numpy.frombuffer(b''.join(ball_map.row_bytes(k) for k in letter_order), dtype=numpy.uint8)
+            .reshape(spec.count_y, -1), axis=1, bitorder='little')[:, :spec.count_x]
+        order_index, cols = numpy.nonzero(mask)
+        rows = numpy.asarray(letter_order)[order_index]
+        numbers = [row_letters[k] + col_names[c] for k, c in zip(rows.tolist(), cols.tolist())]
+        return (numbers, (-spec.span_x / 2 + cols * spec.pitch_x) * mirror_x,
+                (-spec.span_y / 2 + rows * spec.pitch_y) * mirror_y)
+
+    numbers, x, y = [], [], []
+    for k in letter_order:
+        y_pos = (-spec.span_y / 2 + k * spec.pitch_y) * mirror_y
+        for c in ball_map.columns(k):
+            numbers.append(row_letters[k] + col_names[c])
+            x.append((-spec.span_x / 2 + c * spec.pitch_x) * mirror_x)
+            y.append(y_pos)
+    return numbers, x, y
+
+
+def bga_geometry(name, spec):
+    """
+    BGA封装：球按 行字母 + 列号 编号（A1, A2, ..., B1, ...）
+    """
+    geometry = FootprintGeometry(
+        name,
+        f"BGA, {spec.total_balls} Ball ({spec.count_x}x{spec.count_y}), "
+        f"pitch {spec.pitch_x}mm x {spec.pitch_y}mm, "
+        f"ball dia {spec.ball_diameter}mm, body size {spec.body_x}x{spec.body_y}mm",
+        "BGA",
+        *_labels(name, -spec.body_y / 2 - 1.5, spec.body_y / 2 + 1.5))
+
+    # 焊盘（球）
+    numbers, x, y = bga_ball_grid(spec)
+    geometry.pads.extend(numbers, x, y, spec.ball_diameter, spec.ball_diameter, PAD_CIRCLE)
+
+    # 丝印层：比本体稍大的完整矩形框
+    silk_x = spec.body_x / 2 + 0.2
+    silk_y = spec.body_y / 2 + 0.2
+    geometry.segment('F.SilkS', -silk_x, -silk_y, -silk_x, silk_y, SILK_WIDTH)
+    geometry.segment('F.SilkS', silk_x, -silk_y, silk_x, silk_y, SILK_WIDTH)
+    geometry.segment('F.SilkS', -silk_x, -silk_y, silk_x, -silk_y, SILK_WIDTH)
+    geometry.segment('F.SilkS', -silk_x, silk_y, silk_x, silk_y, SILK_WIDTH)
+
+    # A1标记圆点（框内靠近A1的角）
+    mirror_x, mirror_y = bga_a1_mirror(spec)
+    geometry.circle('F.SilkS', (-silk_x + 0.3) * mirror_x, (-silk_y + 0.3) * mirror_y, 0.2,
+                    SILK_WIDTH)
+
+    # 禁止布线层：包含所有焊盘并外扩
+    x_court = spec.span_x / 2 + spec.ball_diameter / 2 + 0.25
+    y_court = spec.span_y / 2 + spec.ball_diameter / 2 + 0.25
+    geometry.rect('F.CrtYd', -x_court, -y_court, x_court, y_court, COURTYARD_WIDTH)
+
+    # 装配层：本体轮廓和A1角的斜角
+    x_fab = spec.body_x / 2
+    y_fab = spec.body_y / 2
+    geometry.rect('F.Fab', -x_fab, -y_fab, x_fab, y_fab, FAB_WIDTH)
+    chamfer = 0.5
+    geometry.segment('F.Fab', -x_fab * mirror_x, (-y_fab + chamfer) * mirror_y,
+                     (-x_fab + chamfer) * mirror_x, -y_fab * mirror_y, FAB_WIDTH)
+
+    return geometry
@@ -0,0 +1,133 @@
+"""
+KiCad 封装文件（.kicad_mod，S表达式）输出
+直接由 geometry 计算的几何数据逐行生成文本，不依赖 pcbnew，可以在KiCad之外运行；
+格式与 KiCad 7 保存的封装文件一致（KiCad 7 及以上版本均可读取）
+"""
+from .footprint_library import FOOTPRINT_SUFFIX, footprint_file_name, write_footprint
+from .geometry import PAD_CIRCLE, PAD_RECT, Circle, Rect, Segment
+
+# 文件格式版本（KiCad 7）
+FORMAT_VERSION = 20221018
+
+# 写入文件的生成器名称（文件不是 pcbnew 保存的，用本插件的名称）
+GENERATOR = "footprint_generator"
+
+# 内部单位：1nm，坐标按此精度取整（与 pcbnew.FromMM 一致）
+IU_PER_MM = 1000000
+
+PAD_SHAPES = {
+    PAD_RECT: 'rect',
+    PAD_CIRCLE: 'circle',
+}
+
+
+def _mm(value):
+    """
+    数值格式化为mm：按1nm取整，去掉多余的0（-0 写为 0）
+    """
+    iu = int(round(value * IU_PER_MM))
+    sign = '-' if iu < 0 else ''
+    whole, frac = divmod(abs(iu), IU_PER_MM)
+    if not frac:
+        return f"{sign}{whole}" if whole else "0"
+    return f"{sign}{whole}.{frac:06d}".rstrip('0')
+
+
+def _quote(text):
+    text = str(text).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'"{text}"'
+
+
+def _xy(x, y):
+    return f"{_mm(x)} {_mm(y)}"
+
+
+def _text(kind, text):
+    return (f"  (fp_text {kind} {_quote(text.text)} (at {_xy(text.x, text.y)}) "
+            f"(layer {_quote(text.layer)})\n"
+            f"    (effects (font (size {_xy(text.size, text.size)}) "
+            f"(thickness {_mm(text.thickness)})))\n"
+            f"  )\n")
+
+
+def _stroke(width):
+    return f"(stroke (width {_mm(width)}) (type solid))"
+
+
+def _graphic(layer, primitive):
+    layer = _quote(layer)
+    if isinstance(primitive, Segment):
+        return (f"  (fp_line (start {_xy(primitive.x1, primitive.y1)}) "
+                f"(end {_xy(primitive.x2, primitive.y2)})\n"
+                f"    {_stroke(primitive.width)} (layer {layer}))\n")
+    if isinstance(primitive, Rect):
+        return (f"  (fp_rect (start {_xy(primitive.x1, primitive.y1)}) "
+                f"(end {_xy(primitive.x2, primitive.y2)})\n"
+                f"    {_stroke(primitive.width)} (fill none) (layer {layer}))\n")
+    if isinstance(primitive, Circle):
+        return (f"  (fp_circle (center {_xy(primitive.cx, primitive.cy)}) "
+                f"(end {_xy(primitive.cx + primitive.radius, primitive.cy)})\n"
+                f"    {_stroke(primitive.width)} (fill none) (layer {layer}))\n")
+    raise ValueError(f"不支持的图元: {primitive!r}")
+
+
+def iter_kicad_mod(geometry):
+    """
+    逐段生成 .kicad_mod 文本：属性、文本、各层图形、焊盘
+
+    Args:
+        geometry: geometry.FootprintGeometry
+    """
+    yield (f"(footprint {_quote(geometry.name)} (version {FORMAT_VERSION}) "
+           f"(generator {GENERATOR})\n")
+    yield '  (layer "F.Cu")\n'
+    if geometry.description:
+        yield f"  (descr {_quote(geometry.description)})\n"
+    if geometry.keywords:
+        yield f"  (tags {_quote(geometry.keywords)})\n"
+    yield "  (attr smd)\n"
+
+    yield _text('reference', geometry.reference)
+    yield _text('value', geometry.value)
+
+    for layer, primitives in geometry.graphics.items():
+        for primitive in primitives:
+            yield _graphic(layer, primitive)
+
+    # 相同层组合只格式化一次
+    layer_lists = {}
+    for number, x, y, w, h, shape, layers in geometry.pads:
+        layer_list = layer_lists.get(layers)
+        if layer_list is None:
+            layer_list = layer_lists[layers] = ' '.join(_quote(layer) for layer in layers)
+        yield (f"  (pad {_quote(number)} smd {PAD_SHAPES[shape]} (at {_xy(x, y)}) "
+               f"(size {_xy(w, h)}) (layers {layer_list}))\n")
+
+    yield ")\n"
+
+
+def footprint_text(geometry):
+    """
+    完整的 .kicad_mod 文本
+    """
+    return ''.join(iter_kicad_mod(geometry))
+
+
+def write_kicad_mod(geometry, stream):
+    """
+    将封装逐段写入已打开的文本流
+    """
+    for chunk in iter_kicad_mod(geometry):
+        stream.write(chunk)
+
+
+def save_footprint(geometry, library):
+    """
+    将封装写入封装库（.pretty 目录），原子替换已有文件
+    库中的封装名称即文件名，名称中文件名不允许的字符替换为下划线
+
+    Returns:
+        库中的文件路径
+    """
+    name = footprint_file_name(geometry.name)[:-len(FOOTPRINT_SUFFIX)]
+    return write_footprint(library, name, iter_kicad_mod(geometry.renamed(name)))
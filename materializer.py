@@ -0,0 +1,162 @@
+"""
+将 geometry 计算出的封装几何数据一次性转换为 pcbnew 对象
+"""
+import pcbnew
+
+from .families import LruCache
+from .geometry import PAD_CIRCLE, PAD_RECT, Circle, Rect, Segment
+
+# 层名 -> pcbnew 层号
+LAYERS = {
+    'F.Cu': pcbnew.F_Cu,
+    'F.Paste': pcbnew.F_Paste,
+    'F.Mask': pcbnew.F_Mask,
+    'F.SilkS': pcbnew.F_SilkS,
+    'F.Fab': pcbnew.F_Fab,
+    'F.CrtYd': pcbnew.F_CrtYd,
+}
+
+# 每毫米的内部单位数（焊盘位置在Python中直接换算，减少逐个焊盘调用 FromMM）
+IU_PER_MM = pcbnew.FromMM(1.0)
+
+PAD_SHAPES = {
+    PAD_RECT: pcbnew.PAD_SHAPE_RECT,
+    PAD_CIRCLE: pcbnew.PAD_SHAPE_CIRCLE,
+}
+
+# (内容哈希, 封装名称) -> 封装模板；模板不属于任何板子，每次返回它的副本并设置所属板子
+# （未保存的板子没有文件名，板子关闭后其对象也会释放，所以模板不能引用板子）
+_footprint_cache = LruCache(64)
+
+
+def _point(x, y):
+    return pcbnew.VECTOR2I(pcbnew.FromMM(x), pcbnew.FromMM(y))
+
+
+def _apply_text(field, text):
+    field.SetText(text.text)
+    field.SetLayer(LAYERS[text.layer])
+    field.SetPosition(_point(text.x, text.y))
+    field.SetTextSize(_point(text.size, text.size))
+    field.SetTextThickness(pcbnew.FromMM(text.thickness))
+    field.SetHorizJustify(pcbnew.GR_TEXT_H_ALIGN_CENTER)
+
+
+def _layer_set(layers):
+    layerset = pcbnew.LSET()
+    for layer in layers:
+        layerset.AddLayer(LAYERS[layer])
+    return layerset
+
+
+def _clone(item, item_class=pcbnew.PAD):
+    """
+    复制焊盘或封装（Duplicate 会分配新的UUID）；部分KiCad版本返回 BOARD_ITEM，需要转换回原类型
+    """
+    clone = item.Duplicate()
+    return clone if isinstance(clone, item_class) else clone.Cast()
+
+
+def _add_shape(footprint, layer, primitive):
+    shape = pcbnew.PCB_SHAPE(footprint)
+    if isinstance(primitive, Segment):
+        shape.SetShape(pcbnew.S_SEGMENT)
+        shape.SetStart(_point(primitive.x1, primitive.y1))
+        shape.SetEnd(_point(primitive.x2, primitive.y2))
+    elif isinstance(primitive, Rect):
+        shape.SetShape(pcbnew.S_RECT)
+        shape.SetStart(_point(primitive.x1, primitive.y1))
+        shape.SetEnd(_point(primitive.x2, primitive.y2))
+    elif isinstance(primitive, Circle):
+        shape.SetShape(pcbnew.S_CIRCLE)
+        shape.SetCenter(_point(primitive.cx, primitive.cy))
+        shape.SetRadius(pcbnew.FromMM(primitive.radius))
+    else:
+        raise ValueError(f"不支持的图元: {primitive!r}")
+    shape.SetLayer(LAYERS[layer])
+    shape.SetWidth(pcbnew.FromMM(primitive.width))
+    footprint.Add(shape)
+
+
+def materialize(geometry, board):
+    """
+    创建 pcbnew.FOOTPRINT；已生成过的相同封装直接复制缓存的模板
+
+    Args:
+        geometry: geometry.FootprintGeometry
+        board: 封装所属的板子
+
+    Returns:
+        pcbnew.FOOTPRINT（尚未添加到板子）
+    """
+    if geometry.key is None:
+        return _build_footprint(geometry, board)
+
+    key = (geometry.key, geometry.name)
+    template = _footprint_cache.get(key)
+    if template is None:
+        template = _build_footprint(geometry, None)
+        _footprint_cache.put(key, template)
+    footprint = _clone(template, pcbnew.FOOTPRINT)
+    footprint.SetParent(board)
+    return footprint
+
+
+def _build_footprint(geometry, board):
+    """
+    依次添加文本、焊盘和各层图形
+
+    Args:
+        board: 所属的板子；缓存的模板为 None
+    """
+    footprint = pcbnew.FOOTPRINT(board)
+    footprint.SetFPID(pcbnew.LIB_ID("", geometry.name))
+    footprint.SetLibDescription(geometry.description)
+    footprint.SetKeywords(geometry.keywords)
+
+    footprint.SetReference(geometry.reference.text)
+    _apply_text(footprint.Reference(), geometry.reference)
+    footprint.SetValue(geometry.value.text)
+    _apply_text(footprint.Value(), geometry.value)
+
+    # 形状、尺寸和层相同的焊盘只完整设置第一个，其余复制同类的上一个焊盘后设置编号和位置；
+    # 与上一个焊盘在同一行（列）时只需 SetX（SetY），不必构造 VECTOR2I。
+    # 每个焊盘调用 Duplicate、SetNumber、SetX/SetY、Add 共4次（换行时多一次 VECTOR2I）；
+    # 相同层组合共用一个层集合
+    layer_sets = {}
+    previous = {}  # (形状, 尺寸, 层) -> (上一个焊盘, x, y)，坐标为内部单位
+    for number, x, y, w, h, shape, layers in geometry.pads:
+        key = (shape, w, h, layers)
+        x = int(round(x * IU_PER_MM))
+        y = int(round(y * IU_PER_MM))
+        last = previous.get(key)
+        if last is None:
+            layerset = layer_sets.get(layers)
+            if layerset is None:
+                layerset = layer_sets[layers] = _layer_set(layers)
+            pad = pcbnew.PAD(footprint)
+            pad.SetShape(PAD_SHAPES[shape])
+            pad.SetAttribute(pcbnew.PAD_ATTRIB_SMD)
+            pad.SetSize(_point(w, h))
+            pad.SetLayerSet(layerset)
+            pad.SetPosition(pcbnew.VECTOR2I(x, y))
+        else:
+            last_pad, last_x, last_y = last
+            pad = _clone(last_pad)
+            if y == last_y:
+                pad.SetX(x)
+            elif x == last_x:
+                pad.SetY(y)
+            else:
+                pad.SetPosition(pcbnew.VECTOR2I(x, y))
+        previous[key] = (pad, x, y)
+
+        pad.SetNumber(number)
+        footprint.Add(pad)
+
+    for layer, primitives in geometry.graphics.items():
+        for primitive in primitives:
+            _add_shape(footprint, layer, primitive)
+
+    return footprint
+
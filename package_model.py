@@ -0,0 +1,165 @@
+"""
+封装数据的内存模型
+服务器返回的 packageResult 是嵌在JSON里的JSON字符串，获取后只解码一次；
+安装了 orjson 时使用它作为更快的JSON后端
+"""
+import json
+
+from .param_schema import normalize_params
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data):
+    """
+    解析JSON（str 或 bytes）
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """
+    编码为JSON字符串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False)
+
+
+_MISSING = object()
+
+
+class PackageRecord:
+    """
+    单个封装的解码结果
+    """
+
+    __slots__ = ('package_id', 'package_type', 'package_name', 'page_numbers', 'params', 'errors')
+
+    def __init__(self, package_id, package_type, package_name, page_numbers, params):
+        self.package_id = package_id
+        self.package_type = package_type
+        self.package_name = package_name
+        self.page_numbers = page_numbers
+        self.params = params  # 参数名 -> 数值（保持服务器顺序）
+        self.errors = {}      # 参数名 -> 最近一次校验的错误信息（界面标红用）
+
+    @classmethod
+    def from_api(cls, package):
+        """
+        从服务器返回的封装条目创建，packageResult 在这里一次性解码，
+        并按参数模式规范化参数名称和类型
+        """
+        package_result = package.get('packageResult') or '{}'
+        if isinstance(package_result, (str, bytes)):
+            try:
+                params = json_loads(package_result)
+            except ValueError as e:
+                print(f"解析封装参数失败: {str(e)}")
+                params = {}
+        else:
+            params = dict(package_result)
+
+        if not isinstance(params, dict):
+            print(f"封装参数格式错误: {package_result!r}")
+            params = {}
+
+        package_type = package.get('packageType', '') or ''
+        return cls(package.get('packageId'),
+                   package_type,
+                   package.get('packageName', '') or '',
+                   package.get('pageNumbers', '') or '',
+                   normalize_params(package_type, params))
+
+    def copy(self):
+        """
+        复制记录（参数字典独立，不重新解码）
+        """
+        return PackageRecord(self.package_id, self.package_type, self.package_name,
+                             self.page_numbers, dict(self.params))
+
+    def update_from(self, base, new):
+        """
+        三方合并：只有 new 相对 base（上一次的服务器结果）变化了的字段才写入，
+        其余字段保留当前值（包括用户尚未保存的编辑）
+
+        Returns:
+            是否有字段被修改
+        """
+        changed = False
+        for name in ('package_type', 'package_name', 'page_numbers'):
+            value = getattr(new, name)
+            if value != getattr(base, name) and value != getattr(self, name):
+                setattr(self, name, value)
+                changed = True
+
+        for key, value in new.params.items():
+            if base.params.get(key, _MISSING) != value and self.params.get(key, _MISSING) != value:
+                self.params[key] = value
+                changed = True
+        for key in base.params:
+            if key not in new.params and key in self.params:
+                del self.params[key]
+                changed = True
+        return changed
+
+    def to_package_data(self, as_text=False):
+        """
+        转换为生成/保存使用的封装数据（packageResult 为参数字典）
+
+        Args:
+            as_text: 参数值统一转为字符串并去掉无名称的参数（与界面编辑后保存的格式一致）
+        """
+        if as_text:
+            params = {key: value if isinstance(value, str) else str(value)
+                      for key, value in self.params.items() if key}
+        else:
+            params = dict(self.params)
+        return {
+            'packageId': self.package_id,
+            'packageType': self.package_type,
+            'packageName': self.package_name,
+            'pageNumbers': self.page_numbers,
+            'packageResult': params
+        }
+
+
+def decode_package_list(package_list):
+    """
+    将服务器返回的 package_list 解码为 PackageRecord 列表
+    """
+    return [PackageRecord.from_api(package) for package in package_list or []]
+
+
+def reconcile_records(records, base_records, new_records):
+    """
+    按 packageId 将新的解析结果合并到已有记录上（原地更新，保持对象不变）
+
+    Args:
+        records: 当前显示的 PackageRecord 列表
+        base_records: 生成 records 时的服务器结果（已解码，用于三方合并）
+        new_records: 新的服务器结果（已解码，之后作为下一次合并的 base_records，不会被修改）
+
+    Returns:
+        (新的记录列表（顺序与 new_records 一致）, 内容有变化的已有记录的 packageId 集合)
+    """
+    existing = {record.package_id: record for record in records
+                if record.package_id is not None}
+    base = {record.package_id: record for record in base_records}
+
+    result = []
+    changed = set()
+    for new in new_records:
+        record = existing.pop(new.package_id, None) if new.package_id is not None else None
+        if record is None:
+            result.append(new.copy())
+            continue
+        if record.update_from(base.get(new.package_id, record), new):
+            changed.add(record.package_id)
+        result.append(record)
+    return result, changed
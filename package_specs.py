@@ -0,0 +1,298 @@
+"""
+封装规格
+参数只在这里解析和校验一次，生成的规格对象不可变，派生尺寸（焊盘位置、行距等）也只计算一次，
+各层（焊盘、丝印、禁止布线、装配）的生成都直接使用规格对象
+"""
+from collections import namedtuple
+
+from .ball_map import parse_ball_map
+
+# SOIC焊盘未提供时按引脚间距计算：(比例, 最小值, 最大值)
+SOIC_PAD_WIDTH_RULE = (0.5, 0.2, 0.8)
+SOIC_PAD_LENGTH_RULE = (0.7, 0.4, 1.2)
+
+
+def _positive(params, name, kind, message):
+    """
+    读取必须为正数的参数，缺失、无法转换或不大于0时抛出 ValueError(message)
+    """
+    try:
+        value = kind(params.get(name, 0))
+    except (ValueError, TypeError):
+        raise ValueError(message)
+    if value <= 0:
+        raise ValueError(message)
+    return value
+
+
+def _clockwise(params):
+    """引脚编号方向：默认逆时针（俯视），'CW' / 'clockwise' / '顺时针' 表示顺时针"""
+    direction = str(params.get('Pin Numbering Direction') or '').strip().lower()
+    return direction in ('cw', 'clockwise', '顺时针')
+
+
+def soic_default_pad_dimension(pitch, rule):
+    """
+    按引脚间距计算SOIC焊盘尺寸的默认值
+    """
+    ratio, min_value, max_value = rule
+    return min(max(pitch * ratio, min_value), max_value)
+
+
+def _soic_pad_dimension(params, names, pitch, rule, label):
+    """
+    读取SOIC焊盘尺寸；没有提供时按引脚间距计算默认值
+    """
+    for name in names:
+        value = params.get(name)
+        if value is not None and value != '':
+            try:
+                value = float(value)
+            except (ValueError, TypeError):
+                raise ValueError(f"无效的焊盘{label}参数")
+            if value > 0:
+                return value
+            break
+
+    default = soic_default_pad_dimension(pitch, rule)
+    print(f"焊盘{label}未指定，使用计算值: {default:.2f}mm (基于间距{pitch}mm)")
+    return default
+
+
+class SoicSpec(namedtuple('SoicSpec', [
+        'pin_count', 'pitch', 'pad_width', 'pad_length', 'overall_width',
+        'body_length', 'body_width',
+        # 派生尺寸
+        'pins_per_side', 'row_spacing', 'pad_span'])):
+    """
+    SOIC封装规格（引脚分布在左右两侧）
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_params(cls, params):
+        pin_count = _positive(params, 'Pin Count', int, "无效的引脚数参数")
+        pitch = _positive(params, 'Lead Pitch', float, "无效的间距参数")
+        # 焊盘宽度通常为引脚间距的50%，长度约为70%
+        pad_width = _soic_pad_dimension(params, ('Pad Width', 'Lead Width'),
+                                        pitch, SOIC_PAD_WIDTH_RULE, "宽度")
+        pad_length = _soic_pad_dimension(params, ('Pad Length', 'Lead Length'),
+                                         pitch, SOIC_PAD_LENGTH_RULE, "长度")
+        overall_width = _positive(params, 'Overall Width', float, "无效的总宽度参数")
+        body_length = _positive(params, 'Package Body Length', float, "无效的封装体长度参数")
+        body_width = _positive(params, 'Package Body Width', float, "无效的封装体宽度参数")
+
+        # 验证引脚数为偶数
+        if pin_count % 2 != 0:
+            raise ValueError(f"SOIC封装引脚数必须是偶数，当前为{pin_count}")
+
+        # 验证焊盘长度小于总宽度
+        if pad_length >= overall_width:
+            raise ValueError(f"焊盘长度({pad_length}mm)必须小于总宽度({overall_width}mm)")
+
+        pins_per_side = pin_count // 2
+        return cls(pin_count, pitch, pad_width, pad_length, overall_width,
+                   body_length, body_width,
+                   pins_per_side=pins_per_side,
+                   row_spacing=overall_width - pad_length,
+                   pad_span=(pins_per_side - 1) * pitch)
+
+
+class QfnSpec(namedtuple('QfnSpec', [
+        'pin_count_x', 'pin_count_y', 'pad_width', 'pad_length', 'pitch_x', 'pitch_y',
+        'body_x', 'body_y', 'ep_size_x', 'ep_size_y', 'ep_land_x', 'ep_land_y',
+        'pin1_location', 'clockwise',
+        # 派生尺寸
+        'total_pins', 'pad_offset_x', 'pad_offset_y', 'span_x', 'span_y'])):
+    """
+    QFN封装规格（四边引脚，可带中心散热焊盘）
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_params(cls, params):
+        ep_size_x = float(params.get('Exposed Pad Size X', 0))
+        ep_size_y = float(params.get('Exposed Pad Size Y', 0))
+        ep_land_x = float(params.get('Exposed Pad Land Size X', 0))
+        ep_land_y = float(params.get('Exposed Pad Land Size Y', 0))
+
+        pin_count_x = _positive(params, 'Pin Count X', int, "无效的X方向引脚数参数")
+        pin_count_y = _positive(params, 'Pin Count Y', int, "无效的Y方向引脚数参数")
+        pad_width = _positive(params, 'Pad Width', float, "无效的焊盘宽度参数")
+        pad_length = _positive(params, 'Pad Length', float, "无效的焊盘长度参数")
+        pitch_x = _positive(params, 'Lead Pitch X', float, "无效的X方向间距参数")
+        pitch_y = _positive(params, 'Lead Pitch Y', float, "无效的Y方向间距参数")
+        body_x = _positive(params, 'Package Body Size X', float, "无效的封装体X尺寸参数")
+        body_y = _positive(params, 'Package Body Size Y', float, "无效的封装体Y尺寸参数")
+
+        pin1_location = str(params.get('Pin 1 Visual Location') or 'UPPER LEFT').upper()
+
+        return cls(pin_count_x, pin_count_y, pad_width, pad_length, pitch_x, pitch_y,
+                   body_x, body_y, ep_size_x, ep_size_y, ep_land_x, ep_land_y,
+                   pin1_location, _clockwise(params),
+                   total_pins=(pin_count_x + pin_count_y) * 2,
+                   # 焊盘中心位置（从封装本体边缘算起）
+                   pad_offset_x=body_x / 2 + pad_length / 2,
+                   pad_offset_y=body_y / 2 + pad_length / 2,
+                   span_x=(pin_count_x - 1) * pitch_x,
+                   span_y=(pin_count_y - 1) * pitch_y)
+
+    @property
+    def has_exposed_pad(self):
+        return self.ep_size_x > 0 and self.ep_size_y > 0
+
+
+class QfpSpec(namedtuple('QfpSpec', [
+        'pin_count_x', 'pin_count_y', 'pad_width', 'pad_length', 'pitch_x', 'pitch_y',
+        'body_x', 'body_y', 'overall_x', 'overall_y', 'pin1_location', 'clockwise',
+        # 派生尺寸
+        'total_pins', 'pad_offset_x', 'pad_offset_y', 'span_x', 'span_y'])):
+    """
+    QFP封装规格（四边鸥翼引脚，焊盘外端与引脚末端对齐）
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_params(cls, params):
+        pin_count_x = _positive(params, 'Pin Count X', int, "无效的X方向引脚数参数")
+        pin_count_y = _positive(params, 'Pin Count Y', int, "无效的Y方向引脚数参数")
+        pad_width = _positive(params, 'Pad Width', float, "无效的焊盘宽度参数")
+        pad_length = _positive(params, 'Pad Length', float, "无效的焊盘长度参数")
+        pitch_x = _positive(params, 'Lead Pitch X', float, "无效的X方向间距参数")
+        pitch_y = _positive(params, 'Lead Pitch Y', float, "无效的Y方向间距参数")
+        body_x = _positive(params, 'Package Body Size X', float, "无效的封装体X尺寸参数")
+        body_y = _positive(params, 'Package Body Size Y', float, "无效的封装体Y尺寸参数")
+        overall_x = _positive(params, 'Overall Width X', float, "无效的X方向总宽度参数")
+        overall_y = _positive(params, 'Overall Width Y', float, "无效的Y方向总宽度参数")
+
+        if pad_length >= min(overall_x, overall_y) / 2:
+            raise ValueError(f"焊盘长度({pad_length}mm)必须小于总宽度的一半")
+
+        pin1_location = str(params.get('Pin 1 Visual Location') or 'UPPER LEFT').upper()
+
+        return cls(pin_count_x, pin_count_y, pad_width, pad_length, pitch_x, pitch_y,
+                   body_x, body_y, overall_x, overall_y, pin1_location, _clockwise(params),
+                   total_pins=(pin_count_x + pin_count_y) * 2,
+                   # 焊盘外端与引脚末端（总宽度）对齐
+                   pad_offset_x=overall_x / 2 - pad_length / 2,
+                   pad_offset_y=overall_y / 2 - pad_length / 2,
+                   span_x=(pin_count_x - 1) * pitch_x,
+                   span_y=(pin_count_y - 1) * pitch_y)
+
+
+class DfnSpec(namedtuple('DfnSpec', [
+        'pin_count', 'pitch', 'pad_width', 'pad_length', 'body_x', 'body_y',
+        'ep_size_x', 'ep_size_y', 'ep_land_x', 'ep_land_y',
+        # 派生尺寸
+        'pins_per_side', 'row_spacing', 'pad_span'])):
+    """
+    DFN封装规格（左右两侧无引脚焊盘，可带中心散热焊盘）
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_params(cls, params):
+        pin_count = _positive(params, 'Pin Count', int, "无效的引脚数参数")
+        pitch = _positive(params, 'Lead Pitch', float, "无效的间距参数")
+        pad_width = _positive(params, 'Pad Width', float, "无效的焊盘宽度参数")
+        pad_length = _positive(params, 'Pad Length', float, "无效的焊盘长度参数")
+        body_x = _positive(params, 'Package Body Size X', float, "无效的封装体X尺寸参数")
+        body_y = _positive(params, 'Package Body Size Y', float, "无效的封装体Y尺寸参数")
+
+        if pin_count % 2 != 0:
+            raise ValueError(f"DFN封装引脚数必须是偶数，当前为{pin_count}")
+
+        pins_per_side = pin_count // 2
+        return cls(pin_count, pitch, pad_width, pad_length, body_x, body_y,
+                   float(params.get('Exposed Pad Size X', 0)),
+                   float(params.get('Exposed Pad Size Y', 0)),
+                   float(params.get('Exposed Pad Land Size X', 0)),
+                   float(params.get('Exposed Pad Land Size Y', 0)),
+                   pins_per_side=pins_per_side,
+                   # 与QFN相同，焊盘中心在封装体边缘外半个焊盘长度处
+                   row_spacing=body_x + pad_length,
+                   pad_span=(pins_per_side - 1) * pitch)
+
+    @property
+    def has_exposed_pad(self):
+        return self.ep_size_x > 0 and self.ep_size_y > 0
+
+
+# SOT-23 系列每侧3个槽位，各引脚数使用的槽位：(左侧, 右侧)
+SOT_SLOTS = {
+    3: ((0, 2), (1,)),
+    5: ((0, 1, 2), (0, 2)),
+    6: ((0, 1, 2), (0, 1, 2)),
+}
+
+
+class SotSpec(namedtuple('SotSpec', [
+        'pin_count', 'pitch', 'pad_width', 'pad_length', 'overall_width',
+        'body_length', 'body_width',
+        # 派生尺寸
+        'slots', 'row_spacing', 'pad_span'])):
+    """
+    SOT-23 系列封装规格（3/5/6引脚，两侧各3个槽位）
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_params(cls, params):
+        pin_count = _positive(params, 'Pin Count', int, "无效的引脚数参数")
+        pitch = _positive(params, 'Lead Pitch', float, "无效的间距参数")
+        pad_width = _positive(params, 'Pad Width', float, "无效的焊盘宽度参数")
+        pad_length = _positive(params, 'Pad Length', float, "无效的焊盘长度参数")
+        overall_width = _positive(params, 'Overall Width', float, "无效的总宽度参数")
+        body_length = _positive(params, 'Package Body Length', float, "无效的封装体长度参数")
+        body_width = _positive(params, 'Package Body Width', float, "无效的封装体宽度参数")
+
+        if pin_count not in SOT_SLOTS:
+            raise ValueError(f"不支持的SOT引脚数: {pin_count}（支持 3、5、6）")
+        if pad_length >= overall_width:
+            raise ValueError(f"焊盘长度({pad_length}mm)必须小于总宽度({overall_width}mm)")
+
+        return cls(pin_count, pitch, pad_width, pad_length, overall_width,
+                   body_length, body_width,
+                   slots=SOT_SLOTS[pin_count],
+                   row_spacing=overall_width - pad_length,
+                   pad_span=2 * pitch)
+
+
+class BgaSpec(namedtuple('BgaSpec', [
+        'pitch_x', 'pitch_y', 'count_x', 'count_y', 'ball_diameter',
+        'body_x', 'body_y', 'a1_location', 'ball_shape',
+        'ball_map',  # 植球图，完整阵列时为None
+        # 派生尺寸
+        'total_balls', 'span_x', 'span_y'])):
+    """
+    BGA封装规格（矩形球阵列，可按去球描述移除部分球）
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_params(cls, params):
+        pitch_x = _positive(params, 'Ball Pitch X', float, "无效的X方向球间距参数")
+        pitch_y = _positive(params, 'Ball Pitch Y', float, "无效的Y方向球间距参数")
+        count_x = _positive(params, 'Ball Count X', int, "X方向球个数无效")
+        count_y = _positive(params, 'Ball Count Y', int, "Y方向球个数无效")
+        ball_diameter = _positive(params, 'Ball Diameter', float, "无效的球直径参数")
+        body_x = _positive(params, 'Package Body Size X', float, "X方向本体尺寸参数无效")
+        body_y = _positive(params, 'Package Body Size Y', float, "Y方向本体尺寸参数无效")
+
+        a1_location = str(params.get('A1 Ball Visual Location') or 'lower left').lower()
+        ball_shape = str(params.get('Ball Visual Shape') or 'solid circle').lower()
+        ball_map = parse_ball_map(params.get('Ball Depopulation'), count_x, count_y)
+        if ball_map is not None and ball_map.is_full:
+            ball_map = None
+
+        return cls(pitch_x, pitch_y, count_x, count_y, ball_diameter,
+                   body_x, body_y, a1_location, ball_shape, ball_map,
+                   total_balls=ball_map.count() if ball_map else count_x * count_y,
+                   span_x=(count_x - 1) * pitch_x,
+                   span_y=(count_y - 1) * pitch_y)
@@ -0,0 +1,190 @@
+"""
+封装参数的模式定义
+按封装类型定义规范参数名、别名、类型、单位和默认值；
+服务器返回的 packageResult 通过预先编译的别名字典一次性规范化为带类型的参数字典
+"""
+
+
+class ParamDef:
+    """
+    单个参数的定义
+    """
+
+    __slots__ = ('name', 'kind', 'unit', 'default', 'aliases')
+
+    def __init__(self, name, kind=float, unit='mm', default=None, aliases=()):
+        self.name = name        # 规范名称（界面显示和保存使用）
+        self.kind = kind        # int / float / str
+        self.unit = unit
+        self.default = default  # None 表示必填（缺失时由生成器报错）
+        self.aliases = aliases
+
+
+def normalize_name(name):
+    """
+    参数名归一化：忽略大小写、空格、下划线和连字符，如 'Pin Count' / 'PinCount' / 'pin_count'
+    """
+    return ''.join(ch for ch in str(name).lower() if ch not in ' _-')
+
+
+SCHEMAS = {
+    'SOIC': (
+        ParamDef('Pin Count', int, '', aliases=('Pins', 'Lead Count', 'Number of Pins')),
+        ParamDef('Lead Pitch', aliases=('Pitch', 'Pin Pitch')),
+        ParamDef('Pad Width'),
+        ParamDef('Pad Length'),
+        ParamDef('Lead Width'),
+        ParamDef('Lead Length'),
+        ParamDef('Overall Width', aliases=('Total Width', 'Lead Span')),
+        ParamDef('Package Body Length', aliases=('Body Length',)),
+        ParamDef('Package Body Width', aliases=('Body Width',)),
+    ),
+    'QFN': (
+        ParamDef('Pin Count X', int, '', aliases=('Pins X',)),
+        ParamDef('Pin Count Y', int, '', aliases=('Pins Y',)),
+        ParamDef('Pad Width'),
+        ParamDef('Pad Length'),
+        ParamDef('Lead Pitch X', aliases=('Pitch X',)),
+        ParamDef('Lead Pitch Y', aliases=('Pitch Y',)),
+        ParamDef('Package Body Size X', aliases=('Body Size X',)),
+        ParamDef('Package Body Size Y', aliases=('Body Size Y',)),
+        ParamDef('Exposed Pad Size X', default=0.0, aliases=('EP Size X',)),
+        ParamDef('Exposed Pad Size Y', default=0.0, aliases=('EP Size Y',)),
+        ParamDef('Exposed Pad Land Size X', default=0.0, aliases=('EP Land Size X',)),
+        ParamDef('Exposed Pad Land Size Y', default=0.0, aliases=('EP Land Size Y',)),
+        ParamDef('Pin 1 Visual Location', str, '', default='UPPER LEFT',
+                 aliases=('Pin1 Location',)),
+        ParamDef('Pin Numbering Direction', str, '', default='CCW',
+                 aliases=('Numbering Direction',)),
+    ),
+    'DFN': (
+        ParamDef('Pin Count', int, '', aliases=('Pins', 'Lead Count', 'Number of Pins')),
+        ParamDef('Lead Pitch', aliases=('Pitch', 'Pin Pitch')),
+        ParamDef('Pad Width'),
+        ParamDef('Pad Length'),
+        ParamDef('Package Body Size X', aliases=('Body Size X',)),
+        ParamDef('Package Body Size Y', aliases=('Body Size Y',)),
+        ParamDef('Exposed Pad Size X', default=0.0, aliases=('EP Size X',)),
+        ParamDef('Exposed Pad Size Y', default=0.0, aliases=('EP Size Y',)),
+        ParamDef('Exposed Pad Land Size X', default=0.0, aliases=('EP Land Size X',)),
+        ParamDef('Exposed Pad Land Size Y', default=0.0, aliases=('EP Land Size Y',)),
+    ),
+    'BGA': (
+        ParamDef('Ball Pitch X', aliases=('Pitch X',)),
+        ParamDef('Ball Pitch Y', aliases=('Pitch Y',)),
+        ParamDef('Ball Count X', int, '', aliases=('Balls X',)),
+        ParamDef('Ball Count Y', int, '', aliases=('Balls Y',)),
+        ParamDef('Ball Diameter', aliases=('Ball Size',)),
+        ParamDef('Package Body Size X', aliases=('Body Size X',)),
+        ParamDef('Package Body Size Y', aliases=('Body Size Y',)),
+        ParamDef('A1 Ball Visual Location', str, '', default='lower left',
+                 aliases=('A1 Location',)),
+        ParamDef('Ball Visual Shape', str, '', default='solid circle'),
+        # 去球描述，如 'perimeter 3' / 'center 4x4; corners 1' / 'missing A1, B2'
+        ParamDef('Ball Depopulation', str, '', default='',
+                 aliases=('Depopulation', 'Missing Balls')),
+    ),
+}
+
+# 与已有类型参数相同或只多几个参数的类型
+SCHEMAS['TSSOP'] = SCHEMAS['SOIC']
+SCHEMAS['SOT'] = tuple(param for param in SCHEMAS['SOIC']
+                       if param.name not in ('Lead Width', 'Lead Length'))
+SCHEMAS['QFP'] = tuple(param for param in SCHEMAS['QFN']
+                       if not param.name.startswith('Exposed Pad')) + (
+    ParamDef('Overall Width X', aliases=('Lead Span X', 'Total Width X')),
+    ParamDef('Overall Width Y', aliases=('Lead Span Y', 'Total Width Y')),
+)
+
+
+def _compile(schemas):
+    """
+    预先编译查找表：类型 -> {归一化名称: ParamDef}，以及所有类型共用的 归一化名称 -> 单位
+    """
+    lookup = {}
+    units = {}
+    for package_type, defs in schemas.items():
+        table = lookup[package_type] = {}
+        for param in defs:
+            for name in (param.name,) + tuple(param.aliases):
+                table[normalize_name(name)] = param
+                units.setdefault(normalize_name(name), param.unit)
+    return lookup, units
+
+
+_LOOKUP, _UNITS = _compile(SCHEMAS)
+
+
+def find_param(package_type, name):
+    """
+    按封装类型查找参数定义，未定义的参数返回None
+    """
+    table = _LOOKUP.get(str(package_type or '').upper())
+    if table is None:
+        return None
+    return table.get(normalize_name(name))
+
+
+def canonical_name(package_type, name):
+    """
+    返回参数的规范名称（未定义的参数保持原名）
+    """
+    param = find_param(package_type, name)
+    return param.name if param else name
+
+
+def coerce_value(param, value):
+    """
+    按参数类型转换数值；无法转换时保留原值（由生成器给出具体的错误提示）
+    """
+    if param is None or value is None or isinstance(value, param.kind):
+        return value
+    try:
+        if param.kind is int:
+            number = float(value)
+            return int(number) if number.is_integer() else value
+        if param.kind is float:
+            return float(value)
+        return str(value)
+    except (ValueError, TypeError):
+        return value
+
+
+def normalize_params(package_type, params, fill_defaults=False):
+    """
+    规范化参数字典：别名映射为规范名称并转换类型，未定义的参数原样保留
+
+    Args:
+        fill_defaults: 是否为缺失的可选参数填入默认值（生成封装时使用，界面显示不填）
+
+    Returns:
+        新的参数字典（保持原顺序）
+    """
+    table = _LOOKUP.get(str(package_type or '').upper(), {})
+    result = {}
+    for key, value in params.items():
+        param = table.get(normalize_name(key))
+        if param is None:
+            result.setdefault(key, value)
+        elif param.name not in result or key == param.name:
+            # 规范名称优先于别名
+            result[param.name] = coerce_value(param, value)
+
+    if fill_defaults:
+        for param in SCHEMAS.get(str(package_type or '').upper(), ()):
+            if param.default is not None and param.name not in result:
+                result[param.name] = param.default
+    return result
+
+
+def unit_for_param(name):
+    """
+    参数单位：已定义的参数直接查表，其余按名称推断
+    """
+    unit = _UNITS.get(normalize_name(name))
+    if unit is not None:
+        return unit
+    param_lower = str(name).lower()
+    if any(x in param_lower for x in ['count', 'orientation', 'direction', 'visual', 'index']):
+        return ""
+    return "mm"
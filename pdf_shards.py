@@ -0,0 +1,249 @@
+"""
+大型数据手册分片上传
+将PDF按页码范围拆分为多个分片，并发上传、解析，再合并各分片返回的封装列表
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .package_model import json_loads
+
+
+def parse_page_numbers(page_numbers):
+    """
+    解析页码字符串，如 "3, 5-7" -> [3, 5, 6, 7]；无法解析的部分忽略
+    """
+    pages = []
+    for part in str(page_numbers or '').replace('，', ',').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                start, end = part.split('-', 1)
+                start, end = int(start.strip()), int(end.strip())
+                pages.extend(range(min(start, end), max(start, end) + 1))
+            else:
+                pages.append(int(part))
+        except ValueError:
+            continue
+    return pages
+
+
+def format_page_numbers(pages):
+    """
+    将页码列表格式化为紧凑字符串，如 [3, 5, 6, 7] -> "3, 5-7"
+    """
+    pages = sorted(set(pages))
+    ranges = []
+    for page in pages:
+        if ranges and page == ranges[-1][1] + 1:
+            ranges[-1][1] = page
+        else:
+            ranges.append([page, page])
+    return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def _package_key(package):
+    """
+    封装去重键：类型 + 名称 + 参数内容
+    """
+    package_result = package.get('packageResult') or '{}'
+    if isinstance(package_result, str):
+        try:
+            package_result = json_loads(package_result)
+        except ValueError:
+            pass
+    if isinstance(package_result, dict):
+        package_result = json.dumps(package_result, sort_keys=True)
+    return (str(package.get('packageType', '')).strip().upper(),
+            str(package.get('packageName', '')).strip().lower(),
+            package_result)
+
+
+def merge_shard_results(shard_results):
+    """
+    合并各分片的封装列表
+
+    Args:
+        shard_results: [(first_page, package_list)]，first_page 为分片首页在原PDF中的页码（从1开始）
+
+    Returns:
+        合并后的 package_list：pageNumbers 映射为原PDF页码，相同封装只保留一个并合并页码
+    """
+    merged = {}
+    order = []
+    for first_page, package_list in sorted(shard_results, key=lambda r: r[0]):
+        offset = first_page - 1
+        for package in package_list or []:
+            pages = [page + offset for page in parse_page_numbers(package.get('pageNumbers'))]
+            key = _package_key(package)
+            if key in merged:
+                merged[key][1].update(pages)
+            else:
+                merged[key] = (dict(package), set(pages))
+                order.append(key)
+
+    package_list = []
+    for key in order:
+        package, pages = merged[key]
+        package['pageNumbers'] = format_page_numbers(pages)
+        package_list.append(package)
+    return package_list
+
+
+def split_pdf(pdf_path, pages_per_shard, out_dir):
+    """
+    按页码范围拆分PDF（需要PyMuPDF）
+
+    Returns:
+        [(分片文件路径, 首页页码)]
+    """
+    import fitz
+
+    shards = []
+    with fitz.open(pdf_path) as doc:
+        total_pages = len(doc)
+        base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+        for start in range(0, total_pages, pages_per_shard):
+            end = min(start + pages_per_shard, total_pages) - 1
+            shard_doc = fitz.open()
+            shard_doc.insert_pdf(doc, from_page=start, to_page=end)
+            shard_path = os.path.join(out_dir, f"{base_name}_p{start + 1}-{end + 1}.pdf")
+            shard_doc.save(shard_path)
+            shard_doc.close()
+            shards.append((shard_path, start + 1))
+    return shards
+
+
+class ShardedUploader:
+    """
+    分片上传并合并解析结果
+    """
+
+    def __init__(self, api_client, pages_per_shard=50, max_workers=4,
+                 poll_interval=3, poll_timeout=300, empty_timeout=30):
+        """
+        Args:
+            poll_timeout: 单个分片最长等待时间（秒）
+            empty_timeout: 服务器对没有封装的分片和解析中的分片都返回空列表；
+                           已有其他分片解析出封装后，仍为空的分片至少再等待这么久
+                           （且不短于最慢分片解析耗时的1.5倍）就停止等待，
+                           作为未完成的分片报告给调用方
+        """
+        self.api_client = api_client
+        self.pages_per_shard = pages_per_shard
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.poll_timeout = poll_timeout
+        self.empty_timeout = empty_timeout
+
+    def run(self, pdf_path, on_progress=None):
+        """
+        拆分、并发上传并等待所有分片解析完成
+
+        Args:
+            on_progress: 进度回调 on_progress(message)，在工作线程中调用
+
+        Returns:
+            (shards, package_list, unfinished)，shards 为 [{'uuid': ..., 'firstPage': ...}]；
+            unfinished 为等待超时、没有返回封装的分片（可能没有封装，也可能仍在解析，
+            稍后可用 fetch_merged 重新获取）
+        """
+        temp_dir = tempfile.mkdtemp(prefix="fp_shards_")
+        try:
+            shard_files = split_pdf(pdf_path, self.pages_per_shard, temp_dir)
+            if on_progress:
+                on_progress(f"已拆分为 {len(shard_files)} 个分片，正在上传...")
+
+            done = [0]
+            # 已解析出封装的分片中最长的解析耗时（秒），用于判断空分片何时停止等待
+            slowest = [None]
+            lock = threading.Lock()
+
+            def process(shard_file):
+                shard_path, first_page = shard_file
+                datasheet_uuid = self._upload(shard_path)
+                started = time.time()
+                package_list = self._poll(datasheet_uuid, lambda: slowest[0])
+                shard = {'uuid': datasheet_uuid, 'firstPage': first_page}
+                with lock:
+                    done[0] += 1
+                    finished = done[0]
+                    if package_list:
+                        slowest[0] = max(slowest[0] or 0, time.time() - started)
+                if on_progress:
+                    on_progress(f"分片解析完成 {finished}/{len(shard_files)}")
+                return shard, package_list
+
+            workers = min(self.max_workers, len(shard_files))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(process, shard_files))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        shards = [shard for shard, _ in results]
+        unfinished = [shard for shard, packages in results if packages is None]
+        package_list = merge_shard_results([(shard['firstPage'], packages)
+                                            for shard, packages in results if packages])
+        return shards, package_list, unfinished
+
+    def fetch_merged(self, shards):
+        """
+        重新获取所有分片的解析结果并合并（不等待未完成的分片）
+        """
+        def fetch(shard):
+            response = self.api_client.fetch_packages(shard['uuid'], timeout=30)
+            if response.status_code != 200:
+                raise Exception(f"获取分片结果失败: HTTP {response.status_code}")
+            return shard['firstPage'], json_loads(response.content)
+
+        workers = min(self.max_workers, len(shards))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return merge_shard_results(list(executor.map(fetch, shards)))
+
+    def _upload(self, shard_path):
+        response = self.api_client.upload_pdf(shard_path, timeout=60)
+        if response.status_code != 200:
+            raise Exception(f"分片上传失败: HTTP {response.status_code}")
+        result = json_loads(response.content)
+        if not result.get('success'):
+            raise Exception(f"分片上传失败: {result.get('message', '未知错误')}")
+        return result.get('uuid')
+
+    def _poll(self, datasheet_uuid, sibling_parse_time=lambda: None):
+        """
+        等待分片解析完成
+
+        Args:
+            sibling_parse_time: 返回其他分片中已解析出封装的最长耗时（秒），还没有时返回None
+
+        Returns:
+            封装列表；停止等待时仍为空则返回None（服务器对解析中和没有封装的分片都返回空列表，
+            无法确认分片确实没有封装，不能当作空结果合并）
+        """
+        started = time.time()
+        while True:
+            try:
+                response = self.api_client.fetch_packages(datasheet_uuid, timeout=10)
+                if response.status_code == 200:
+                    package_list = json_loads(response.content)
+                    if package_list:
+                        return package_list
+            except Exception as e:
+                print(f"获取分片结果错误: {str(e)}")
+
+            elapsed = time.time() - started
+            if elapsed > self.poll_timeout:
+                print(f"分片 {datasheet_uuid} 解析超时，停止等待")
+                return None
+            # 同一批其他分片已经解析完成，这个分片等待足够久后仍为空，多半没有封装，停止等待
+            parse_time = sibling_parse_time()
+            if parse_time is not None and elapsed >= max(self.empty_timeout, parse_time * 1.5):
+                print(f"分片 {datasheet_uuid} 仍没有结果，停止等待")
+                return None
+            time.sleep(self.poll_interval)
@@ -0,0 +1,2369 @@
+"""
+封装生成插件的KiCad界面：插件入口、封装生成对话框和批量处理窗口
+"""
+import pcbnew
+import wx
+import wx.grid
+import bisect
+import os
+import threading
+
+from .api_client import DEFAULT_API_BASE_URL, PackageApiClient
+from .package_model import decode_package_list, json_loads, reconcile_records
+from .param_schema import canonical_name, coerce_value, find_param, normalize_params, unit_for_param
+from .pdf_shards import ShardedUploader
+from .families import FAMILIES, build_geometry
+from .footprint_library import ensure_library
+from .kicad_mod_writer import save_footprint
+from .materializer import materialize
+from .batch_pipeline import (BatchPipeline, BatchQueue, prepare_packages,
+                             STATUS_PENDING, STATUS_UPLOADING, STATUS_PARSING,
+                             STATUS_GENERATING, STATUS_DONE, STATUS_FAILED)
+from .result_cache import ResultCache
+from .save_journal import shared_journal
+from .validation import error_cells, validate_packages
+
+class FootprintGeneratorPlugin(pcbnew.ActionPlugin):
+    """
+    KiCad 封装生成插件主类
+    """
+
+    def defaults(self):
+        """
+        插件的基本信息
+        """
+        self.name = "Footprint Generator"
+        self.category = "Manufacturing"
+        self.description = "从数据手册自动生成封装"
+        self.show_toolbar_button = True
+        self.icon_file_name = os.path.join(os.path.dirname(__file__), "icon.png")
+
+    def Run(self):
+        if not hasattr(self, 'dialog') or self.dialog is None:
+            self.dialog = GeneratorDialog(None)
+            # 绑定窗口关闭事件，以便清理引用
+            self.dialog.Bind(wx.EVT_CLOSE, self.on_dialog_close)
+            self.dialog.Show()
+        else:
+            # 如果对话框已存在，将其带到前台
+            self.dialog.Raise()
+            self.dialog.SetFocus()
+
+    def on_dialog_close(self, event):
+        """对话框关闭时的处理（这里先于对话框自身的关闭处理执行，且不再传递事件）"""
+        self.dialog.cleanup()
+        self.dialog.Destroy()
+        self.dialog = None
+
+
+class GeneratorDialog(wx.Dialog):
+    """
+    AI封装生成器对话框
+    """
+
+    def __init__(self, parent):
+        wx.Dialog.__init__(self, parent, title="AI封装生成器", size=(1400, 900),
+                           style=wx.CAPTION |
+                                 wx.CLOSE_BOX |
+                                 wx.SYSTEM_MENU |
+                                 wx.MINIMIZE_BOX |
+                                 wx.FRAME_NO_TASKBAR
+                           )
+
+        self.api_base_url = DEFAULT_API_BASE_URL
+        # self.api_base_url = "http://localhost:8080/api/packages"
+        self.datasheet_uuid = None
+        self.package_list = []  # 存储所有封装数据（服务器原始格式）
+        self.base_records = []  # package_list 解码后的记录（三方合并的基准，不显示、不编辑）
+        self.packages = []  # package_list 解码后的 PackageRecord
+        self.changed_package_ids = set()  # 合并新结果时内容有变化、尚未刷新显示的封装
+        self.pdf_path = None
+        self.api_client = PackageApiClient(self.api_base_url)
+        # 本地数据目录（保存日志等）
+        self.data_dir = os.path.join(os.path.expanduser("~"), ".kicad_ai_footprint")
+        # 保存先写入本地日志，由后台线程同步到服务器
+        # 日志和同步线程在进程内共用，对话框关闭后继续同步，重新打开时沿用
+        self.save_journal = shared_journal(os.path.join(self.data_dir, "save_journal.jsonl"),
+                                           lambda: PackageApiClient(self.api_base_url))
+        self.save_journal.on_flushed = self.on_journal_flushed
+        # 解析结果本地缓存（按UUID和PDF哈希索引）
+        self.result_cache = ResultCache(os.path.join(self.data_dir, "results"))
+        self.pdf_hash = None
+        # 大文件分片上传：超过阈值页数时按页码范围拆分并发解析
+        self.shard_page_threshold = 100
+        self.sharded_uploader = ShardedUploader(self.api_client, pages_per_shard=50)
+        self.shard_infos = None  # [{'uuid', 'firstPage'}]，非分片上传时为None
+        # 封装库输出目录（.pretty）；为None时生成的封装添加到当前板子
+        self.library_path = None
+        self.current_page = 1
+        self.total_pages = 1
+        self.zoom_level = 100
+
+        # 自动刷新相关变量
+        self.auto_fetch_timer = None
+        self.fetch_start_time = None
+        self.fetch_timeout = 300  # 5分钟超时（秒）
+        self.fetch_interval = 3  # 每3秒查询一次
+        self.fetch_retry_count = 0
+        self.max_retries = 100  # 5分钟 / 3秒 = 100次
+
+        self.init_ui()
+        self.Centre()
+        # 绑定关闭事件
+        self.Bind(wx.EVT_CLOSE, self.on_dialog_close)
+
+    def init_ui(self):
+        """
+        初始化用户界面
+        """
+        # 主布局：水平分割
+        main_sizer = wx.BoxSizer(wx.HORIZONTAL)
+
+        # 左侧面板：PDF预览
+        left_panel = self.create_left_panel()
+        main_sizer.Add(left_panel, 1, wx.EXPAND | wx.ALL, 5)
+
+        # 右侧面板：参数编辑
+        right_panel = self.create_right_panel()
+        main_sizer.Add(right_panel, 1, wx.EXPAND | wx.ALL, 5)
+
+        self.SetSizer(main_sizer)
+
+    def create_left_panel(self):
+        """
+        创建左侧PDF预览面板 - 使用高质量PyMuPDF渲染
+        """
+        panel = wx.Panel(self)
+        panel.SetMinSize((400, -1))
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        # 工具栏
+        toolbar_sizer = wx.BoxSizer(wx.HORIZONTAL)
+
+        self.upload_btn = wx.Button(panel, label="📂 上传PDF")
+        self.upload_btn.Bind(wx.EVT_BUTTON, self.on_upload_pdf)
+        toolbar_sizer.Add(self.upload_btn, 0, wx.ALL, 5)
+
+        self.fetch_btn = wx.Button(panel, label="获取解析结果")
+        self.fetch_btn.Bind(wx.EVT_BUTTON, self.on_fetch_results)
+        self.fetch_btn.Enable(False)
+        toolbar_sizer.Add(self.fetch_btn, 0, wx.ALL, 5)
+
+        self.batch_btn = wx.Button(panel, label="📦 批量处理")
+        self.batch_btn.Bind(wx.EVT_BUTTON, self.on_batch_process)
+        toolbar_sizer.Add(self.batch_btn, 0, wx.ALL, 5)
+
+        self.shard_checkbox = wx.CheckBox(panel, label="大文件分片上传")
+        self.shard_checkbox.SetToolTip(f"超过 {self.shard_page_threshold} 页的PDF拆分为多个分片并发解析")
+        toolbar_sizer.Add(self.shard_checkbox, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+
+        toolbar_sizer.AddSpacer(20)
+
+        # 缩放控制
+        toolbar_sizer.Add(wx.StaticText(panel, label="缩放:"), 0,
+                          wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+
+        self.zoom_out_btn = wx.Button(panel, label="➖", size=(35, -1))
+        self.zoom_out_btn.Bind(wx.EVT_BUTTON, self.on_zoom_out)
+        self.zoom_out_btn.Enable(False)
+        toolbar_sizer.Add(self.zoom_out_btn, 0, wx.ALL, 5)
+
+        self.zoom_label = wx.StaticText(panel, label="100%", size=(50, -1),
+                                        style=wx.ALIGN_CENTER)
+        toolbar_sizer.Add(self.zoom_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+
+        self.zoom_in_btn = wx.Button(panel, label="➕", size=(35, -1))
+        self.zoom_in_btn.Bind(wx.EVT_BUTTON, self.on_zoom_in)
+        self.zoom_in_btn.Enable(False)
+        toolbar_sizer.Add(self.zoom_in_btn, 0, wx.ALL, 5)
+
+        self.reset_zoom_btn = wx.Button(panel, label="重置", size=(60, -1))
+        self.reset_zoom_btn.Bind(wx.EVT_BUTTON, self.on_reset_zoom)
+        self.reset_zoom_btn.Enable(False)
+        toolbar_sizer.Add(self.reset_zoom_btn, 0, wx.ALL, 5)
+
+        toolbar_sizer.AddStretchSpacer(1)
+
+        sizer.Add(toolbar_sizer, 0, wx.EXPAND)
+
+        # PDF显示区域 - 使用ScrolledPanel
+        import wx.lib.scrolledpanel as scrolled
+        self.pdf_scroll = scrolled.ScrolledPanel(panel, style=wx.SUNKEN_BORDER)
+        self.pdf_scroll.SetBackgroundColour(wx.Colour(100, 100, 100))
+        self.pdf_scroll.SetupScrolling()
+        self.pdf_scroll.SetScrollRate(20, 20)
+
+        # 图片面板（用于显示PDF页面）
+        self.image_panel = wx.Panel(self.pdf_scroll)
+        self.image_panel.SetBackgroundColour(wx.WHITE)
+
+        # 使用BoxSizer将图片面板居中
+        scroll_sizer = wx.BoxSizer(wx.VERTICAL)
+        scroll_sizer.AddStretchSpacer(1)
+
+        image_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        image_sizer.AddStretchSpacer(1)
+        image_sizer.Add(self.image_panel, 0, wx.ALIGN_CENTER)
+        image_sizer.AddStretchSpacer(1)
+
+        scroll_sizer.Add(image_sizer, 0, wx.EXPAND)
+        scroll_sizer.AddStretchSpacer(1)
+
+        self.pdf_scroll.SetSizer(scroll_sizer)
+
+        # 显示默认提示
+        self.show_placeholder("请上传PDF数据手册")
+
+        sizer.Add(self.pdf_scroll, 1, wx.EXPAND | wx.ALL, 5)
+
+        # 绑定鼠标滚轮事件
+        self.pdf_scroll.Bind(wx.EVT_MOUSEWHEEL, self.on_mouse_wheel)
+        self.image_panel.Bind(wx.EVT_MOUSEWHEEL, self.on_mouse_wheel)
+
+        # 页面控制栏
+        page_sizer = wx.BoxSizer(wx.HORIZONTAL)
+
+        self.prev_page_btn = wx.Button(panel, label="◀ 上一页")
+        self.prev_page_btn.Bind(wx.EVT_BUTTON, self.on_prev_page)
+        self.prev_page_btn.Enable(False)
+        page_sizer.Add(self.prev_page_btn, 0, wx.ALL, 5)
+
+        page_sizer.Add(wx.StaticText(panel, label="页码:"), 0,
+                       wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+
+        self.page_input = wx.TextCtrl(panel, size=(60, -1), style=wx.TE_PROCESS_ENTER)
+        self.page_input.Bind(wx.EVT_TEXT_ENTER, self.on_page_jump)
+        self.page_input.Enable(False)
+        page_sizer.Add(self.page_input, 0, wx.ALL, 5)
+
+        self.page_label = wx.StaticText(panel, label="/ 0")
+        page_sizer.Add(self.page_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+
+        self.next_page_btn = wx.Button(panel, label="下一页 ▶")
+        self.next_page_btn.Bind(wx.EVT_BUTTON, self.on_next_page)
+        self.next_page_btn.Enable(False)
+        page_sizer.Add(self.next_page_btn, 0, wx.ALL, 5)
+
+        self.jump_btn = wx.Button(panel, label="跳转")
+        self.jump_btn.Bind(wx.EVT_BUTTON, self.on_page_jump)
+        self.jump_btn.Enable(False)
+        page_sizer.Add(self.jump_btn, 0, wx.ALL, 5)
+
+        sizer.Add(page_sizer, 0, wx.EXPAND)
+
+        # 文件名显示
+        self.file_label = wx.StaticText(panel, label="📄 未选择文件", style=wx.ST_ELLIPSIZE_END)
+        page_sizer.Add(self.file_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+
+        # 状态栏
+        self.status_text = wx.StaticText(panel, label="就绪")
+        sizer.Add(self.status_text, 0, wx.EXPAND | wx.ALL, 5)
+
+        panel.SetSizer(sizer)
+        return panel
+
+    def show_placeholder(self, text):
+        """显示占位提示"""
+        self.image_panel.DestroyChildren()
+
+        # 创建一个简单的提示文本
+        placeholder = wx.StaticText(self.image_panel, label=text)
+        placeholder.SetForegroundColour(wx.Colour(150, 150, 150))
+        font = wx.Font(14, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL)
+        placeholder.SetFont(font)
+
+        self.image_panel.SetSize((400, 300))
+        self.image_panel.Layout()
+        self.pdf_scroll.Layout()
+
+    def create_placeholder_bitmap(self, width, height, text):
+        """
+        创建占位图片
+        """
+        bitmap = wx.Bitmap(width, height)
+        dc = wx.MemoryDC(bitmap)
+
+        # 填充背景
+        dc.SetBackground(wx.Brush(wx.Colour(240, 240, 240)))
+        dc.Clear()
+
+        # 绘制文本
+        dc.SetTextForeground(wx.Colour(100, 100, 100))
+        font = wx.Font(16, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL)
+        dc.SetFont(font)
+
+        text_width, text_height = dc.GetTextExtent(text)
+        dc.DrawText(text, (width - text_width) // 2, (height - text_height) // 2)
+
+        dc.SelectObject(wx.NullBitmap)
+        return bitmap
+
+    def load_pdf_preview(self):
+        """
+        加载PDF预览 - 使用高质量PyMuPDF渲染
+        """
+        if not self.pdf_path:
+            return
+
+        try:
+            import fitz
+            from PIL import Image
+
+            # 关闭之前的文档
+            if hasattr(self, 'pdf_doc') and self.pdf_doc:
+                self.pdf_doc.close()
+
+            # 打开PDF文档
+            self.pdf_doc = fitz.open(self.pdf_path)
+            self.total_pages = len(self.pdf_doc)
+            self.current_page = 1  # 从1开始
+            self.zoom_level = 50  # 默认90%
+            self.render_dpi = 150  # 高质量渲染DPI
+
+            # 启用所有控制按钮
+            self.prev_page_btn.Enable(True)
+            self.next_page_btn.Enable(True)
+            self.page_input.Enable(True)
+            self.jump_btn.Enable(True)
+            self.zoom_in_btn.Enable(True)
+            self.zoom_out_btn.Enable(True)
+            self.reset_zoom_btn.Enable(True)
+
+            # 更新文件名显示
+            filename = os.path.basename(self.pdf_path)
+            self.file_label.SetLabel(f"📄 {filename}")
+
+            # 渲染第一页
+            self.render_pdf_page()
+
+            self.set_status(f"已加载: {filename} ({self.total_pages} 页)")
+
+        except ImportError:
+            self.show_placeholder("需要安装 PyMuPDF\n\npip install PyMuPDF")
+            self.set_status("请安装 PyMuPDF: pip install PyMuPDF")
+            wx.MessageBox("需要安装 PyMuPDF 来预览PDF\n\n运行命令: pip install PyMuPDF",
+                          "提示", wx.OK | wx.ICON_INFORMATION)
+
+        except Exception as e:
+            self.show_placeholder(f"PDF加载失败\n\n{str(e)}")
+            self.set_status(f"PDF加载失败: {str(e)}")
+
+    def render_pdf_page(self):
+        """
+        渲染PDF页面 - 高质量显示
+        """
+        if not hasattr(self, 'pdf_doc') or not self.pdf_doc:
+            return
+
+        try:
+            import fitz
+            from PIL import Image
+
+            # 获取当前页（转换为0-based索引）
+            page = self.pdf_doc.load_page(self.current_page - 1)
+
+            # 计算缩放因子
+            zoom_factor = (self.zoom_level / 100.0) * (self.render_dpi / 72.0)
+            mat = fitz.Matrix(zoom_factor, zoom_factor)
+
+            # 渲染为高质量图像
+            pix = page.get_pixmap(matrix=mat, alpha=False)
+
+            # 转换为PIL Image
+            img_data = pix.samples
+            img = Image.frombytes("RGB", [pix.width, pix.height], img_data)
+
+            # 可选：轻微锐化提高清晰度
+            if self.render_dpi >= 200:
+                from PIL import ImageFilter
+                img = img.filter(ImageFilter.SHARPEN)
+
+            # 转换为wx.Bitmap
+            width, height = img.size
+            img_wx = wx.Bitmap.FromBuffer(width, height, img.tobytes())
+
+            # 清除之前的图片
+            self.image_panel.DestroyChildren()
+
+            # 创建StaticBitmap显示
+            static_bitmap = wx.StaticBitmap(self.image_panel, bitmap=img_wx)
+            static_bitmap.SetPosition((0, 0))
+
+            # 设置面板大小
+            self.image_panel.SetSize((width, height))
+            self.image_panel.SetMinSize((width, height))
+
+            # 更新虚拟大小
+            self.pdf_scroll.SetVirtualSize((width + 20, height + 20))
+
+            # 更新显示
+            zoom_percent = int(self.zoom_level)
+            self.zoom_label.SetLabel(f"{zoom_percent}%")
+
+            # 更新页码
+            self.page_label.SetLabel(f"/ {self.total_pages}")
+            self.page_input.SetValue(str(self.current_page))
+
+            # 刷新布局
+            self.pdf_scroll.Layout()
+            self.pdf_scroll.Scroll(0, 0)
+            self.image_panel.Refresh()
+            self.pdf_scroll.Refresh()
+
+        except Exception as e:
+            print(f"渲染PDF错误: {e}")
+            self.show_placeholder(f"渲染失败\n\n{str(e)}")
+
+    def on_prev_page(self, event):
+        """上一页"""
+        if hasattr(self, 'pdf_doc') and self.pdf_doc and self.current_page > 1:
+            self.current_page -= 1
+            self.render_pdf_page()
+
+    def on_next_page(self, event):
+        """下一页"""
+        if hasattr(self, 'pdf_doc') and self.pdf_doc and self.current_page < self.total_pages:
+            self.current_page += 1
+            self.render_pdf_page()
+
+    def on_page_jump(self, event):
+        """跳转到指定页"""
+        if not hasattr(self, 'pdf_doc') or not self.pdf_doc:
+            return
+
+        try:
+            page_text = self.page_input.GetValue()
+            if not page_text:
+                return
+
+            page_num = int(page_text)
+
+            if 1 <= page_num <= self.total_pages:
+                self.current_page = page_num
+                self.render_pdf_page()
+            else:
+                wx.MessageBox(f"页码必须在 1 到 {self.total_pages} 之间",
+                              "警告", wx.OK | wx.ICON_WARNING)
+        except ValueError:
+            wx.MessageBox("请输入有效的页码", "警告", wx.OK | wx.ICON_WARNING)
+
+    def on_zoom_in(self, event):
+        """放大"""
+        if hasattr(self, 'pdf_doc') and self.pdf_doc and self.zoom_level < 200:
+            self.zoom_level += 10
+            self.render_pdf_page()
+
+    def on_zoom_out(self, event):
+        """缩小"""
+        if hasattr(self, 'pdf_doc') and self.pdf_doc and self.zoom_level > 50:
+            self.zoom_level -= 10
+            self.render_pdf_page()
+
+    def on_reset_zoom(self, event):
+        """重置缩放"""
+        if hasattr(self, 'pdf_doc') and self.pdf_doc:
+            self.zoom_level = 100
+            self.render_pdf_page()
+
+    def on_mouse_wheel(self, event):
+        """处理鼠标滚轮事件"""
+        if not hasattr(self, 'pdf_doc') or not self.pdf_doc:
+            event.Skip()
+            return
+
+        rotation = event.GetWheelRotation()
+
+        # Ctrl + 滚轮进行缩放
+        if event.ControlDown():
+            if rotation > 0:
+                self.on_zoom_in(event)
+            else:
+                self.on_zoom_out(event)
+        # 普通滚轮进行垂直滚动
+        else:
+            if rotation > 0:
+                self.pdf_scroll.ScrollLines(-3)
+            else:
+                self.pdf_scroll.ScrollLines(3)
+
+        event.Skip()
+
+    def on_jump_to_page(self, event, page_ctrl):
+        """
+        从封装表格跳转到指定页码
+        """
+        page_numbers = page_ctrl.GetValue()
+        if not page_numbers:
+            return
+
+        try:
+            # 解析页码
+            if ',' in page_numbers:
+                first_page = int(page_numbers.split(',')[0].strip())
+            elif '-' in page_numbers:
+                first_page = int(page_numbers.split('-')[0].strip())
+            else:
+                first_page = int(page_numbers.strip())
+
+            # 跳转
+            if hasattr(self, 'pdf_doc') and self.pdf_doc:
+                if 1 <= first_page <= self.total_pages:
+                    self.current_page = first_page
+                    self.page_input.SetValue(str(first_page))
+                    self.render_pdf_page()
+                    self.set_status(f"已跳转到第 {first_page} 页")
+                else:
+                    wx.MessageBox(f"页码 {first_page} 超出范围 (1-{self.total_pages})",
+                                  "提示", wx.OK | wx.ICON_WARNING)
+            else:
+                wx.MessageBox("PDF未加载", "提示", wx.OK | wx.ICON_INFORMATION)
+
+        except ValueError:
+            wx.MessageBox(f"无法解析页码: {page_numbers}", "错误", wx.OK | wx.ICON_ERROR)
+
+    def on_fit_width(self, event):
+        """适应宽度"""
+        if not hasattr(self, 'pdf_doc') or not self.pdf_doc:
+            return
+
+        try:
+            import fitz
+
+            # 获取当前页和可视区域宽度
+            page = self.pdf_doc[self.current_page - 1]
+            page_width = page.rect.width
+            visible_width = self.pdf_scroll.GetClientSize().width - 40  # 减去边距
+
+            # 计算合适的缩放级别
+            self.zoom_level = int((visible_width / page_width) * 100)
+            self.zoom_level = max(50, min(200, self.zoom_level))  # 限制在50-200之间
+
+            self.zoom_label.SetLabel(f"{self.zoom_level}%")
+            self.render_pdf_page()
+
+        except Exception as e:
+            print(f"适应宽度错误: {e}")
+
+    def update_page_label(self):
+        """更新页码标签"""
+        self.page_label.SetLabel(f"页码: {self.current_page}/{self.total_pages}")
+        self.page_input.SetValue(self.current_page)
+
+    def create_right_panel(self):
+        """
+        创建右侧参数编辑面板
+        """
+        panel = wx.Panel(self)
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        # 标题
+        title = wx.StaticText(panel, label="封装参数解析结果")
+        title_font = title.GetFont()
+        title_font.PointSize += 2
+        title_font = title_font.Bold()
+        title.SetFont(title_font)
+        sizer.Add(title, 0, wx.ALL, 10)
+
+        # 滚动窗口，用于显示提示、解析状态和错误信息
+        self.scroll_window = wx.ScrolledWindow(panel, style=wx.VSCROLL)
+        self.scroll_window.SetScrollRate(0, 20)
+
+        self.scroll_sizer = wx.BoxSizer(wx.VERTICAL)
+        self.scroll_window.SetSizer(self.scroll_sizer)
+
+        sizer.Add(self.scroll_window, 1, wx.EXPAND | wx.ALL, 5)
+
+        # 虚拟化的封装列表（有解析结果时替换上面的滚动窗口）
+        self.package_view = PackageListView(panel, self)
+        self.package_view.Hide()
+        sizer.Add(self.package_view, 1, wx.EXPAND | wx.ALL, 5)
+
+        # 底部操作按钮
+        btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
+
+        self.library_check = wx.CheckBox(panel, label="写入封装库（不修改板子）")
+        self.library_check.Bind(wx.EVT_CHECKBOX, self.on_library_toggle)
+        btn_sizer.Add(self.library_check, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+
+        # 生成到板子后是否保存板子（不勾选时由用户自行保存）
+        self.save_board_check = wx.CheckBox(panel, label="生成后保存板子")
+        self.save_board_check.SetValue(True)
+        btn_sizer.Add(self.save_board_check, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+
+        # 服务器提供 PUT /batch 时一次请求保存全部封装；无法自动探测，由用户开启
+        # 同步线程在进程内共用，勾选状态取自它的客户端（调用失败自动关闭后显示为未勾选）
+        self.batch_save_check = wx.CheckBox(panel, label="使用批量保存接口")
+        self.batch_save_check.SetValue(self.save_journal.api_client.batch_save_supported)
+        self.batch_save_check.Bind(wx.EVT_CHECKBOX, self.on_batch_save_toggle)
+        btn_sizer.Add(self.batch_save_check, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+
+        btn_sizer.AddStretchSpacer()
+
+        self.save_generate_btn = wx.Button(panel, label="保存并生成所有封装")
+        self.save_generate_btn.Bind(wx.EVT_BUTTON, self.on_save_and_generate_all)
+        self.save_generate_btn.Enable(False)
+        btn_sizer.Add(self.save_generate_btn, 0, wx.ALL, 5)
+
+        sizer.Add(btn_sizer, 0, wx.EXPAND | wx.ALL, 5)
+
+        panel.SetSizer(sizer)
+        return panel
+
+    def on_batch_save_toggle(self, event):
+        """
+        开启或关闭批量保存接口，之后的同步按新设置保存
+        """
+        enabled = self.batch_save_check.GetValue()
+        self.save_journal.api_client.set_batch_save(enabled)
+        self.set_status("保存时使用批量接口" if enabled else "保存时逐个提交封装")
+
+    def on_library_toggle(self, event):
+        """
+        切换输出方式：勾选时选择封装库目录，之后生成的封装写入库中而不添加到板子
+        """
+        if not self.library_check.GetValue():
+            self.library_path = None
+            self.library_check.SetLabel("写入封装库（不修改板子）")
+            self.set_status("生成的封装将添加到当前板子")
+            return
+
+        with wx.DirDialog(self, "选择或新建封装库目录（.pretty）",
+                          style=wx.DD_DEFAULT_STYLE) as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
+                self.library_check.SetValue(False)
+                return
+            path = dialog.GetPath()
+
+        try:
+            self.library_path = ensure_library(path)
+        except OSError as e:
+            self.library_check.SetValue(False)
+            wx.MessageBox(f"无法创建封装库: {str(e)}", "错误", wx.OK | wx.ICON_ERROR)
+            return
+        self.library_check.SetLabel(f"写入封装库: {os.path.basename(self.library_path)}")
+        self.library_check.GetParent().Layout()
+        self.set_status(f"生成的封装将写入 {self.library_path}")
+
+    def on_upload_pdf(self, event):
+        """
+        上传PDF处理 - 保留原有的API上传功能
+        """
+        wildcard = "PDF文件 (*.pdf)|*.pdf"
+        dialog = wx.FileDialog(self, "选择PDF数据手册", wildcard=wildcard,
+                               style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST)
+
+        if dialog.ShowModal() == wx.ID_OK:
+            self.pdf_path = dialog.GetPath()
+
+            # 清空右侧表格和数据
+            self.clear_package_data()
+
+            # 先加载PDF预览
+            self.load_pdf_preview()
+
+            # 已解析过的数据手册直接从本地缓存加载，否则上传到API
+            if not self.load_cached_results():
+                if self.shard_checkbox.GetValue() and self.total_pages > self.shard_page_threshold:
+                    self.upload_pdf_sharded()
+                else:
+                    self.upload_pdf_to_api()
+
+        dialog.Destroy()
+
+    def load_cached_results(self):
+        """
+        按PDF哈希从本地缓存加载解析结果，并在后台向服务器重新校验
+
+        Returns:
+            是否命中缓存
+        """
+        try:
+            self.pdf_hash = ResultCache.file_hash(self.pdf_path)
+            entry = self.result_cache.lookup_by_hash(self.pdf_hash)
+        except Exception as e:
+            print(f"读取本地缓存失败: {str(e)}")
+            return False
+
+        if not entry:
+            return False
+
+        self.datasheet_uuid = entry['uuid']
+        self.shard_infos = entry.get('shards')
+        self.fetch_btn.Enable(True)
+
+        package_list = ResultCache.apply_edits(entry)
+        if not package_list:
+            # 之前上传过但还没有解析结果，继续轮询
+            self.set_status(f"该数据手册已上传过，UUID: {self.datasheet_uuid}")
+            self.start_auto_fetch()
+            return True
+
+        self.set_package_list(package_list)
+        self.display_all_packages()
+        self.save_generate_btn.Enable(True)
+        self.set_status(f"已从本地缓存加载 {len(self.package_list)} 个封装结果，正在后台校验...")
+
+        thread = threading.Thread(target=self._revalidate_worker,
+                                  args=(self.datasheet_uuid, entry.get('packageList'),
+                                        self.shard_infos),
+                                  daemon=True)
+        thread.start()
+        return True
+
+    def _revalidate_worker(self, datasheet_uuid, cached_package_list, shards=None):
+        """
+        后台线程：向服务器获取最新结果，与缓存比较
+        """
+        try:
+            if shards:
+                package_list = self.sharded_uploader.fetch_merged(shards)
+            else:
+                response = self.api_client.fetch_packages(datasheet_uuid, timeout=30)
+                if response.status_code != 200:
+                    return
+                package_list = json_loads(response.content)
+        except Exception as e:
+            print(f"后台校验缓存失败: {str(e)}")
+            return
+
+        if not package_list or package_list == cached_package_list:
+            wx.CallAfter(self._on_revalidated, datasheet_uuid, False)
+            return
+
+        try:
+            self.result_cache.store_results(datasheet_uuid, None, package_list)
+        except Exception as e:
+            print(f"写入本地缓存失败: {str(e)}")
+            return
+        wx.CallAfter(self._on_revalidated, datasheet_uuid, True)
+
+    def _on_revalidated(self, datasheet_uuid, changed):
+        """
+        后台校验完成（主线程）：服务器结果有变化时刷新显示
+        """
+        if not self or datasheet_uuid != self.datasheet_uuid:
+            # 对话框已关闭或已切换到其他数据手册
+            return
+
+        if not changed:
+            self.set_status(f"已加载 {len(self.package_list)} 个封装结果（本地缓存已是最新）")
+            return
+
+        self.set_package_list(ResultCache.apply_edits(self.result_cache.load(datasheet_uuid)))
+        self.display_all_packages()
+        self.set_status(f"服务器解析结果已更新，共 {len(self.package_list)} 个封装")
+
+    def set_package_list(self, package_list):
+        """
+        设置封装列表，并一次性解码为 PackageRecord（之后不再重复解析 packageResult）
+        按 packageId 与已有记录合并：已有记录原地更新，界面上未保存的编辑只在
+        服务器修改了同一字段时才被覆盖
+        """
+        # 先提交正在编辑的单元格
+        self.package_view.commit_all()
+        new_records = decode_package_list(package_list)
+        self.packages, changed = reconcile_records(self.packages, self.base_records, new_records)
+        self.package_list = package_list
+        self.base_records = new_records
+        self.changed_package_ids |= changed
+
+    def cache_package_list(self, package_list):
+        """
+        将刚获取的解析结果写入本地缓存
+
+        Returns:
+            合并了尚未同步的用户编辑的 package_list（用于 set_package_list）
+        """
+        try:
+            entry = self.result_cache.store_results(self.datasheet_uuid, self.pdf_hash, package_list,
+                                                    shards=self.shard_infos)
+            return ResultCache.apply_edits(entry)
+        except Exception as e:
+            print(f"写入本地缓存失败: {str(e)}")
+            return package_list
+
+    def upload_pdf_sharded(self):
+        """
+        分片上传大型PDF：后台拆分、并发上传解析，完成后合并显示
+        """
+        self.set_status(f"PDF共 {self.total_pages} 页，正在拆分为分片上传...")
+        self.show_parsing_status()
+
+        thread = threading.Thread(target=self._sharded_upload_worker,
+                                  args=(self.pdf_path,), daemon=True)
+        thread.start()
+
+    def _sharded_upload_worker(self, pdf_path):
+        """
+        后台线程：执行分片上传和解析
+        """
+        def on_progress(message):
+            wx.CallAfter(self._set_status_if_alive, message)
+
+        try:
+            shards, package_list, unfinished = self.sharded_uploader.run(
+                pdf_path, on_progress=on_progress)
+        except Exception as e:
+            wx.CallAfter(self._on_sharded_upload_failed, pdf_path, str(e))
+            return
+        wx.CallAfter(self._on_sharded_upload_done, pdf_path, shards, package_list, unfinished)
+
+    def _set_status_if_alive(self, message):
+        if self:
+            self.set_status(message)
+
+    def _on_sharded_upload_done(self, pdf_path, shards, package_list, unfinished=()):
+        """
+        分片解析完成（主线程）
+        unfinished 为等待超时仍没有结果的分片，提示用户稍后重新获取
+        """
+        if not self or pdf_path != self.pdf_path:
+            return
+
+        self.stop_parsing_animation()
+        self.shard_infos = shards
+        self.datasheet_uuid = shards[0]['uuid']
+        self.fetch_btn.Enable(True)
+
+        if package_list:
+            self.set_package_list(self.cache_package_list(package_list))
+            self.display_all_packages()
+            self.save_generate_btn.Enable(True)
+
+        if not unfinished:
+            self.set_status(f"{len(shards)} 个分片解析完成，合并后共 {len(package_list)} 个封装")
+            return
+
+        self.set_status(f"{len(shards) - len(unfinished)}/{len(shards)} 个分片返回了结果，"
+                        f"合并后共 {len(package_list)} 个封装；{len(unfinished)} 个分片未返回结果")
+        lines = [f"第 {shard['firstPage']} 页起的分片（UUID: {shard['uuid']}）"
+                 for shard in unfinished]
+        wx.MessageBox("以下分片在等待时间内没有返回封装，可能没有封装，也可能仍在解析:\n\n"
+                      + "\n".join(lines)
+                      + "\n\n请稍后点击“获取解析结果”重新获取所有分片的结果",
+                      "部分分片未完成", wx.OK | wx.ICON_WARNING)
+
+    def _on_sharded_upload_failed(self, pdf_path, message):
+        """
+        分片上传失败（主线程）
+        """
+        if not self or pdf_path != self.pdf_path:
+            return
+
+        self.stop_parsing_animation()
+        self.show_package_view(False)
+        self.scroll_sizer.Clear(True)
+        self.scroll_window.FitInside()
+        self.set_status(f"分片上传失败: {message}")
+        wx.MessageBox(f"分片上传失败: {message}", "错误", wx.OK | wx.ICON_ERROR)
+
+    def refetch_shards(self):
+        """
+        重新获取所有分片的结果并合并
+        """
+        self.set_status("正在获取各分片的封装参数...")
+        try:
+            package_list = self.sharded_uploader.fetch_merged(self.shard_infos)
+        except Exception as e:
+            self.set_status(f"获取错误: {str(e)}")
+            wx.MessageBox(f"获取错误: {str(e)}", "错误", wx.OK | wx.ICON_ERROR)
+            return
+
+        self.set_package_list(self.cache_package_list(package_list))
+        self.display_all_packages()
+        self.set_status(f"成功获取 {len(self.package_list)} 个封装结果（{len(self.shard_infos)} 个分片）")
+
+    def upload_pdf_to_api(self):
+        """
+        上传PDF到API
+        """
+        if not self.pdf_path:
+            return
+
+        self.set_status("正在上传数据手册...")
+
+        try:
+            response = self.api_client.upload_pdf(self.pdf_path, timeout=60)
+
+            if response.status_code == 200:
+                result = json_loads(response.content)
+                if result.get('success'):
+                    self.datasheet_uuid = result.get('uuid')
+                    file_id = result.get('fileId')
+                    if self.pdf_hash:
+                        self.result_cache.remember_upload(self.pdf_hash, self.datasheet_uuid)
+                    self.set_status(f"上传成功！UUID: {self.datasheet_uuid}, FileID: {file_id}")
+                    # 显示正在解析中的状态
+                    self.show_parsing_status()
+                    # 启用获取按钮
+                    self.fetch_btn.Enable(True)
+
+                    # 自动获取解析结果
+                    wx.CallLater(1000, self.start_auto_fetch)
+                else:
+                    self.set_status(f"上传失败: {result.get('message', '未知错误')}")
+                    wx.MessageBox(f"上传失败: {result.get('message', '未知错误')}",
+                                "错误", wx.OK | wx.ICON_ERROR)
+            else:
+                self.set_status(f"上传失败: HTTP {response.status_code}")
+                wx.MessageBox(f"上传失败: {response.text}", "错误", wx.OK | wx.ICON_ERROR)
+        except Exception as e:
+            self.set_status(f"上传错误: {str(e)}")
+            wx.MessageBox(f"上传错误: {str(e)}", "错误", wx.OK | wx.ICON_ERROR)
+
+    def on_fetch_results(self, event):
+        """
+        获取解析结果按钮处理
+        """
+        self.fetch_package_data()
+
+    def fetch_package_data(self):
+        """
+        从API获取封装数据
+        """
+        if not self.datasheet_uuid:
+            wx.MessageBox("请先上传数据手册", "提示", wx.OK | wx.ICON_INFORMATION)
+            return
+
+        if self.shard_infos:
+            self.refetch_shards()
+            return
+
+        # 停止之前的自动刷新
+        self.stop_auto_fetch()
+
+        if not self.packages:
+            # 还没有结果：显示解析中状态并自动刷新（会立即获取一次）
+            self.start_auto_fetch()
+            return
+
+        # 已在显示封装：直接获取并增量刷新，不切换到解析中状态，保留滚动位置和焦点
+        self.set_status("正在获取封装参数...")
+        try:
+            response = self.api_client.fetch_packages(self.datasheet_uuid, timeout=30)
+
+            if response.status_code == 200:
+                package_list = json_loads(response.content)
+                if package_list:
+                    self.set_package_list(self.cache_package_list(package_list))
+                    self.display_all_packages()
+                    self.set_status(f"成功获取 {len(self.package_list)} 个封装结果")
+                    self.save_generate_btn.Enable(True)
+                else:
+                    self.set_status("服务器暂无解析结果，保留当前显示的封装")
+            else:
+                self.set_status(f"获取失败: HTTP {response.status_code}")
+                wx.MessageBox(f"获取失败: {response.text}", "错误", wx.OK | wx.ICON_ERROR)
+
+        except Exception as e:
+            self.set_status(f"获取错误: {str(e)}")
+            wx.MessageBox(f"获取错误: {str(e)}", "错误", wx.OK | wx.ICON_ERROR)
+
+    def display_all_packages(self):
+        """
+        显示所有封装的参数表格
+        列表是虚拟化的：只为滚动视口内的封装创建（复用）编辑面板；
+        已在显示时只刷新有变化的面板，保留滚动位置和焦点
+        """
+        if not self.package_view.IsShown():
+            self.scroll_sizer.Clear(True)
+            self.show_package_view(True)
+        self.package_view.update_records(self.packages, self.changed_package_ids)
+        self.changed_package_ids = set()
+
+    def show_package_view(self, show):
+        """
+        在封装列表和提示/状态区域之间切换
+        """
+        if self.package_view.IsShown() == show:
+            return
+        if not show:
+            self.package_view.set_records([])
+        self.package_view.Show(show)
+        self.scroll_window.Show(not show)
+        self.package_view.GetParent().Layout()
+
+    def clear_package_data(self):
+        """
+        清空右侧封装数据和表格
+        """
+        # 清空数据
+        self.set_package_list([])
+        self.datasheet_uuid = None
+        self.pdf_hash = None
+        self.shard_infos = None
+
+        # 清空右侧滚动区域的所有内容
+        self.show_package_view(False)
+        self.scroll_sizer.Clear(True)
+
+        # 添加提示信息
+        hint_panel = wx.Panel(self.scroll_window)
+        hint_sizer = wx.BoxSizer(wx.VERTICAL)
+
+        hint_text = wx.StaticText(hint_panel,
+                                 label="请上传PDF并等待解析结果")
+        hint_text.SetForegroundColour(wx.Colour(150, 150, 150))
+        font = wx.Font(12, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_ITALIC, wx.FONTWEIGHT_NORMAL)
+        hint_text.SetFont(font)
+
+        hint_sizer.AddStretchSpacer(1)
+        hint_sizer.Add(hint_text, 0, wx.ALIGN_CENTER | wx.ALL, 20)
+        hint_sizer.AddStretchSpacer(1)
+
+        hint_panel.SetSizer(hint_sizer)
+        self.scroll_sizer.Add(hint_panel, 1, wx.EXPAND | wx.ALL, 10)
+
+        # 刷新布局
+        self.scroll_window.Layout()
+        self.scroll_sizer.Layout()
+        self.scroll_window.FitInside()
+
+        # 禁用保存按钮
+        self.save_generate_btn.Enable(False)
+
+        # 重置获取按钮状态
+        self.fetch_btn.Enable(False)
+
+    def show_parsing_status(self, show_retry_button=False):
+        """
+        显示正在解析中的状态
+
+        Args:
+            show_retry_button: 是否显示手动重试按钮
+        """
+        # 清空右侧滚动区域的所有内容
+        self.show_package_view(False)
+        self.scroll_sizer.Clear(True)
+
+        # 创建状态面板
+        status_panel = wx.Panel(self.scroll_window)
+        status_panel.SetBackgroundColour(wx.Colour(250, 250, 250))
+        status_sizer = wx.BoxSizer(wx.VERTICAL)
+
+        status_sizer.AddStretchSpacer(1)
+
+        if show_retry_button:
+            # 超时后显示
+            title_text = wx.StaticText(status_panel, label="⏱️ 解析超时")
+            title_font = wx.Font(16, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD)
+            title_text.SetFont(title_font)
+            title_text.SetForegroundColour(wx.Colour(200, 100, 50))
+            status_sizer.Add(title_text, 0, wx.ALIGN_CENTER | wx.ALL, 10)
+
+            hint_text = wx.StaticText(status_panel,
+                                      label="解析时间超过5分钟\n可能PDF较大或服务器繁忙\n请手动点击下方按钮重新获取")
+            hint_text.SetForegroundColour(wx.Colour(100, 100, 100))
+            hint_font = wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL)
+            hint_text.SetFont(hint_font)
+            status_sizer.Add(hint_text, 0, wx.ALIGN_CENTER | wx.ALL, 10)
+
+            # 手动重试按钮
+            retry_btn = wx.Button(status_panel, label="🔄 重新获取解析结果", size=(200, 40))
+            retry_btn.SetBackgroundColour(wx.Colour(74, 134, 232))
+            retry_btn.SetForegroundColour(wx.WHITE)
+            retry_font = wx.Font(11, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD)
+            retry_btn.SetFont(retry_font)
+            retry_btn.Bind(wx.EVT_BUTTON, lambda e: self.start_auto_fetch())
+            status_sizer.Add(retry_btn, 0, wx.ALIGN_CENTER | wx.ALL, 20)
+
+        else:
+            # 正在解析中显示
+            title_text = wx.StaticText(status_panel, label="⏳ 正在解析中，请稍后...")
+            title_font = wx.Font(16, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD)
+            title_text.SetFont(title_font)
+            title_text.SetForegroundColour(wx.Colour(70, 130, 180))
+            status_sizer.Add(title_text, 0, wx.ALIGN_CENTER | wx.ALL, 10)
+
+            hint_text = wx.StaticText(status_panel,
+                                      label="正在从PDF中提取封装参数\n系统会自动刷新结果（最多5分钟）")
+            hint_text.SetForegroundColour(wx.Colour(100, 100, 100))
+            hint_font = wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_ITALIC, wx.FONTWEIGHT_NORMAL)
+            hint_text.SetFont(hint_font)
+            status_sizer.Add(hint_text, 0, wx.ALIGN_CENTER | wx.ALL, 10)
+
+            # 动画点点点
+            self.parsing_dots = 0
+            self.parsing_text = wx.StaticText(status_panel, label="...")
+            parsing_font = wx.Font(14, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL)
+            self.parsing_text.SetFont(parsing_font)
+            self.parsing_text.SetForegroundColour(wx.Colour(70, 130, 180))
+            status_sizer.Add(self.parsing_text, 0, wx.ALIGN_CENTER | wx.ALL, 5)
+
+            # 显示已等待时间
+            self.wait_time_text = wx.StaticText(status_panel, label="已等待: 0秒")
+            wait_font = wx.Font(9, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL)
+            self.wait_time_text.SetFont(wait_font)
+            self.wait_time_text.SetForegroundColour(wx.Colour(150, 150, 150))
+            status_sizer.Add(self.wait_time_text, 0, wx.ALIGN_CENTER | wx.ALL, 5)
+
+            # 启动动画定时器
+            if not hasattr(self, 'parsing_timer'):
+                self.parsing_timer = wx.Timer(self)
+                self.Bind(wx.EVT_TIMER, self.on_parsing_animation, self.parsing_timer)
+            self.parsing_timer.Start(500)  # 每500毫秒更新一次
+
+        status_sizer.AddStretchSpacer(1)
+
+        status_panel.SetSizer(status_sizer)
+        self.scroll_sizer.Add(status_panel, 1, wx.EXPAND | wx.ALL, 10)
+
+        # 刷新布局
+        self.scroll_window.Layout()
+        self.scroll_sizer.Layout()
+        self.scroll_window.FitInside()
+
+    def on_parsing_animation(self, event):
+        """
+        解析动画效果，同时更新等待时间
+        """
+        if hasattr(self, 'parsing_text') and self.parsing_text:
+            self.parsing_dots = (self.parsing_dots + 1) % 4
+            dots = "." * (self.parsing_dots + 1)
+            self.parsing_text.SetLabel(dots)
+
+        # 更新等待时间
+        if hasattr(self, 'wait_time_text') and self.wait_time_text and self.fetch_start_time:
+            import time
+            elapsed = int(time.time() - self.fetch_start_time)
+            self.wait_time_text.SetLabel(f"已等待: {elapsed}秒 / 300秒")
+
+    def stop_parsing_animation(self):
+        """
+        停止解析动画
+        """
+        if hasattr(self, 'parsing_timer') and self.parsing_timer and self.parsing_timer.IsRunning():
+            self.parsing_timer.Stop()
+        if hasattr(self, 'parsing_text'):
+            self.parsing_text = None
+        if hasattr(self, 'wait_time_text'):
+            self.wait_time_text = None
+
+    def on_dialog_close(self, event):
+        """
+        对话框关闭时清理资源
+        """
+        self.cleanup()
+        # 继续关闭
+        event.Skip()
+
+    def cleanup(self):
+        """
+        停止定时器和后台任务，释放资源
+        """
+        # 停止所有定时器
+        self.stop_auto_fetch()
+        self.stop_parsing_animation()
+
+        # 关闭PDF文档
+        if hasattr(self, 'pdf_doc') and self.pdf_doc:
+            self.pdf_doc.close()
+
+        # 保存日志在后台继续同步，只是不再通知这个对话框
+        if self.save_journal.on_flushed == self.on_journal_flushed:
+            self.save_journal.on_flushed = None
+
+        # 停止批量处理（队列已持久化，下次打开时继续）
+        if getattr(self, 'batch_dialog', None):
+            self.batch_dialog.stop_pipeline()
+
+    def start_auto_fetch(self):
+        """
+        开始自动刷新解析结果
+        """
+        import time
+
+        # 记录开始时间
+        self.fetch_start_time = time.time()
+        self.fetch_retry_count = 0
+
+        # 显示解析中状态
+        self.show_parsing_status(show_retry_button=False)
+
+        # 立即获取一次
+        self.auto_fetch_package_data()
+
+    def auto_fetch_package_data(self):
+        """
+        自动获取封装数据（带超时控制）
+        """
+        import time
+
+        if not self.datasheet_uuid:
+            return
+
+        # 检查是否超时
+        elapsed = time.time() - self.fetch_start_time
+        if elapsed > self.fetch_timeout:
+            # 超时，停止自动刷新
+            self.stop_auto_fetch()
+            self.show_parsing_status(show_retry_button=True)
+            self.set_status("解析超时（5分钟），请手动重试")
+            return
+
+        # 更新状态
+        self.set_status(f"正在获取封装参数... (第 {self.fetch_retry_count + 1} 次尝试)")
+
+        try:
+            response = self.api_client.fetch_packages(self.datasheet_uuid, timeout=10)
+
+            if response.status_code == 200:
+                package_list = json_loads(response.content)
+
+                if package_list:
+                    # 获取到数据，停止自动刷新
+                    self.stop_auto_fetch()
+                    self.stop_parsing_animation()
+
+                    # 写入本地缓存并显示封装表格
+                    self.set_package_list(self.cache_package_list(package_list))
+                    self.display_all_packages()
+                    self.set_status(f"成功获取 {len(self.package_list)} 个封装结果")
+                    self.save_generate_btn.Enable(True)
+                else:
+                    # 没有数据，继续轮询
+                    self.fetch_retry_count += 1
+
+                    # 启动定时器，间隔后再次查询
+                    if not self.auto_fetch_timer:
+                        self.auto_fetch_timer = wx.Timer(self)
+                        self.Bind(wx.EVT_TIMER, self.on_auto_fetch_timer, self.auto_fetch_timer)
+
+                    self.auto_fetch_timer.Start(self.fetch_interval * 1000, wx.TIMER_ONE_SHOT)
+            else:
+                # 请求失败，继续重试
+                self.fetch_retry_count += 1
+
+                if not self.auto_fetch_timer:
+                    self.auto_fetch_timer = wx.Timer(self)
+                    self.Bind(wx.EVT_TIMER, self.on_auto_fetch_timer, self.auto_fetch_timer)
+
+                self.auto_fetch_timer.Start(self.fetch_interval * 1000, wx.TIMER_ONE_SHOT)
+
+        except Exception as e:
+            # 发生错误，继续重试
+            print(f"自动获取错误: {str(e)}")
+            self.fetch_retry_count += 1
+
+            if not self.auto_fetch_timer:
+                self.auto_fetch_timer = wx.Timer(self)
+                self.Bind(wx.EVT_TIMER, self.on_auto_fetch_timer, self.auto_fetch_timer)
+
+            self.auto_fetch_timer.Start(self.fetch_interval * 1000, wx.TIMER_ONE_SHOT)
+
+    def on_auto_fetch_timer(self, event):
+        """
+        定时器触发，继续获取数据
+        """
+        self.auto_fetch_package_data()
+
+    def stop_auto_fetch(self):
+        """
+        停止自动刷新
+        """
+        if self.auto_fetch_timer and self.auto_fetch_timer.IsRunning():
+            self.auto_fetch_timer.Stop()
+
+        self.fetch_start_time = None
+        self.fetch_retry_count = 0
+
+    def get_param_col_attrs(self):
+        """
+        参数表格每列共享的单元格属性（所有表格共用同一组对象）
+        """
+        if not getattr(self, 'param_col_attrs', None):
+            name_attr = wx.grid.GridCellAttr()
+            name_attr.SetReadOnly(True)
+            name_attr.SetBackgroundColour(wx.Colour(240, 240, 240))
+
+            value_attr = wx.grid.GridCellAttr()
+            value_attr.SetReadOnly(False)
+            value_attr.SetBackgroundColour(wx.WHITE)
+
+            unit_attr = wx.grid.GridCellAttr()
+            unit_attr.SetReadOnly(True)
+            unit_attr.SetBackgroundColour(wx.Colour(240, 240, 240))
+
+            # 校验未通过的数值单元格
+            error_attr = wx.grid.GridCellAttr()
+            error_attr.SetReadOnly(False)
+            error_attr.SetBackgroundColour(wx.Colour(255, 200, 200))
+
+            self.param_col_attrs = (name_attr, value_attr, unit_attr, error_attr)
+        return self.param_col_attrs
+
+    def get_unit_for_param(self, param_name):
+        """
+        根据参数名称返回单位（参数模式中定义的直接查表）
+        """
+        return unit_for_param(param_name)
+
+    def on_add_param_grid(self, event, params_grid):
+        """
+        添加参数到Grid
+        """
+        # 创建自定义对话框
+        dlg = AddParameterDialog(self)
+
+        if dlg.ShowModal() == wx.ID_OK:
+            param_name = dlg.param_name.GetValue()
+            param_value = dlg.param_value.GetValue()
+            param_unit = dlg.param_unit.GetValue()
+
+            if param_name:  # 至少要有参数名
+                params_grid.GetTable().append_param(param_name, param_value, param_unit)
+                params_grid.ForceRefresh()
+
+        dlg.Destroy()
+
+    def on_delete_param_grid(self, event, params_grid):
+        """
+        删除Grid中选中的参数
+        """
+        # 获取当前选中的行
+        selected_rows = params_grid.GetSelectedRows()
+
+        if not selected_rows:
+            # 如果没有选中整行，尝试获取当前单元格所在行
+            current_row = params_grid.GetGridCursorRow()
+            if current_row >= 0:
+                selected_rows = [current_row]
+
+        if selected_rows:
+            params_grid.GetTable().delete_params(selected_rows)
+            params_grid.ForceRefresh()
+        else:
+            wx.MessageBox("请先选中要删除的行", "提示", wx.OK | wx.ICON_INFORMATION)
+
+    def on_generate_single(self, event, index):
+        """
+        生成单个封装
+        """
+        if self.validate_records([index]):
+            return
+        package_data = self.collect_package_data(index)
+        if package_data:
+            self.generate_kicad_footprint(package_data)
+
+    def on_save_and_generate_all(self, event):
+        """
+        保存所有封装参数并生成
+        保存只写入本地日志，由后台同步到服务器，生成不等待网络；
+        所有封装生成后一次性添加到板子，最后只提示一次结果
+        """
+        if self.validate_records(range(len(self.packages))):
+            return
+
+        self.set_status("正在保存所有封装参数...")
+
+        saved = []
+        failures = []
+        for record in self.packages:
+            package_data = record.to_package_data(as_text=True)
+            if self.save_package_to_api(package_data):
+                saved.append(package_data)
+            else:
+                failures.append(package_data['packageName'])
+
+        # 生成封装（已加入保存队列，无需再次保存）
+        self.set_status(f"正在生成 {len(saved)} 个封装...")
+        generated, errors, board_error = self.generate_footprints(saved)
+
+        pending = self.save_journal.pending_count()
+        self.set_status(f"成功保存并生成 {len(generated)}/{len(self.packages)} 个封装，"
+                        f"{pending} 个等待同步到服务器")
+
+        if self.library_path:
+            message = f"成功生成 {len(generated)} 个封装，已写入 {self.library_path}"
+        else:
+            message = f"成功生成 {len(generated)} 个封装，已添加到板子"
+        if errors:
+            if len(errors) > 20:
+                errors = errors[:20] + [f"... 共 {len(errors)} 项错误"]
+            message += "\n\n生成失败:\n" + "\n".join(errors)
+        if failures:
+            message += f"\n\n保存失败 {len(failures)} 个:\n" + "\n".join(failures)
+        if board_error:
+            message += f"\n\n{board_error}"
+        if errors or failures or board_error:
+            wx.MessageBox(message, "完成", wx.OK | wx.ICON_WARNING)
+        else:
+            wx.MessageBox(message, "完成", wx.OK | wx.ICON_INFORMATION)
+
+    def validate_records(self, indices):
+        """
+        生成前校验指定封装的参数（所有封装一次性校验）
+        未通过的参数在表格中标红，列表滚动到第一个有错误的封装并提示错误
+
+        Returns:
+            有错误的封装索引列表（为空表示全部通过）
+        """
+        self.package_view.commit_all()
+        indices = list(indices)
+        records = [self.packages[i] for i in indices]
+        results = validate_packages([(record.package_type, record.params) for record in records])
+
+        invalid = []
+        lines = []
+        for index, record, errors in zip(indices, records, results):
+            record.errors = error_cells(errors)
+            if errors:
+                invalid.append(index)
+                lines.extend(f"{record.package_name}: {message}" for _, message in errors)
+
+        self.package_view.refresh_grids()
+        if invalid:
+            self.package_view.scroll_to(invalid[0])
+            self.set_status(f"{len(invalid)} 个封装参数校验未通过，已标出错误参数")
+            if len(lines) > 20:
+                lines = lines[:20] + [f"... 共 {len(lines)} 项错误"]
+            wx.MessageBox("以下参数校验未通过，请修改后再生成:\n\n" + "\n".join(lines),
+                          "参数错误", wx.OK | wx.ICON_WARNING)
+        return invalid
+
+    def on_journal_flushed(self, results, pending_count):
+        """
+        保存日志同步一轮后的回调（后台线程）
+        """
+        wx.CallAfter(self._show_sync_result, results, pending_count)
+
+    def _show_sync_result(self, results, pending_count):
+        """
+        在状态栏显示同步结果（主线程）
+        """
+        if not self:
+            # 对话框已关闭
+            return
+
+        synced = sum(1 for _, success, _ in results if success)
+        failed = [f"{data['packageName']} ({error})" for data, success, error in results if not success]
+        if failed:
+            self.set_status(f"已同步 {synced} 个封装，{pending_count} 个等待重试: " + ", ".join(failed))
+        else:
+            self.set_status(f"已同步 {synced} 个封装到服务器")
+
+    def collect_package_data(self, index):
+        """
+        收集指定索引的封装数据
+        界面编辑直接写入 PackageRecord，这里只读模型，不访问控件
+        """
+        try:
+            return self.packages[index].to_package_data(as_text=True)
+        except Exception as e:
+            print(f"收集封装数据失败: {str(e)}")
+            return None
+
+    def save_package_to_api(self, package_data):
+        """
+        保存封装数据到API
+        先追加到本地保存日志，网络不可用时由后台线程稍后重试
+        """
+        try:
+            if self.datasheet_uuid:
+                self.result_cache.store_edit(self.datasheet_uuid, package_data)
+            self.save_journal.append(package_data)
+            return True
+        except Exception as e:
+            print(f"写入保存日志失败: {str(e)}")
+            return False
+
+    def generate_kicad_footprint(self, package_data, save_to_api=True, notify=True):
+        """
+        生成KiCad封装文件
+
+        Args:
+            package_data: 封装数据
+            save_to_api: 生成后是否同步保存到API（批量保存时已保存过）
+            notify: 是否弹出提示框（批量处理时只打印）
+
+        Returns:
+            是否成功添加到板子（或写入封装库）
+        """
+        def report(message, title, style):
+            if notify:
+                wx.MessageBox(message, title, wx.OK | style)
+            else:
+                print(message)
+
+        try:
+            generated, errors, board_error = self.generate_footprints([package_data])
+            if errors:
+                report("生成封装错误: " + "\n".join(errors), "错误", wx.ICON_ERROR)
+                return False
+
+            if save_to_api:
+                self.save_package_to_api(package_data)
+            package_name, path = generated[0]
+            if path:
+                report(f"封装 {package_name} 已写入 {path}", "成功", wx.ICON_INFORMATION)
+            elif board_error:
+                report(f"封装 {package_name} 已添加到板子\n\n{board_error}", "完成",
+                       wx.ICON_WARNING)
+            else:
+                report(f"封装 {package_name} 已添加到板子", "成功", wx.ICON_INFORMATION)
+            return True
+
+        except Exception as e:
+            import traceback
+            with open("C:/Log/kicad_plugin_error.txt", "w") as f:
+                f.write(traceback.format_exc())
+            report(f"生成封装错误: {str(e)}", "错误", wx.ICON_ERROR)
+            return False
+
+    def generate_footprints(self, package_data_list):
+        """
+        批量生成封装：先生成全部封装，再一次性添加到板子，只刷新一次、最多保存一次；
+        封装库输出时直接由几何数据写 .kicad_mod 文件，不创建pcbnew对象，也不修改板子
+
+        Returns:
+            ([(封装名称, 封装库中的文件路径或None)], 错误信息列表, 保存板子的问题（没有为None）)
+        """
+        board = None
+        if not self.library_path:
+            board = pcbnew.GetBoard()
+            if not board:
+                return [], ["无法获取当前板子"], None
+
+        generated = []
+        errors = []
+        footprints = []
+        for package_data in package_data_list:
+            package_name = package_data['packageName']
+            package_type = package_data.get('packageType', '').upper()
+            if package_type not in FAMILIES:
+                errors.append(f"{package_name}: 不支持的封装类型 {package_type}")
+                continue
+            try:
+                # 别名统一为规范名称、数值转换为对应类型并补齐可选参数的默认值
+                params = normalize_params(package_type, package_data['packageResult'],
+                                          fill_defaults=True)
+                if self.library_path:
+                    geometry = build_geometry(package_type, package_name, params)
+                    generated.append((package_name, save_footprint(geometry, self.library_path)))
+                else:
+                    footprints.append(self._generate_footprint(package_type, package_name,
+                                                               params, board))
+                    generated.append((package_name, None))
+            except Exception as e:
+                print(f"生成封装 {package_name} 失败: {str(e)}")
+                errors.append(f"{package_name}: {str(e)}")
+
+        board_error = None
+        if footprints:
+            board_error = self._add_to_board(board, footprints)
+        return generated, errors, board_error
+
+    def _add_to_board(self, board, footprints):
+        """
+        添加生成的封装后刷新一次显示，按选项保存一次板子
+        封装已经添加到板子，保存失败时不影响生成结果，只返回提示由调用方显示
+
+        Returns:
+            保存板子的问题（没有为None）
+        """
+        for footprint in footprints:
+            board.Add(footprint)
+        pcbnew.Refresh()
+        if not self.save_board_check.GetValue():
+            return None
+
+        file_name = board.GetFileName()
+        if not file_name:
+            return "板子尚未保存为文件，未自动保存，请在 PCB 编辑器中手动保存"
+        try:
+            board.Save(file_name)
+        except Exception as e:
+            print(f"保存板子失败: {str(e)}")
+            return f"保存板子失败: {str(e)}，封装已添加到板子，请手动保存"
+        return None
+
+    def generate_package_list(self, package_list):
+        """
+        批量生成服务器返回的封装列表（不弹出提示框）
+
+        Returns:
+            (成功数, 错误信息列表)
+        """
+        # 生成前一次性校验全部封装，未通过的跳过
+        packages, errors = prepare_packages(package_list)
+        generated, generate_errors, board_error = self.generate_footprints(packages)
+        for package_name, path in generated:
+            print(f"封装 {package_name} 已写入 {path}" if path else f"封装 {package_name} 已添加到板子")
+        if board_error:
+            generate_errors.append(board_error)
+        return len(generated), errors + generate_errors
+
+    def on_batch_process(self, event):
+        """
+        打开批量处理窗口
+        """
+        if not getattr(self, 'batch_dialog', None):
+            self.batch_dialog = BatchDialog(self)
+        self.batch_dialog.Show()
+        self.batch_dialog.Raise()
+
+    def _generate_footprint(self, package_type, package_name, params, board):
+        """
+        生成封装：先计算几何数据，再一次性创建pcbnew对象
+        """
+        try:
+            geometry = build_geometry(package_type, package_name, params)
+            footprint = materialize(geometry, board)
+            print(f"已添加 {len(geometry.pads)} 个{package_type}焊盘")
+            return footprint
+
+        except Exception as e:
+            raise Exception(f"生成{package_type}封装错误: {str(e)}")
+
+    def set_status(self, message):
+        """设置状态栏文本"""
+        self.status_text.SetLabel(message)
+
+
+class PackagePanel(wx.Panel):
+    """
+    单个封装的编辑面板
+    控件只创建一次，通过 bind() 绑定到不同的 PackageRecord 以便在虚拟列表中复用
+    """
+
+    def __init__(self, parent, dialog):
+        wx.Panel.__init__(self, parent)
+        self.dialog = dialog
+        self.record = None
+        self.index = -1
+
+        self.SetBackgroundColour(wx.Colour(245, 245, 245))
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        # 封装基本信息（可编辑）
+        info_sizer = wx.FlexGridSizer(3, 3, 5, 10)
+        info_sizer.AddGrowableCol(1)
+
+        # 封装类型
+        info_sizer.Add(wx.StaticText(self, label="封装类型:"), 0,
+                      wx.ALIGN_CENTER_VERTICAL)
+        self.package_type_ctrl = wx.TextCtrl(self)
+        self.package_type_ctrl.Bind(wx.EVT_TEXT,
+                                    lambda e: self.on_text_changed(e, 'package_type'))
+        info_sizer.Add(self.package_type_ctrl, 1, wx.EXPAND)
+        info_sizer.AddSpacer(1)
+
+        # 封装名称
+        info_sizer.Add(wx.StaticText(self, label="封装名称:"), 0,
+                      wx.ALIGN_CENTER_VERTICAL)
+        self.package_name_ctrl = wx.TextCtrl(self)
+        self.package_name_ctrl.Bind(wx.EVT_TEXT,
+                                    lambda e: self.on_text_changed(e, 'package_name'))
+        info_sizer.Add(self.package_name_ctrl, 1, wx.EXPAND)
+        info_sizer.AddSpacer(1)
+
+        # 页码 + 跳转按钮
+        info_sizer.Add(wx.StaticText(self, label="页码:"), 0,
+                      wx.ALIGN_CENTER_VERTICAL)
+        self.page_numbers_ctrl = wx.TextCtrl(self)
+        self.page_numbers_ctrl.Bind(wx.EVT_TEXT,
+                                    lambda e: self.on_text_changed(e, 'page_numbers'))
+        info_sizer.Add(self.page_numbers_ctrl, 1, wx.EXPAND)
+
+        jump_btn = wx.Button(self, label="跳转", size=(60, -1))
+        jump_btn.Bind(wx.EVT_BUTTON,
+                     lambda e: dialog.on_jump_to_page(e, self.page_numbers_ctrl))
+        info_sizer.Add(jump_btn, 0, wx.ALIGN_CENTER_VERTICAL)
+
+        sizer.Add(info_sizer, 0, wx.EXPAND | wx.ALL, 10)
+
+        # 参数表格（虚拟表格，切换记录时只替换数据源）
+        self.params_grid = wx.grid.Grid(self)
+        self.params_table = ParamGridTable(None, dialog.get_param_col_attrs(),
+                                           dialog.get_unit_for_param)
+        self.params_grid.SetTable(self.params_table, True)
+
+        self.params_grid.SetRowLabelSize(0)
+
+        # 设置列宽
+        self.params_grid.SetColSize(0, 330)
+        self.params_grid.SetColSize(1, 180)
+        self.params_grid.SetColSize(2, 100)
+
+        # 设置表格高度
+        self.params_grid.SetMinSize((-1, 300))
+
+        self.params_grid.SetDefaultEditor(wx.grid.GridCellTextEditor())
+        self.params_grid.EnableEditing(True)
+
+        # 禁用行列标签的拖拽调整
+        self.params_grid.EnableDragColSize(False)
+        self.params_grid.EnableDragRowSize(False)
+        self.params_grid.EnableDragGridSize(False)
+
+        sizer.Add(self.params_grid, 1, wx.EXPAND | wx.ALL, 10)
+
+        # 操作按钮
+        btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
+
+        add_param_btn = wx.Button(self, label="添加参数")
+        add_param_btn.Bind(wx.EVT_BUTTON,
+                           lambda e: dialog.on_add_param_grid(e, self.params_grid))
+        btn_sizer.Add(add_param_btn, 0, wx.ALL, 5)
+
+        del_param_btn = wx.Button(self, label="删除选中参数")
+        del_param_btn.Bind(wx.EVT_BUTTON,
+                           lambda e: dialog.on_delete_param_grid(e, self.params_grid))
+        btn_sizer.Add(del_param_btn, 0, wx.ALL, 5)
+
+        btn_sizer.AddStretchSpacer()
+
+        collapse_btn = wx.Button(self, label="收起")
+        collapse_btn.Bind(wx.EVT_BUTTON, lambda e: parent.set_expanded(self.index, False))
+        btn_sizer.Add(collapse_btn, 0, wx.ALL, 5)
+
+        generate_btn = wx.Button(self, label="生成此封装")
+        generate_btn.Bind(wx.EVT_BUTTON,
+                          lambda e: dialog.on_generate_single(e, self.index))
+        btn_sizer.Add(generate_btn, 0, wx.ALL, 5)
+
+        sizer.Add(btn_sizer, 0, wx.EXPAND | wx.ALL, 5)
+
+        self.SetSizer(sizer)
+
+    def bind(self, record, index):
+        """
+        绑定到封装记录（ChangeValue 不触发文本事件）
+        """
+        self.record = record
+        self.index = index
+        self.package_type_ctrl.ChangeValue(record.package_type)
+        self.package_name_ctrl.ChangeValue(record.package_name)
+        self.page_numbers_ctrl.ChangeValue(record.page_numbers)
+        self.params_table.set_record(record)
+        self.params_grid.Scroll(0, 0)
+
+    def refresh(self):
+        """
+        记录被原地更新后重新读取（只改动变化的文本框，表格保持滚动位置）
+        """
+        for ctrl, value in ((self.package_type_ctrl, self.record.package_type),
+                            (self.package_name_ctrl, self.record.package_name),
+                            (self.page_numbers_ctrl, self.record.page_numbers)):
+            if ctrl.GetValue() != value:
+                ctrl.ChangeValue(value)
+        self.params_table.set_record(self.record)
+
+    def on_text_changed(self, event, field):
+        """
+        文本框编辑直接写入记录（bind 时使用 ChangeValue，不会触发）
+        """
+        if self.record is not None:
+            setattr(self.record, field, event.GetString())
+        event.Skip()
+
+    def commit(self):
+        """
+        提交正在编辑的单元格（文本框和已完成的单元格编辑已实时写入记录）
+        """
+        if self.record is not None and self.params_grid.IsCellEditControlEnabled():
+            self.params_grid.DisableCellEditControl()
+
+    def unbind(self):
+        """
+        解除绑定（面板回收到复用池）
+        """
+        self.commit()
+        self.record = None
+        self.index = -1
+
+
+class PackageListView(wx.ScrolledWindow):
+    """
+    虚拟化的封装列表
+    封装默认折叠为一行摘要，点击摘要展开为编辑面板；只有视口内展开的槽位绑定面板，
+    面板在滚动时回收复用
+    """
+
+    SLOT_MARGIN = 10
+    SUMMARY_HEIGHT = 28
+
+    def __init__(self, parent, dialog):
+        wx.ScrolledWindow.__init__(self, parent, style=wx.VSCROLL)
+        self.dialog = dialog
+        self.records = []
+        self.expanded = set()  # 展开的记录
+        self.offsets = [0]     # 各槽位的顶部位置，最后一项为总高度
+        self.panels = {}       # 槽位索引 -> 已绑定的面板
+        self.free_panels = []  # 复用池
+        self.slot_height = 0
+        self.visible = (0, 0)
+
+        self.SetScrollRate(0, 20)
+        self.SetBackgroundColour(wx.WHITE)
+        self.SetCursor(wx.Cursor(wx.CURSOR_HAND))
+
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+        self.Bind(wx.EVT_SIZE, self.on_size)
+        self.Bind(wx.EVT_SCROLLWIN, self.on_scroll)
+        self.Bind(wx.EVT_LEFT_DOWN, self.on_left_down)
+
+    def set_records(self, records):
+        """
+        显示新的封装列表（回收所有面板并回到顶部，只展开第一个封装）
+        """
+        for index in list(self.panels):
+            self.release_panel(index)
+        self.records = records
+        self.expanded = set(records[:1])
+        self.Scroll(0, 0)
+        self.update_layout()
+        self.update_visible()
+        self.Refresh()
+
+    def get_slot_height(self):
+        """
+        展开槽位的高度：由第一个创建的面板的最佳高度决定
+        """
+        if not self.slot_height:
+            panel = PackagePanel(self, self.dialog)
+            panel.Hide()
+            self.free_panels.append(panel)
+            self.slot_height = panel.GetBestSize().height + self.SLOT_MARGIN * 2
+        return self.slot_height
+
+    def update_layout(self):
+        """
+        按折叠/展开状态重新计算槽位位置和滚动区域
+        """
+        slot_height = self.get_slot_height()
+        offsets = [0]
+        for record in self.records:
+            offsets.append(offsets[-1] + (slot_height if record in self.expanded
+                                          else self.SUMMARY_HEIGHT))
+        self.offsets = offsets
+        self.SetVirtualSize((-1, offsets[-1]))
+
+    def slot_at(self, y):
+        """
+        滚动区域坐标 y 所在的槽位索引
+        """
+        return min(bisect.bisect_right(self.offsets, y) - 1, len(self.records))
+
+    def visible_range(self):
+        """
+        与视口相交的槽位范围 [first, last)
+        """
+        top = self.GetViewStart()[1] * self.GetScrollPixelsPerUnit()[1]
+        bottom = top + self.GetClientSize().height
+        return self.slot_at(top), min(self.slot_at(bottom) + 1, len(self.records))
+
+    def set_expanded(self, index, expanded):
+        """
+        展开或折叠一个封装，保持该封装在视口中的位置
+        """
+        record = self.records[index]
+        if (record in self.expanded) == expanded:
+            return
+        if expanded:
+            self.expanded.add(record)
+        else:
+            self.expanded.discard(record)
+            if index in self.panels:
+                self.release_panel(index)
+        self.update_layout()
+        self.update_visible()
+        self.Refresh()
+
+    def acquire_panel(self, index):
+        panel = self.free_panels.pop() if self.free_panels else PackagePanel(self, self.dialog)
+        panel.bind(self.records[index], index)
+        self.panels[index] = panel
+        return panel
+
+    def release_panel(self, index, commit=True):
+        panel = self.panels.pop(index)
+        if commit:
+            panel.unbind()
+        else:
+            panel.record = None
+            panel.index = -1
+        panel.Hide()
+        self.free_panels.append(panel)
+
+    def update_records(self, records, changed_ids=()):
+        """
+        增量刷新：保持滚动位置和展开状态，槽位上记录不变的面板不动，
+        内容有变化的面板重新读取，记录被替换或移除的面板回收
+        （调用前面板上的编辑已写回记录）
+        """
+        if not self.records:
+            self.expanded = set(records[:1])
+        else:
+            self.expanded.intersection_update(records)
+
+        self.Freeze()
+        try:
+            for index, panel in list(self.panels.items()):
+                if index >= len(records) or records[index] is not panel.record:
+                    self.release_panel(index, commit=False)
+                elif panel.record.package_id in changed_ids:
+                    panel.refresh()
+            self.records = records
+            self.update_layout()
+            self.update_visible()
+        finally:
+            self.Thaw()
+        self.Refresh()
+
+    def update_visible(self):
+        """
+        回收移出视口或已折叠的面板，为视口内展开的槽位绑定面板并定位
+        """
+        first, last = self.visible_range()
+        self.visible = (first, last)
+        slot_height = self.get_slot_height()
+        width = max(self.GetClientSize().width - self.SLOT_MARGIN * 2, 100)
+        shown = [index for index in range(first, last) if self.records[index] in self.expanded]
+
+        self.Freeze()
+        try:
+            for index in [i for i in self.panels if i not in shown]:
+                self.release_panel(index)
+
+            for index in shown:
+                panel = self.panels.get(index) or self.acquire_panel(index)
+                x, y = self.CalcScrolledPosition(self.SLOT_MARGIN,
+                                                 self.offsets[index] + self.SLOT_MARGIN)
+                panel.SetSize(x, y, width, slot_height - self.SLOT_MARGIN * 2)
+                panel.Show()
+        finally:
+            self.Thaw()
+
+    def commit_all(self):
+        """提交可视面板中正在编辑的单元格"""
+        for panel in self.panels.values():
+            panel.commit()
+
+    def refresh_grids(self):
+        """重绘可视面板的参数表格和摘要（校验结果变化后调用）"""
+        for panel in self.panels.values():
+            panel.params_grid.ForceRefresh()
+        self.Refresh()
+
+    def scroll_to(self, index):
+        """展开指定封装并滚动使其出现在视口中"""
+        self.set_expanded(index, True)
+        first, last = self.visible_range()
+        if first <= index < last - 1:
+            return
+        self.Scroll(0, self.offsets[index] // self.GetScrollPixelsPerUnit()[1])
+        self.update_visible()
+        self.Refresh()
+
+    def on_left_down(self, event):
+        """
+        点击折叠的摘要行展开该封装（展开的槽位被面板覆盖，点击落在面板上）
+        """
+        _, y = self.CalcUnscrolledPosition(event.GetPosition())
+        index = self.slot_at(y)
+        if 0 <= index < len(self.records):
+            self.set_expanded(index, True)
+        event.Skip()
+
+    def on_scroll(self, event):
+        event.Skip()
+        # 滚动位置在默认处理之后才更新
+        wx.CallAfter(self.update_visible_if_alive)
+
+    def on_size(self, event):
+        event.Skip()
+        if self.records:
+            wx.CallAfter(self.update_visible_if_alive)
+
+    def update_visible_if_alive(self):
+        if self:
+            self.update_visible()
+
+    def on_paint(self, event):
+        """
+        绘制槽位分隔线和折叠槽位的摘要
+        鼠标滚轮、键盘等方式滚动时也会触发重绘，在这里检查可视范围是否变化
+        """
+        dc = wx.PaintDC(self)
+        self.DoPrepareDC(dc)
+
+        first, last = self.visible_range()
+        width = self.GetClientSize().width
+
+        dc.SetFont(self.GetFont())
+        dc.SetTextForeground(wx.Colour(100, 100, 100))
+        dc.SetPen(wx.Pen(wx.Colour(220, 220, 220)))
+        for index in range(first, last):
+            top = self.offsets[index]
+            if index > 0:
+                dc.DrawLine(self.SLOT_MARGIN, top, width - self.SLOT_MARGIN, top)
+            record = self.records[index]
+            if record not in self.expanded:
+                text_y = top + (self.SUMMARY_HEIGHT - dc.GetCharHeight()) // 2
+                mark = "⚠ " if record.errors else ""
+                dc.DrawText(f"▸ {mark}{index + 1}. [{record.package_type}] {record.package_name}"
+                            f"    页码: {record.page_numbers}    参数: {len(record.params)}",
+                            self.SLOT_MARGIN, text_y)
+
+        if (first, last) != self.visible:
+            wx.CallAfter(self.update_visible_if_alive)
+
+
+class ParamGridTable(wx.grid.GridTableBase):
+    """
+    参数表格的虚拟数据源
+    直接读写 PackageRecord.params，单元格属性按列共享，表格只按需取可见行
+    """
+
+    COL_LABELS = ("参数名称", "数值", "单位")
+
+    def __init__(self, record, col_attrs, unit_for_param):
+        wx.grid.GridTableBase.__init__(self)
+        self.record = record
+        self.keys = list(record.params.keys()) if record is not None else []
+        self.col_attrs = col_attrs
+        self.unit_for_param = unit_for_param
+        self.units = {}  # 参数名 -> 单位（按需计算并缓存，手动添加的参数使用填写的单位）
+
+    def set_record(self, record):
+        """
+        切换到另一个封装记录（面板复用时调用），通知表格行数变化
+        """
+        old_rows = len(self.keys)
+        self.record = record
+        self.keys = list(record.params.keys()) if record is not None else []
+        self.units = {}
+        new_rows = len(self.keys)
+
+        view = self.GetView()
+        if view is None:
+            return
+        if new_rows > old_rows:
+            msg = wx.grid.GridTableMessage(self, wx.grid.GRIDTABLE_NOTIFY_ROWS_APPENDED,
+                                           new_rows - old_rows)
+            view.ProcessTableMessage(msg)
+        elif new_rows < old_rows:
+            msg = wx.grid.GridTableMessage(self, wx.grid.GRIDTABLE_NOTIFY_ROWS_DELETED,
+                                           new_rows, old_rows - new_rows)
+            view.ProcessTableMessage(msg)
+        view.ForceRefresh()
+
+    def GetNumberRows(self):
+        return len(self.keys)
+
+    def GetNumberCols(self):
+        return 3
+
+    def GetColLabelValue(self, col):
+        return self.COL_LABELS[col]
+
+    def IsEmptyCell(self, row, col):
+        return False
+
+    def GetValue(self, row, col):
+        key = self.keys[row]
+        if col == 0:
+            return key
+        if col == 1:
+            value = self.record.params.get(key, '')
+            return value if isinstance(value, str) else str(value)
+        unit = self.units.get(key)
+        if unit is None:
+            unit = self.units[key] = self.unit_for_param(key)
+        return unit
+
+    def SetValue(self, row, col, value):
+        # 只有数值列可编辑，按参数模式转换类型后直接写回模型
+        if col == 1:
+            key = self.keys[row]
+            self.record.params[key] = coerce_value(find_param(self.record.package_type, key), value)
+            # 修改后取消标红，下次生成前重新校验
+            self.record.errors.pop(key, None)
+
+    def GetAttr(self, row, col, kind):
+        if col == 1 and self.record is not None and self.keys[row] in self.record.errors:
+            attr = self.col_attrs[3]
+        else:
+            attr = self.col_attrs[col]
+        attr.IncRef()
+        return attr
+
+    def append_param(self, name, value, unit):
+        """
+        添加参数；同名参数只更新数值（别名按规范名称处理）
+        """
+        name = canonical_name(self.record.package_type, name)
+        value = coerce_value(find_param(self.record.package_type, name), value)
+        self.units[name] = unit
+        self.record.errors.pop(name, None)
+        if name in self.record.params:
+            self.record.params[name] = value
+            return
+
+        self.record.params[name] = value
+        self.keys.append(name)
+        msg = wx.grid.GridTableMessage(self, wx.grid.GRIDTABLE_NOTIFY_ROWS_APPENDED, 1)
+        self.GetView().ProcessTableMessage(msg)
+
+    def delete_params(self, rows):
+        """
+        删除指定行的参数（从后往前删除，避免索引变化）
+        """
+        view = self.GetView()
+        for row in sorted(set(rows), reverse=True):
+            if not 0 <= row < len(self.keys):
+                continue
+            key = self.keys.pop(row)
+            self.record.params.pop(key, None)
+            msg = wx.grid.GridTableMessage(self, wx.grid.GRIDTABLE_NOTIFY_ROWS_DELETED, row, 1)
+            view.ProcessTableMessage(msg)
+
+
+class AddParameterDialog(wx.Dialog):
+    """添加参数对话框"""
+
+    def __init__(self, parent):
+        wx.Dialog.__init__(self, parent, title="添加参数", size=(450, 250))
+
+        # 主sizer
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+
+        # 参数名称
+        name_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        name_label = wx.StaticText(self, label="参数名称:", size=(80, -1))
+        name_sizer.Add(name_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+        self.param_name = wx.TextCtrl(self, size=(300, -1))
+        name_sizer.Add(self.param_name, 1, wx.ALL | wx.EXPAND, 5)
+        main_sizer.Add(name_sizer, 0, wx.EXPAND | wx.ALL, 5)
+
+        # 参数数值
+        value_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        value_label = wx.StaticText(self, label="参数数值:", size=(80, -1))
+        value_sizer.Add(value_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+        self.param_value = wx.TextCtrl(self, size=(300, -1))
+        value_sizer.Add(self.param_value, 1, wx.ALL | wx.EXPAND, 5)
+        main_sizer.Add(value_sizer, 0, wx.EXPAND | wx.ALL, 5)
+
+        # 参数单位
+        unit_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        unit_label = wx.StaticText(self, label="参数单位:", size=(80, -1))
+        unit_sizer.Add(unit_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+        self.param_unit = wx.TextCtrl(self, value="mm", size=(300, -1))
+        unit_sizer.Add(self.param_unit, 1, wx.ALL | wx.EXPAND, 5)
+        main_sizer.Add(unit_sizer, 0, wx.EXPAND | wx.ALL, 5)
+
+        # 添加一些间距
+        main_sizer.AddSpacer(10)
+
+        # 按钮 - 使用标准对话框按钮
+        btn_sizer = self.CreateButtonSizer(wx.OK | wx.CANCEL)
+        main_sizer.Add(btn_sizer, 0, wx.EXPAND | wx.ALL, 10)
+
+        # 设置对话框的sizer
+        self.SetSizer(main_sizer)
+
+        # 设置焦点到第一个输入框
+        self.param_name.SetFocus()
+
+        # 居中显示
+        self.Centre()
+
+
+class BatchDialog(wx.Dialog):
+    """
+    批量数据手册处理窗口：添加文件夹或文件，流水线上传、解析并生成封装
+    """
+
+    STATUS_LABELS = {
+        STATUS_PENDING: "等待",
+        STATUS_UPLOADING: "上传中",
+        STATUS_PARSING: "解析中",
+        STATUS_GENERATING: "生成中",
+        STATUS_DONE: "完成",
+        STATUS_FAILED: "失败",
+    }
+
+    def __init__(self, parent):
+        wx.Dialog.__init__(self, parent, title="批量处理数据手册", size=(900, 500),
+                           style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+
+        self.generator = parent
+        self.pipeline = None
+        self.batch_queue = BatchQueue(os.path.join(parent.data_dir, "batch_queue.json"))
+
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+
+        # 工具栏
+        btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
+
+        add_dir_btn = wx.Button(self, label="添加文件夹")
+        add_dir_btn.Bind(wx.EVT_BUTTON, self.on_add_directory)
+        btn_sizer.Add(add_dir_btn, 0, wx.ALL, 5)
+
+        add_files_btn = wx.Button(self, label="添加文件")
+        add_files_btn.Bind(wx.EVT_BUTTON, self.on_add_files)
+        btn_sizer.Add(add_files_btn, 0, wx.ALL, 5)
+
+        retry_btn = wx.Button(self, label="重试失败项")
+        retry_btn.Bind(wx.EVT_BUTTON, self.on_retry_failed)
+        btn_sizer.Add(retry_btn, 0, wx.ALL, 5)
+
+        clear_btn = wx.Button(self, label="清除已完成")
+        clear_btn.Bind(wx.EVT_BUTTON, self.on_clear_finished)
+        btn_sizer.Add(clear_btn, 0, wx.ALL, 5)
+
+        btn_sizer.AddStretchSpacer()
+
+        self.start_btn = wx.Button(self, label="▶ 开始")
+        self.start_btn.Bind(wx.EVT_BUTTON, self.on_start)
+        btn_sizer.Add(self.start_btn, 0, wx.ALL, 5)
+
+        self.stop_btn = wx.Button(self, label="■ 停止")
+        self.stop_btn.Bind(wx.EVT_BUTTON, self.on_stop)
+        self.stop_btn.Enable(False)
+        btn_sizer.Add(self.stop_btn, 0, wx.ALL, 5)
+
+        main_sizer.Add(btn_sizer, 0, wx.EXPAND | wx.ALL, 5)
+
+        # 状态表
+        self.status_list = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.status_list.InsertColumn(0, "文件", width=260)
+        self.status_list.InsertColumn(1, "状态", width=80)
+        self.status_list.InsertColumn(2, "UUID", width=180)
+        self.status_list.InsertColumn(3, "封装数", width=70)
+        self.status_list.InsertColumn(4, "信息", width=280)
+        main_sizer.Add(self.status_list, 1, wx.EXPAND | wx.ALL, 5)
+
+        self.summary_text = wx.StaticText(self, label="")
+        main_sizer.Add(self.summary_text, 0, wx.EXPAND | wx.ALL, 5)
+
+        self.SetSizer(main_sizer)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+
+        self.refresh_all_rows()
+        self.Centre()
+
+    def refresh_all_rows(self):
+        """重建状态表"""
+        self.status_list.DeleteAllItems()
+        for index, item in enumerate(self.batch_queue.items):
+            self.status_list.InsertItem(index, os.path.basename(item['pdfPath']))
+            self.refresh_row(index, item)
+        self.update_summary()
+
+    def refresh_row(self, index, item):
+        """更新一行状态"""
+        if index >= self.status_list.GetItemCount():
+            return
+        self.status_list.SetItem(index, 1, self.STATUS_LABELS.get(item['status'], item['status']))
+        self.status_list.SetItem(index, 2, item.get('uuid') or "")
+        self.status_list.SetItem(index, 3, str(item.get('packageCount') or ""))
+        self.status_list.SetItem(index, 4, item.get('error') or "")
+
+    def update_summary(self):
+        """更新汇总信息"""
+        counts = {}
+        for item in self.batch_queue.items:
+            counts[item['status']] = counts.get(item['status'], 0) + 1
+        parts = [f"{self.STATUS_LABELS[status]} {counts[status]}"
+                 for status in self.STATUS_LABELS if counts.get(status)]
+        self.summary_text.SetLabel(f"共 {len(self.batch_queue.items)} 个数据手册: " + ", ".join(parts))
+
+    def on_pipeline_update(self, index, item):
+        """流水线状态变化回调（工作线程）"""
+        wx.CallAfter(self._on_pipeline_update, index, dict(item))
+
+    def _on_pipeline_update(self, index, item):
+        if not self:
+            return
+        self.refresh_row(index, item)
+        self.update_summary()
+
+    def generate_on_ui_thread(self, item, package_list):
+        """
+        生成阶段回调：转到主线程调用生成方法并等待结果（pcbnew只能在主线程操作）
+        """
+        done = threading.Event()
+        result = {}
+
+        def run():
+            try:
+                result['value'] = self.generator.generate_package_list(package_list)
+            except Exception as e:
+                result['error'] = e
+            finally:
+                done.set()
+
+        wx.CallAfter(run)
+        while not done.wait(timeout=0.5):
+            if not self:
+                raise Exception("批量处理窗口已关闭")
+        if 'error' in result:
+            raise result['error']
+        return result['value']
+
+    def on_add_directory(self, event):
+        """添加文件夹中的所有PDF"""
+        dialog = wx.DirDialog(self, "选择包含PDF数据手册的文件夹")
+        if dialog.ShowModal() == wx.ID_OK:
+            if self.pipeline and self.pipeline.is_running():
+                wx.MessageBox("请先停止批量处理再添加文件", "提示", wx.OK | wx.ICON_INFORMATION)
+            else:
+                self.batch_queue.add_directory(dialog.GetPath())
+                self.refresh_all_rows()
+        dialog.Destroy()
+
+    def on_add_files(self, event):
+        """添加多个PDF文件"""
+        dialog = wx.FileDialog(self, "选择PDF数据手册", wildcard="PDF文件 (*.pdf)|*.pdf",
+                               style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST | wx.FD_MULTIPLE)
+        if dialog.ShowModal() == wx.ID_OK:
+            if self.pipeline and self.pipeline.is_running():
+                wx.MessageBox("请先停止批量处理再添加文件", "提示", wx.OK | wx.ICON_INFORMATION)
+            else:
+                self.batch_queue.add_paths(dialog.GetPaths())
+                self.refresh_all_rows()
+        dialog.Destroy()
+
+    def on_retry_failed(self, event):
+        """失败项重新排队"""
+        if self.pipeline and self.pipeline.is_running():
+            return
+        self.batch_queue.reset_failed()
+        self.refresh_all_rows()
+
+    def on_clear_finished(self, event):
+        """移除已完成的条目"""
+        if self.pipeline and self.pipeline.is_running():
+            return
+        self.batch_queue.remove_finished()
+        self.refresh_all_rows()
+
+    def on_start(self, event):
+        """启动流水线"""
+        if self.pipeline and self.pipeline.is_running():
+            return
+        self.pipeline = BatchPipeline(self.batch_queue, self.generator.api_client,
+                                      self.generate_on_ui_thread,
+                                      result_cache=self.generator.result_cache,
+                                      on_update=self.on_pipeline_update)
+        self.pipeline.start()
+        self.start_btn.Enable(False)
+        self.stop_btn.Enable(True)
+
+    def on_stop(self, event):
+        """停止流水线"""
+        self.stop_pipeline()
+
+    def stop_pipeline(self):
+        """停止流水线（状态已持久化，可稍后继续）"""
+        if self.pipeline:
+            self.pipeline.stop()
+        if self:
+            self.start_btn.Enable(True)
+            self.stop_btn.Enable(False)
+
+    def on_close(self, event):
+        """关闭窗口时只隐藏，流水线继续在后台运行"""
+        self.Hide()
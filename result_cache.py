@@ -0,0 +1,134 @@
+"""
+解析结果的本地磁盘缓存
+按数据手册UUID存储 package_list 和用户编辑，并按PDF文件哈希建立索引
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .package_model import json_dumps
+
+
+class ResultCache:
+    """
+    本地解析结果缓存
+
+    目录结构：
+        index.json          PDF哈希 -> UUID
+        <uuid>.json         {uuid, pdfHash, packageList, edits, updatedAt[, shards]}
+
+    分片上传的数据手册以第一个分片的UUID为键，shards 记录所有分片 [{uuid, firstPage}]
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index_path = os.path.join(cache_dir, "index.json")
+        self._index = self._read_json(self._index_path) or {}
+
+    @staticmethod
+    def file_hash(path):
+        """
+        计算文件的SHA-256
+        """
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def _read_json(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_json(self, path, data):
+        """原子写入：先写临时文件再替换"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _entry_path(self, datasheet_uuid):
+        return os.path.join(self.cache_dir, f"{datasheet_uuid}.json")
+
+    def lookup_by_hash(self, pdf_hash):
+        """
+        按PDF哈希查找缓存条目，没有时返回None
+        """
+        datasheet_uuid = self._index.get(pdf_hash)
+        if not datasheet_uuid:
+            return None
+        return self.load(datasheet_uuid) or {
+            'uuid': datasheet_uuid,
+            'pdfHash': pdf_hash,
+            'packageList': [],
+            'edits': {}
+        }
+
+    def load(self, datasheet_uuid):
+        """
+        读取UUID对应的缓存条目
+        """
+        return self._read_json(self._entry_path(datasheet_uuid))
+
+    def remember_upload(self, pdf_hash, datasheet_uuid):
+        """
+        记录PDF哈希与UUID的对应关系（上传成功后即可记录，解析结果稍后写入）
+        """
+        with self._lock:
+            self._index[pdf_hash] = datasheet_uuid
+            self._write_json(self._index_path, self._index)
+
+    def store_results(self, datasheet_uuid, pdf_hash, package_list, shards=None):
+        """
+        保存服务器返回的解析结果，保留已有的用户编辑
+
+        Returns:
+            保存后的缓存条目
+        """
+        with self._lock:
+            entry = self.load(datasheet_uuid) or {'uuid': datasheet_uuid, 'edits': {}}
+            if shards:
+                entry['shards'] = shards
+            if pdf_hash:
+                entry['pdfHash'] = pdf_hash
+                self._index[pdf_hash] = datasheet_uuid
+                self._write_json(self._index_path, self._index)
+            entry['packageList'] = package_list
+            entry['updatedAt'] = time.time()
+            self._write_json(self._entry_path(datasheet_uuid), entry)
+            return entry
+
+    def store_edit(self, datasheet_uuid, package_data):
+        """
+        保存用户对某个封装的编辑（packageResult 为参数字典）
+        """
+        with self._lock:
+            entry = self.load(datasheet_uuid) or {'uuid': datasheet_uuid, 'packageList': []}
+            entry.setdefault('edits', {})[str(package_data['packageId'])] = package_data
+            entry['updatedAt'] = time.time()
+            self._write_json(self._entry_path(datasheet_uuid), entry)
+
+    @staticmethod
+    def apply_edits(entry):
+        """
+        将用户编辑合并到缓存的 package_list 上，返回与服务器格式一致的列表
+        """
+        edits = entry.get('edits') or {}
+        package_list = []
+        for package in entry.get('packageList') or []:
+            edit = edits.get(str(package.get('packageId')))
+            if edit:
+                package = dict(package)
+                package['packageType'] = edit.get('packageType', package.get('packageType'))
+                package['packageName'] = edit['packageName']
+                package['pageNumbers'] = edit['pageNumbers']
+                package['packageResult'] = json_dumps(edit['packageResult'])
+            package_list.append(package)
+        return package_list
@@ -0,0 +1,225 @@
+"""
+封装保存的本地预写日志（write-ahead journal）
+保存请求先追加到本地日志文件，再由后台线程在网络可用时同步到服务器
+"""
+import json
+import os
+import threading
+
+# 日志文件路径 -> SaveJournal；同一进程中每个日志文件只有一个实例（见 shared_journal）
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+def shared_journal(journal_path, api_client_factory):
+    """
+    获取日志文件对应的进程内唯一实例，首次调用时创建并启动后台同步
+    多次打开对话框共用同一个实例，避免多个同步线程重复发送、互相改写同一个日志文件
+
+    Args:
+        api_client_factory: 创建 PackageApiClient 的函数，只在首次创建实例时调用
+    """
+    key = os.path.abspath(journal_path)
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = _journals[key] = SaveJournal(journal_path, api_client_factory())
+        journal.start()
+        return journal
+
+
+class SaveJournal:
+    """
+    追加写入的保存日志
+
+    日志文件每行一条JSON记录：
+        {"op": "save", "seq": 3, "packageId": 12, "data": {...}}
+        {"op": "ack", "seq": 3}
+    同一 packageId 只保留最新一次未确认的保存（合并），启动时重放日志恢复待同步队列。
+    服务器明确拒绝（重试也不会成功）的保存移到 <日志文件>.rejected，不再重试。
+    """
+
+    def __init__(self, journal_path, api_client, on_flushed=None,
+                 retry_interval=5, max_retry_interval=120):
+        """
+        Args:
+            journal_path: 日志文件路径
+            api_client: PackageApiClient，用于实际保存
+            on_flushed: 每轮同步后的回调 on_flushed(results, pending_count)，在后台线程中调用
+            retry_interval: 失败后的初始重试间隔（秒）
+            max_retry_interval: 最大重试间隔（秒）
+        """
+        self.journal_path = journal_path
+        self.rejected_path = journal_path + ".rejected"
+        self.api_client = api_client
+        self.on_flushed = on_flushed
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._pending = {}  # packageId -> (seq, package_data)
+        self._seq = 0
+
+        journal_dir = os.path.dirname(journal_path)
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+        self._replay()
+
+    def _replay(self):
+        """
+        重放日志文件，恢复未确认的保存
+        """
+        if not os.path.exists(self.journal_path):
+            return
+
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 最后一行可能因崩溃写了一半，忽略
+                    continue
+
+                seq = record.get('seq', 0)
+                self._seq = max(self._seq, seq)
+                if record.get('op') == 'save':
+                    self._pending[record['packageId']] = (seq, record['data'])
+                elif record.get('op') == 'ack':
+                    for package_id, (pending_seq, _) in list(self._pending.items()):
+                        if pending_seq == seq:
+                            del self._pending[package_id]
+
+        if self._pending:
+            print(f"保存日志中有 {len(self._pending)} 个待同步的封装")
+
+    def _write(self, record):
+        """追加一条记录并落盘（调用方持有锁）"""
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append(self, package_data):
+        """
+        记录一次保存并唤醒后台同步，立即返回
+        """
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._write({
+                'op': 'save',
+                'seq': seq,
+                'packageId': package_data['packageId'],
+                'data': package_data
+            })
+            self._pending[package_data['packageId']] = (seq, package_data)
+
+        self._wakeup.set()
+        return seq
+
+    def pending_count(self):
+        """待同步的封装数量"""
+        with self._lock:
+            return len(self._pending)
+
+    def start(self):
+        """启动后台同步线程"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        if self._pending:
+            self._wakeup.set()
+
+    def stop(self, timeout=None):
+        """停止后台同步并等待线程结束（未同步的保存保留在日志中，下次启动继续）"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self):
+        """
+        后台同步循环：有待同步数据时发送，失败后指数退避重试
+        """
+        delay = self.retry_interval
+        while not self._stopped.is_set():
+            self._wakeup.wait(timeout=delay)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+
+            with self._lock:
+                batch = list(self._pending.values())
+            if not batch:
+                delay = self.retry_interval
+                continue
+
+            try:
+                results = self.api_client.save_packages([data for _, data in batch])
+            except Exception as e:
+                print(f"同步保存日志失败: {str(e)}")
+                results = [(data, False, str(e)) for _, data in batch]
+
+            failed = False
+            with self._lock:
+                done = 0
+                for (seq, _), (data, success, error) in zip(batch, results):
+                    if not success:
+                        if not getattr(error, 'permanent', False):
+                            failed = True
+                            continue
+                        self._reject(data, error)
+                    done += 1
+                    self._write({'op': 'ack', 'seq': seq})
+                    # 同步期间如果又有新的保存，保留新的
+                    current = self._pending.get(data['packageId'])
+                    if current and current[0] == seq:
+                        del self._pending[data['packageId']]
+                pending_count = len(self._pending)
+                if done:
+                    self._compact()
+
+            on_flushed = self.on_flushed
+            if on_flushed:
+                on_flushed(results, pending_count)
+
+            if failed:
+                delay = min(delay * 2, self.max_retry_interval)
+            else:
+                delay = self.retry_interval
+                if pending_count:
+                    self._wakeup.set()
+
+    def _reject(self, data, error):
+        """服务器拒绝的保存移到 .rejected 文件保留备查（调用方持有锁）"""
+        print(f"服务器拒绝保存 {data.get('packageName', data['packageId'])}: {error}，不再重试")
+        try:
+            with open(self.rejected_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'error': str(error), 'data': data}, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"写入被拒绝的保存失败: {str(e)}")
+
+    def _compact(self):
+        """
+        只保留未确认的保存，重写日志文件（先写临时文件再原子替换，调用方持有锁）
+        """
+        tmp_path = self.journal_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for package_id, (seq, data) in sorted(self._pending.items(),
+                                                      key=lambda item: item[1][0]):
+                    f.write(json.dumps({'op': 'save', 'seq': seq, 'packageId': package_id,
+                                        'data': data}, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.journal_path)
+        except OSError as e:
+            print(f"整理保存日志失败: {str(e)}")
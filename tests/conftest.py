@@ -0,0 +1,19 @@
+"""
+测试公共设置
+插件目录本身就是Python包（目录名由安装位置决定），这里把上级目录加入 sys.path，
+测试通过 load() 按模块名导入插件中不依赖 pcbnew 和 wx 的模块
+"""
+import importlib
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(ROOT)
+
+if os.path.dirname(ROOT) not in sys.path:
+    sys.path.insert(0, os.path.dirname(ROOT))
+
+
+def load(module_name):
+    """导入插件中的模块，如 load('geometry')"""
+    return importlib.import_module(f"{PACKAGE}.{module_name}")
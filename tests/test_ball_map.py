@@ -0,0 +1,119 @@
+"""
+去球描述解析与植球图
+"""
+import pytest
+
+from conftest import load
+
+ball_map = load('ball_map')
+
+
+def rows(bmap):
+    """植球图按字母行（A行在前）显示，第1列在左边：# 有球，. 无球"""
+    return ["".join('#' if bits >> col & 1 else '.' for col in range(bmap.count_x))
+            for bits in bmap.rows]
+
+
+@pytest.mark.parametrize('text, count_x, count_y, expected', [
+    ("perimeter 1", 5, 4, ["#####",
+                           "#...#",
+                           "#...#",
+                           "#####"]),
+    ("rings 2", 6, 6, ["######",
+                       "######",
+                       "##..##",
+                       "##..##",
+                       "######",
+                       "######"]),
+    ("center 2", 6, 6, ["######",
+                        "######",
+                        "##..##",
+                        "##..##",
+                        "######",
+                        "######"]),
+    # 奇数余量时中心区域偏向 A 行和第1列
+    ("center 3x2", 8, 5, ["########",
+                          "##...###",
+                          "##...###",
+                          "########",
+                          "########"]),
+    ("void 2×1", 4, 3, ["####",
+                        "#..#",
+                        "####"]),
+    ("corners 1", 4, 3, [".##.",
+                         "####",
+                         ".##."]),
+    ("missing A1, c4", 4, 3, [".###",
+                              "####",
+                              "###."]),
+    ("missing B2 B3", 4, 3, ["####",
+                             "#..#",
+                             "####"]),
+    ("map 1.1/X-X", 3, 2, ["#.#",
+                           "#.#"]),
+    ("map #0#_ / x.x-", 4, 2, ["#.#.",
+                               "#.#."]),
+    # 多条描述依次应用，重叠部分只移除一次
+    ("corners 2; center 2; missing A1, C3", 6, 6, ["..##..",
+                                                   "..##..",
+                                                   "##..##",
+                                                   "##..##",
+                                                   "..##..",
+                                                   "..##.."]),
+    ("perimeter 1；corners 1\nmissing B1", 4, 4, [".##.",
+                                                 "...#",
+                                                 "#..#",
+                                                 ".##."]),
+    # 超出阵列的区域忽略
+    ("corners 3", 4, 4, ["....",
+                         "....",
+                         "....",
+                         "...."]),
+])
+def test_parse_ball_map(text, count_x, count_y, expected):
+    bmap = ball_map.parse_ball_map(text, count_x, count_y)
+    assert rows(bmap) == expected
+    assert bmap.count() == sum(row.count('#') for row in expected)
+    for k, row in enumerate(expected):
+        assert bmap.columns(k) == [col for col, char in enumerate(row) if char == '#']
+    assert not bmap.is_full
+
+
+@pytest.mark.parametrize('text', [None, "", "  "])
+def test_empty_description_is_full_array(text):
+    assert ball_map.parse_ball_map(text, 4, 4) is None
+
+
+def test_separators_only_keep_every_ball():
+    assert ball_map.parse_ball_map(";；\n", 4, 4).is_full
+
+
+@pytest.mark.parametrize('text', [
+    "perimeter",
+    "perimeter 0",
+    "center axb",
+    "center 2x",
+    "corners -1",
+    "missing E1",       # 只有 A-D 行
+    "missing I1",       # 行号不使用字母 I
+    "missing A0",
+    "missing A5",
+    "missing 12",
+    "map 1111/1111/1111",           # 行数不对
+    "map 111/1111/1111/1111",       # 列数不对
+    "map 11?1/1111/1111/1111",
+    "holes 2",
+])
+def test_malformed_description_raises(text):
+    with pytest.raises(ValueError):
+        ball_map.parse_ball_map(text, 4, 4)
+
+
+def test_ball_map_bits():
+    bmap = ball_map.BallMap(10, 2)
+    assert bmap.is_full and bmap.count() == 20
+    bmap.remove_ball(0, 0)
+    bmap.remove_ball(0, 9)
+    assert bmap.columns(0) == list(range(1, 9))
+    assert bmap.row_bytes(0) == (0b0111111110).to_bytes(2, 'little')
+    assert bmap.count() == 18
@@ -0,0 +1,61 @@
+"""
+命令行批量生成：输出与进程数无关
+"""
+import json
+import os
+
+from conftest import load
+from test_kicad_mod_writer import CASES, GOLDEN_DIR
+
+cli = load('cli')
+
+
+def package_list():
+    """服务器格式的封装列表：golden 中的封装各出现两次（后者覆盖前者），外加一个无效封装"""
+    packages = []
+    for repeat in range(2):
+        for name, (package_type, params) in sorted(CASES.items()):
+            packages.append({'packageId': len(packages) + 1, 'packageType': package_type,
+                             'packageName': name, 'pageNumbers': "1",
+                             'packageResult': json.dumps(params)})
+    packages.append({'packageId': len(packages) + 1, 'packageType': 'SOIC',
+                     'packageName': "SO-7", 'pageNumbers': "1",
+                     'packageResult': json.dumps(dict(CASES['SOIC-8_3.9x4.9mm_P1.27mm'][1],
+                                                      **{'Pin Count': 7}))})
+    return packages
+
+
+def generate(tmp_path, workers):
+    messages = []
+    library = str(tmp_path / f"workers{workers}")
+    generated, errors = cli.generate_library(package_list(), library,
+                                             report=messages.append, workers=workers)
+    # 去掉耗时，只比较顺序和内容
+    messages = [message.split(':')[0] for message in messages]
+    return generated, errors, messages, library + ".pretty"
+
+
+def test_library_digest_independent_of_workers(tmp_path):
+    single = generate(tmp_path, 1)
+    parallel = generate(tmp_path, 2)
+
+    generated, errors, messages, library = single
+    assert generated == len(CASES)
+    assert len(errors) == 1 and errors[0].startswith("SO-7")
+    assert sorted(os.listdir(library)) == sorted(name + ".kicad_mod" for name in CASES)
+    assert single[:3] == parallel[:3]
+    assert cli.library_digest(library) == cli.library_digest(parallel[3])
+
+    for name in CASES:
+        with open(os.path.join(library, name + ".kicad_mod"), encoding='utf-8') as f, \
+                open(os.path.join(GOLDEN_DIR, name + ".kicad_mod"), encoding='utf-8') as g:
+            assert f.read() == g.read()
+
+
+def test_library_digest_detects_changes(tmp_path):
+    _, _, _, library = generate(tmp_path, 1)
+    digest = cli.library_digest(library)
+    path = os.path.join(library, 'SOIC-8_3.9x4.9mm_P1.27mm.kicad_mod')
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write("\n")
+    assert cli.library_digest(library) != digest
@@ -0,0 +1,34 @@
+"""
+封装库文件写入
+"""
+import os
+
+import pytest
+
+from conftest import load
+
+footprint_library = load('footprint_library')
+
+
+def test_write_footprint_replaces_file(tmp_path):
+    library = footprint_library.ensure_library(str(tmp_path / "Lib"))
+    footprint_library.write_footprint(library, "SO-8", "old")
+    path = footprint_library.write_footprint(library, "SO-8", iter(["new", "\n"]))
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == "new\n"
+    assert os.listdir(library) == ["SO-8.kicad_mod"]
+
+
+def test_failed_write_keeps_old_file_and_removes_tmp(tmp_path):
+    library = footprint_library.ensure_library(str(tmp_path / "Lib"))
+    path = footprint_library.write_footprint(library, "SO-8", "old")
+
+    def broken_text():
+        yield "partial"
+        raise ValueError("生成失败")
+
+    with pytest.raises(ValueError):
+        footprint_library.write_footprint(library, "SO-8", broken_text())
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == "old"
+    assert os.listdir(library) == ["SO-8.kicad_mod"]
@@ -0,0 +1,47 @@
+"""
+几何计算：BGA行名
+"""
+import pytest
+
+from conftest import load
+
+geometry = load('geometry')
+
+SKIPPED = set("IOQSXZ")
+
+
+def test_row_letters_skip_ambiguous_letters():
+    assert geometry.bga_row_labels(20) == list("ABCDEFGHJKLMNPRTUVWY")
+    assert not SKIPPED & set(geometry.JEDEC_ROW_LETTERS)
+
+
+@pytest.mark.parametrize('count, last', [
+    (1, 'A'),
+    (19, 'W'),
+    (20, 'Y'),      # 单字母用完
+    (21, 'AA'),     # 之后为双字母
+    (22, 'AB'),
+    (40, 'AY'),
+    (41, 'BA'),
+    (420, 'YY'),    # 双字母用完：20 + 20*20
+    (421, 'AAA'),
+])
+def test_row_label_boundaries(count, last):
+    labels = geometry.bga_row_labels(count)
+    assert len(labels) == count
+    assert labels[-1] == last
+
+
+def test_double_letter_range():
+    labels = geometry.bga_row_labels(430)
+    double = labels[20:420]
+    letters = geometry.JEDEC_ROW_LETTERS
+    assert double == [a + b for a in letters for b in letters]
+    assert len(set(labels)) == len(labels)
+    assert not any(SKIPPED & set(label) for label in labels)
+
+
+def test_shorter_request_after_longer_one():
+    # 行名表按需扩展、所有封装共用，先取长表再取短表结果一致
+    geometry.bga_row_labels(100)
+    assert geometry.bga_row_labels(3) == ['A', 'B', 'C']
@@ -0,0 +1,153 @@
+"""
+.kicad_mod 输出与 tests/golden 中检入的文件逐字节比较
+几何算法或输出格式有意修改后，用 UPDATE_GOLDEN=1 python -m pytest tests 重新生成，
+并在提交前检查 golden 文件的差异；golden 文件本身的关键尺寸另由手工推算的数值检查
+"""
+import os
+import re
+
+import pytest
+
+from conftest import load
+
+families = load('families')
+geometry = load('geometry')
+kicad_mod_writer = load('kicad_mod_writer')
+param_schema = load('param_schema')
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+CASES = {
+    'SOIC-8_3.9x4.9mm_P1.27mm': ('SOIC', {
+        'Pin Count': 8, 'Lead Pitch': 1.27, 'Overall Width': 6.0,
+        'Package Body Length': 4.9, 'Package Body Width': 3.9,
+    }),
+    'QFN-20-1EP_3x4mm_P0.5mm_EP1.6x1.6mm': ('QFN', {
+        'Pin Count X': 4, 'Pin Count Y': 6, 'Lead Pitch X': 0.5, 'Lead Pitch Y': 0.5,
+        'Pad Width': 0.25, 'Pad Length': 0.8,
+        'Package Body Size X': 3.0, 'Package Body Size Y': 4.0,
+        'Exposed Pad Size X': 1.5, 'Exposed Pad Size Y': 1.5,
+        'Exposed Pad Land Size X': 1.6, 'Exposed Pad Land Size Y': 1.6,
+    }),
+    'QFP-32_5x5mm_P0.5mm_Pin1LowerRight': ('QFP', {
+        'Pin Count X': 8, 'Pin Count Y': 8, 'Lead Pitch X': 0.5, 'Lead Pitch Y': 0.5,
+        'Pad Width': 0.3, 'Pad Length': 1.5,
+        'Package Body Size X': 5.0, 'Package Body Size Y': 5.0,
+        'Overall Width X': 7.0, 'Overall Width Y': 7.0,
+        'Pin 1 Visual Location': 'LOWER RIGHT',
+    }),
+    'BGA-54_8x8_6.4x6.4mm_P0.8mm_Depopulated': ('BGA', {
+        'Ball Count X': 8, 'Ball Count Y': 8, 'Ball Pitch X': 0.8, 'Ball Pitch Y': 0.8,
+        'Ball Diameter': 0.4, 'Package Body Size X': 6.4, 'Package Body Size Y': 6.4,
+        'Ball Depopulation': 'center 2; corners 1; missing B2, G7',
+    }),
+}
+
+
+def render(name):
+    package_type, params = CASES[name]
+    params = param_schema.normalize_params(package_type, params, fill_defaults=True)
+    return kicad_mod_writer.footprint_text(families.build_geometry(package_type, name, params))
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def numpy_mode(request, monkeypatch):
+    """有/没有 NumPy 时输出必须一致（几何数据按内容缓存，切换时清空缓存）"""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(geometry, 'numpy', None)
+    families._geometry_cache.clear()
+    yield request.param
+    families._geometry_cache.clear()
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_matches_golden(name, numpy_mode):
+    path = os.path.join(GOLDEN_DIR, name + ".kicad_mod")
+    text = render(name)
+    if os.environ.get('UPDATE_GOLDEN'):
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(text)
+    with open(path, encoding='utf-8', newline='') as f:
+        assert text == f.read()
+
+
+def test_save_footprint_writes_golden_text(tmp_path):
+    name = 'SOIC-8_3.9x4.9mm_P1.27mm'
+    package_type, params = CASES[name]
+    params = param_schema.normalize_params(package_type, params, fill_defaults=True)
+    library = load('footprint_library').ensure_library(str(tmp_path / "Test"))
+    path = kicad_mod_writer.save_footprint(families.build_geometry(package_type, name, params),
+                                           library)
+    assert path == str(tmp_path / "Test.pretty" / (name + ".kicad_mod"))
+    with open(path, encoding='utf-8', newline='') as f, \
+            open(os.path.join(GOLDEN_DIR, name + ".kicad_mod"), encoding='utf-8', newline='') as g:
+        assert f.read() == g.read()
+
+
+PAD_PATTERN = re.compile(r'\(pad "(\w+)" smd (\w+) \(at (\S+) (\S+)\) \(size (\S+) (\S+)\)')
+CIRCLE_PATTERN = re.compile(r'\(fp_circle \(center (\S+) (\S+)\) \(end (\S+) (\S+)\)\s+'
+                            r'\(stroke[^\n]*\(layer "([^"]+)"\)')
+LINE_PATTERN = re.compile(r'\(fp_line \(start (\S+) (\S+)\) \(end (\S+) (\S+)\)\s+'
+                          r'\(stroke[^\n]*\(layer "([^"]+)"\)')
+
+
+def read_golden(name):
+    """
+    直接解析 golden 文件（不经过写入器）：焊盘 {编号: (形状, x, y, w, h)}、圆、线段
+    """
+    with open(os.path.join(GOLDEN_DIR, name + ".kicad_mod"), encoding='utf-8') as f:
+        text = f.read()
+    pads = {number: (shape, *map(float, values))
+            for number, shape, *values in PAD_PATTERN.findall(text)}
+    circles = [(layer, *map(float, values)) for *values, layer in CIRCLE_PATTERN.findall(text)]
+    lines = [(layer, *map(float, values)) for *values, layer in LINE_PATTERN.findall(text)]
+    return text, pads, circles, lines
+
+
+def test_golden_header_names_this_generator():
+    for name in CASES:
+        text = read_golden(name)[0]
+        assert text.startswith(f'(footprint "{name}" (version 20221018) '
+                               f'(generator footprint_generator)\n')
+        assert text.count('(') == text.count(')')
+
+
+def test_bga_golden_by_hand():
+    """
+    8x8、0.8mm间距：球心范围 ±2.8mm（A1默认在左下角，A行在最下面，第1列在最左边）；
+    本体 6.4mm，丝印框 ±3.4mm，A1圆点在框内 0.3mm 处，装配层斜角 0.5mm
+    """
+    _, pads, circles, lines = read_golden('BGA-54_8x8_6.4x6.4mm_P0.8mm_Depopulated')
+
+    removed = {'A1', 'A8', 'H1', 'H8',        # corners 1
+               'D4', 'D5', 'E4', 'E5',        # center 2
+               'B2', 'G7'}                    # missing
+    expected = {row + str(col) for row in "ABCDEFGH" for col in range(1, 9)} - removed
+    assert set(pads) == expected
+
+    assert pads['A2'] == ('circle', -2.0, 2.8, 0.4, 0.4)
+    assert pads['A7'] == ('circle', 2.0, 2.8, 0.4, 0.4)
+    assert pads['H2'] == ('circle', -2.0, -2.8, 0.4, 0.4)
+    assert pads['B1'] == ('circle', -2.8, 2.0, 0.4, 0.4)
+    assert pads['G8'] == ('circle', 2.8, -2.0, 0.4, 0.4)
+    assert pads['D3'] == ('circle', -1.2, 0.4, 0.4, 0.4)
+
+    assert circles == [('F.SilkS', -3.1, 3.1, -2.9, 3.1)]
+    assert ('F.Fab', -3.2, 2.7, -2.7, 3.2) in lines
+
+
+def test_qfp_golden_pin1_lower_right_by_hand():
+    """
+    8x8 引脚、0.5mm间距、总宽 7mm、焊盘长 1.5mm：焊盘中心距中心 3.5 - 0.75 = 2.75mm；
+    Pin 1 在右下角时为右侧一排最下面的焊盘，逆时针向上编号，圆点和斜角在右下角
+    """
+    _, pads, circles, lines = read_golden('QFP-32_5x5mm_P0.5mm_Pin1LowerRight')
+    assert len(pads) == 32
+    assert pads['1'] == ('rect', 2.75, 1.75, 1.5, 0.3)
+    assert pads['8'] == ('rect', 2.75, -1.75, 1.5, 0.3)
+    assert pads['9'] == ('rect', 1.75, -2.75, 0.3, 1.5)
+    assert pads['32'] == ('rect', 1.75, 2.75, 0.3, 1.5)
+    assert circles == [('F.SilkS', 2.9, 2.9, 3.1, 2.9)]
+    assert ('F.Fab', 2.5, 2.0, 2.0, 2.5) in lines
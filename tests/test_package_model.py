@@ -0,0 +1,93 @@
+"""
+封装记录的三方合并：新的解析结果合并到已有记录（保留用户编辑）
+"""
+import json
+
+from conftest import load
+
+package_model = load('package_model')
+
+
+def package(package_id, name, params, pages="1"):
+    return {'packageId': package_id, 'packageType': 'SOIC', 'packageName': name,
+            'pageNumbers': pages, 'packageResult': json.dumps(params)}
+
+
+def decode(*packages):
+    return package_model.decode_package_list(list(packages))
+
+
+def test_update_from_keeps_local_edits_and_takes_server_changes():
+    base = decode(package(1, "SO-8", {'Pin Count': 8, 'Lead Pitch': 1.27, 'Pad Width': 0.6}))[0]
+    record = base.copy()
+    record.package_name = "SO-8 (edited)"      # 本地编辑，服务器未改
+    record.params['Pad Width'] = 0.5           # 本地和服务器都改了：取服务器
+    record.params['Lead Pitch'] = 1.0          # 本地编辑，服务器未改
+    new = decode(package(1, "SO-8", {'Pin Count': 8, 'Lead Pitch': 1.27, 'Pad Width': 0.55,
+                                     'Pad Length': 1.5}, pages="2"))[0]
+
+    assert record.update_from(base, new)
+    assert record.package_name == "SO-8 (edited)"
+    assert record.page_numbers == "2"
+    assert record.params == {'Pin Count': 8, 'Lead Pitch': 1.0, 'Pad Width': 0.55,
+                             'Pad Length': 1.5}
+    # base 和 new 不被修改
+    assert base.params == {'Pin Count': 8, 'Lead Pitch': 1.27, 'Pad Width': 0.6}
+    assert 'Pad Length' not in base.params
+
+
+def test_update_from_removes_params_the_server_dropped():
+    base = decode(package(1, "SO-8", {'Pin Count': 8, 'Pad Width': 0.6}))[0]
+    record = base.copy()
+    record.params['Pad Width'] = 0.5
+    record.params['Pad Length'] = 1.2          # 只在本地添加的参数保留
+    new = decode(package(1, "SO-8", {'Pin Count': 8}))[0]
+
+    assert record.update_from(base, new)
+    assert record.params == {'Pin Count': 8, 'Pad Length': 1.2}
+
+
+def test_update_from_reports_no_change():
+    base = decode(package(1, "SO-8", {'Pin Count': 8}))[0]
+    record = base.copy()
+    record.params['Pin Count'] = 14
+    # 服务器结果没变，或变成了和本地相同的值
+    assert not record.update_from(base, base)
+    assert not record.update_from(base, decode(package(1, "SO-8", {'Pin Count': 14}))[0])
+    assert record.params == {'Pin Count': 14}
+
+
+def test_reconcile_records():
+    base_list = [package(1, "SO-8", {'Pin Count': 8}),
+                 package(2, "QFN-16", {'Pin Count X': 4}),
+                 package(3, "BGA-64", {'Ball Count X': 8})]
+    base_records = decode(*base_list)
+    records = [record.copy() for record in base_records]
+    records[0].package_name = "SO-8 (edited)"
+    records[1].params['Pin Count X'] = 5
+
+    new_records = decode(package(2, "QFN-16", {'Pin Count X': 4, 'Pad Width': 0.25}),
+                         package(1, "SO-8", {'Pin Count': 8}),
+                         package(4, "SOT-23", {'Pin Count': 3}))
+    result, changed = package_model.reconcile_records(records, base_records, new_records)
+
+    # 顺序与新结果一致；已有记录原地更新（对象不变），新封装为副本，服务器删除的封装去掉
+    assert [record.package_id for record in result] == [2, 1, 4]
+    assert result[0] is records[1] and result[1] is records[0]
+    assert result[2] is not new_records[2]
+    assert result[0].params == {'Pin Count X': 5, 'Pad Width': 0.25}
+    assert result[1].package_name == "SO-8 (edited)"
+    # 只有内容被服务器结果修改的已有记录算作变化（新增和删除的不算）
+    assert changed == {2}
+    # new_records 作为下一次合并的基准，不被修改
+    assert new_records[0].params == {'Pin Count X': 4, 'Pad Width': 0.25}
+
+
+def test_reconcile_records_without_package_id():
+    records = decode(package(None, "SO-8", {'Pin Count': 8}))
+    new_records = decode(package(None, "SO-8", {'Pin Count': 14}))
+    result, changed = package_model.reconcile_records(records, records, new_records)
+    # 没有 packageId 的记录无法对应，按新记录处理
+    assert result[0] is not records[0]
+    assert result[0].params == {'Pin Count': 14}
+    assert changed == set()
@@ -0,0 +1,167 @@
+"""
+分片上传：合并逻辑，以及对本地模拟服务器的完整上传流程
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from conftest import load
+
+pdf_shards = load('pdf_shards')
+api_client = load('api_client')
+
+
+def package(name, pages, pin_count=8):
+    return {'packageType': 'SOIC', 'packageName': name, 'pageNumbers': pages,
+            'packageResult': json.dumps({'Pin Count': pin_count})}
+
+
+def test_page_numbers_round_trip():
+    assert pdf_shards.parse_page_numbers("3, 5-7，9") == [3, 5, 6, 7, 9]
+    assert pdf_shards.parse_page_numbers("x, 2") == [2]
+    assert pdf_shards.format_page_numbers([7, 3, 5, 6, 6]) == "3, 5-7"
+
+
+def test_merge_maps_pages_and_deduplicates():
+    merged = pdf_shards.merge_shard_results([
+        # 分片顺序不影响结果
+        (51, [package('SO-8', "2-3"), package('SO-14', "10", pin_count=14)]),
+        (1, [package('so-8 ', "49")]),
+        (101, [package('SO-8', "1", pin_count=16)]),
+    ])
+    assert [(p['packageName'], p['pageNumbers']) for p in merged] == [
+        ('so-8 ', "49, 52-53"),   # 名称大小写/空白不同视为同一个封装，页码合并
+        ('SO-14', "60"),
+        ('SO-8', "101"),          # 参数不同的同名封装保留
+    ]
+
+
+class FakeServer:
+    """
+    模拟封装解析服务：/upload 按分片文件名中的首页页码分配UUID，
+    /{uuid} 在 delay 秒后返回预设的封装列表（之前返回空列表）；
+    delay 也可以是 首页页码 -> 秒 的字典
+    """
+
+    def __init__(self, results, delay):
+        self.results = results  # 首页页码 -> package_list
+        self.delay = delay
+        self.uploaded = {}      # uuid -> 上传时间
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                first_page = re.search(rb'filename="[^"]*_p(\d+)-\d+\.pdf"', body).group(1)
+                datasheet_uuid = f"u{int(first_page)}"
+                server.uploaded[datasheet_uuid] = time.time()
+                self.reply({'success': True, 'uuid': datasheet_uuid})
+
+            def do_GET(self):
+                datasheet_uuid = self.path.rsplit('/', 1)[1]
+                first_page = int(datasheet_uuid[1:])
+                delay = server.delay
+                if isinstance(delay, dict):
+                    delay = delay.get(first_page, 0)
+                ready = time.time() - server.uploaded[datasheet_uuid] >= delay
+                self.reply(server.results.get(first_page, []) if ready else [])
+
+            def reply(self, data):
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/api"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def server():
+    servers = []
+
+    def start(results, delay=0.2):
+        servers.append(FakeServer(results, delay))
+        return servers[-1]
+
+    yield start
+    for fake in servers:
+        fake.httpd.shutdown()
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    fitz = pytest.importorskip('fitz')
+    path = tmp_path / "manual.pdf"
+    with fitz.open() as doc:
+        for _ in range(7):
+            doc.new_page()
+        doc.save(str(path))
+    return str(path)
+
+
+def test_sharded_upload_merges_results(server, pdf_path):
+    fake = server({
+        1: [package('SO-8', "2")],
+        5: [package('SO-8', "1"), package('SO-14', "3", pin_count=14)],
+        # 第3-4页、第7页的分片没有封装
+    })
+    uploader = pdf_shards.ShardedUploader(api_client.PackageApiClient(fake.url),
+                                          pages_per_shard=2, poll_interval=0.05,
+                                          poll_timeout=30, empty_timeout=0.5)
+    started = time.time()
+    shards, package_list, unfinished = uploader.run(pdf_path)
+
+    assert shards == [{'uuid': 'u1', 'firstPage': 1}, {'uuid': 'u3', 'firstPage': 3},
+                      {'uuid': 'u5', 'firstPage': 5}, {'uuid': 'u7', 'firstPage': 7}]
+    assert [(p['packageName'], p['pageNumbers']) for p in package_list] == [
+        ('SO-8', "2, 5"), ('SO-14', "7")]
+    # 空分片在其他分片完成后按 empty_timeout 停止等待，不会等到 poll_timeout，
+    # 但无法确认没有封装，作为未完成的分片返回
+    assert time.time() - started < 5
+    assert unfinished == [{'uuid': 'u3', 'firstPage': 3}, {'uuid': 'u7', 'firstPage': 7}]
+
+
+def test_slow_shard_is_reported_not_dropped(server, pdf_path):
+    fake = server({1: [package('SO-8', "1")], 3: [package('SO-14', "2", pin_count=14)]},
+                  delay={1: 0.1, 3: 1.5})
+    uploader = pdf_shards.ShardedUploader(api_client.PackageApiClient(fake.url),
+                                          pages_per_shard=2, poll_interval=0.05,
+                                          poll_timeout=30, empty_timeout=0.3)
+    shards, package_list, unfinished = uploader.run(pdf_path)
+
+    # 比其他分片慢得多的分片被放弃，但会报告出来，而不是当作没有封装
+    assert [p['packageName'] for p in package_list] == ['SO-8']
+    assert {'uuid': 'u3', 'firstPage': 3} in unfinished
+
+    # 稍后重新获取所有分片时补上
+    time.sleep(1.5)
+    package_list = uploader.fetch_merged(shards)
+    assert [(p['packageName'], p['pageNumbers']) for p in package_list] == [
+        ('SO-8', "1"), ('SO-14', "4")]
+
+
+def test_poll_timeout_returns_none(server):
+    fake = server({}, delay=0)
+    fake.uploaded['u1'] = time.time()
+    uploader = pdf_shards.ShardedUploader(api_client.PackageApiClient(fake.url),
+                                          poll_interval=0.05, poll_timeout=0.2)
+    assert uploader._poll('u1') is None
+
+
+def test_fetch_merged_uses_shard_offsets(server):
+    fake = server({1: [package('SO-8', "1")], 3: [package('SO-8', "2")]}, delay=0)
+    uploader = pdf_shards.ShardedUploader(api_client.PackageApiClient(fake.url))
+    fake.uploaded.update(u1=0, u3=0)
+    package_list = uploader.fetch_merged([{'uuid': 'u1', 'firstPage': 1},
+                                          {'uuid': 'u3', 'firstPage': 3}])
+    assert [(p['packageName'], p['pageNumbers']) for p in package_list] == [('SO-8', "1, 4")]
@@ -0,0 +1,133 @@
+"""
+保存日志：重放、合并、整理，以及对假客户端的后台同步
+"""
+import json
+import threading
+
+from conftest import load
+
+save_journal = load('save_journal')
+SaveError = load('api_client').SaveError
+
+
+def package(package_id, name):
+    return {'packageId': package_id, 'packageName': name, 'pageNumbers': "1",
+            'packageResult': {'Pin Count': 8}}
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class FakeClient:
+    """
+    按 packageId 依次返回预设的结果：None 为成功，SaveError 为失败；用完后都成功
+    """
+
+    def __init__(self, outcomes=None, on_save=None):
+        self.outcomes = outcomes or {}
+        self.on_save = on_save
+        self.calls = []
+
+    def save_packages(self, package_data_list):
+        self.calls.append([(data['packageId'], data['packageName']) for data in package_data_list])
+        results = []
+        for data in package_data_list:
+            queue = self.outcomes.get(data['packageId'], [])
+            error = queue.pop(0) if queue else None
+            results.append((data, error is None, error))
+        if self.on_save:
+            self.on_save(len(self.calls))
+        return results
+
+
+def run_until_flushed(journal, timeout=10):
+    """
+    启动后台同步，等待待同步队列清空；返回每轮同步后日志文件的内容
+    """
+    rounds = []
+    done = threading.Event()
+
+    def on_flushed(results, pending_count):
+        rounds.append(read_lines(journal.journal_path))
+        if not pending_count:
+            done.set()
+
+    journal.on_flushed = on_flushed
+    journal.start()
+    try:
+        assert done.wait(timeout)
+    finally:
+        journal.stop(timeout)
+    return rounds
+
+
+def test_replay_coalesces_by_package_id(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = save_journal.SaveJournal(path, FakeClient())
+    journal.append(package(1, "SO-8"))
+    journal.append(package(2, "QFN-16"))
+    journal.append(package(1, "SO-8 edited"))
+    journal.append(package(3, "BGA-64"))
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'op': 'ack', 'seq': 4}) + "\n")
+        f.write('{"op": "save", "seq": 5, "packageId": 4, "da')  # 崩溃时写了一半的行
+
+    replayed = save_journal.SaveJournal(path, FakeClient())
+    assert replayed.pending_count() == 2
+    assert replayed._pending == {1: (3, package(1, "SO-8 edited")), 2: (2, package(2, "QFN-16"))}
+    # 新的保存接着已有的序号
+    assert replayed.append(package(2, "QFN-16 edited")) == 5
+
+
+def test_transient_failure_is_retried_and_journal_compacted(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    client = FakeClient({2: [SaveError("HTTP 503")]})
+    journal = save_journal.SaveJournal(path, client, retry_interval=0.05)
+    journal.append(package(1, "SO-8"))
+    journal.append(package(2, "QFN-16"))
+
+    rounds = run_until_flushed(journal)
+
+    assert client.calls == [[(1, "SO-8"), (2, "QFN-16")], [(2, "QFN-16")]]
+    # 第一轮后日志只保留未确认的保存，全部确认后为空
+    assert rounds[0] == [{'op': 'save', 'seq': 2, 'packageId': 2, 'data': package(2, "QFN-16")}]
+    assert rounds[-1] == []
+    assert not (tmp_path / "journal.jsonl.rejected").exists()
+
+    # 重新打开时没有待同步的保存
+    assert save_journal.SaveJournal(path, FakeClient()).pending_count() == 0
+
+
+def test_permanent_error_moves_save_to_rejected(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    client = FakeClient({2: [SaveError.from_status(400)]})
+    journal = save_journal.SaveJournal(path, client, retry_interval=0.05)
+    journal.append(package(1, "SO-8"))
+    journal.append(package(2, "QFN-16"))
+
+    rounds = run_until_flushed(journal)
+
+    # 服务器明确拒绝的保存不再重试
+    assert client.calls == [[(1, "SO-8"), (2, "QFN-16")]]
+    assert rounds == [[]]
+    assert read_lines(path + ".rejected") == [{'error': "HTTP 400", 'data': package(2, "QFN-16")}]
+
+
+def test_save_during_sync_keeps_newer_version(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+
+    def edit_during_first_sync(call_count):
+        if call_count == 1:
+            journal.append(package(1, "SO-8 edited"))
+
+    client = FakeClient(on_save=edit_during_first_sync)
+    journal = save_journal.SaveJournal(path, client, retry_interval=0.05)
+    journal.append(package(1, "SO-8"))
+
+    rounds = run_until_flushed(journal)
+
+    assert client.calls == [[(1, "SO-8")], [(1, "SO-8 edited")]]
+    assert rounds[0] == [{'op': 'save', 'seq': 2, 'packageId': 1, 'data': package(1, "SO-8 edited")}]
+    assert rounds[-1] == []
@@ -0,0 +1,84 @@
+"""
+生成前的参数校验：有/没有 NumPy 时结果必须一致
+"""
+import pytest
+
+from conftest import load
+
+validation = load('validation')
+
+SOIC8 = {'Pin Count': 8, 'Lead Pitch': 1.27, 'Overall Width': 6.0,
+         'Package Body Length': 4.9, 'Package Body Width': 3.9}
+QFN16 = {'Pin Count X': 4, 'Pin Count Y': 4, 'Pad Width': 0.25, 'Pad Length': 0.8,
+         'Lead Pitch X': 0.5, 'Lead Pitch Y': 0.5,
+         'Package Body Size X': 3.0, 'Package Body Size Y': 3.0}
+BGA64 = {'Ball Pitch X': 0.8, 'Ball Pitch Y': 0.8, 'Ball Count X': 8, 'Ball Count Y': 8,
+         'Ball Diameter': 0.4, 'Package Body Size X': 6.4, 'Package Body Size Y': 6.4}
+
+# (封装类型, 参数, 预期的错误信息)
+CASES = [
+    ('SOIC', SOIC8, []),
+    ('SOIC', dict(SOIC8, **{'Pin Count': 7}), ["SOIC封装引脚数必须是偶数"]),
+    # 焊盘长度缺失时按间距计算：0.89mm 不小于 0.5mm
+    ('TSSOP', dict(SOIC8, **{'Overall Width': 0.5}), ["焊盘长度必须小于总宽度"]),
+    # 参数本身无效时不再报告依赖它的约束
+    ('SOIC', dict(SOIC8, **{'Lead Pitch': 'abc'}), ["Lead Pitch 必须是大于0的数值"]),
+    ('soic', {}, [f"{name} 必须是大于0的数值" for name in validation.REQUIRED['SOIC']]),
+    ('QFN', dict(QFN16, **{'Pad Width': 0.6}),
+     ["焊盘宽度必须小于X方向间距", "焊盘宽度必须小于Y方向间距"]),
+    ('QFN', dict(QFN16, **{'Package Body Size Y': ''}), ["Package Body Size Y 必须是大于0的数值"]),
+    ('QFN', dict(QFN16, **{'Exposed Pad Size X': 3.5}), ["散热焊盘X尺寸必须小于封装体"]),
+    # 39 * 0.8 + 0.4 = 31.6 > 6.4
+    ('BGA', dict(BGA64, **{'Ball Count X': 40}), ["X方向球阵列超出封装体"]),
+    ('BGA', dict(BGA64, **{'Ball Count Y': 4.5}), ["Ball Count Y 必须是整数"]),
+    ('BGA', dict(BGA64, **{'Ball Pitch X': 0, 'Ball Diameter': -1}),
+     ["Ball Pitch X 必须是大于0的数值", "Ball Diameter 必须是大于0的数值"]),
+    ('SOT', {'Pin Count': 4, 'Lead Pitch': 0.95, 'Pad Width': 0.6, 'Pad Length': 1.0,
+             'Overall Width': 2.8, 'Package Body Length': 2.9, 'Package Body Width': 1.6},
+     ["SOT封装引脚数必须是3、5或6"]),
+    # (8/2 - 1) * 0.5 + 0.25 = 1.75 > 1.5
+    ('DFN', {'Pin Count': 8, 'Lead Pitch': 0.5, 'Pad Width': 0.25, 'Pad Length': 0.6,
+             'Package Body Size X': 2.0, 'Package Body Size Y': 1.5},
+     ["引脚排列超出封装体"]),
+    ('QFP', {'Pin Count X': 8, 'Pin Count Y': 8, 'Pad Width': 0.3, 'Pad Length': 4,
+             'Lead Pitch X': 0.5, 'Lead Pitch Y': 0.5, 'Package Body Size X': 5.0,
+             'Package Body Size Y': 5.0, 'Overall Width X': 4.0, 'Overall Width Y': 7.0},
+     ["X方向总宽度必须大于封装体", "焊盘长度必须小于X方向总宽度的一半",
+      "焊盘长度必须小于Y方向总宽度的一半"]),
+    # 不支持的类型不检查
+    ('LGA', {'Pin Count': -1}, []),
+]
+PACKAGES = [(package_type, params) for package_type, params, _ in CASES]
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def numpy_mode(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(validation, 'numpy', None)
+    return request.param
+
+
+def test_validate_packages(numpy_mode):
+    results = validation.validate_packages(PACKAGES)
+    assert [[message for _, message in errors] for errors in results] == \
+        [expected for _, _, expected in CASES]
+
+
+def test_numpy_and_python_agree(monkeypatch):
+    pytest.importorskip('numpy')
+    # 同一类型的多个封装按列一起计算，打乱顺序后结果仍与输入一一对应
+    packages = PACKAGES * 3 + PACKAGES[::-1]
+    with_numpy = validation.validate_packages(packages)
+    monkeypatch.setattr(validation, 'numpy', None)
+    assert validation.validate_packages(packages) == with_numpy
+
+
+def test_error_cells():
+    errors = validation.validate_packages([('QFN', dict(QFN16, **{'Pad Width': 0.6}))])[0]
+    assert validation.error_cells(errors) == {
+        'Pad Width': "焊盘宽度必须小于X方向间距",
+        'Lead Pitch X': "焊盘宽度必须小于X方向间距",
+        'Lead Pitch Y': "焊盘宽度必须小于Y方向间距",
+    }
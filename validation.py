@@ -0,0 +1,314 @@
+"""
+生成前的封装参数校验
+同一类型的所有封装按列组织成矩阵，每条规则对整列一次计算；
+安装了 NumPy 时使用向量化计算，否则逐行计算同样的规则
+"""
+import math
+
+from .package_specs import SOIC_PAD_LENGTH_RULE, SOIC_PAD_WIDTH_RULE, soic_default_pad_dimension
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NAN = float('nan')
+
+# 必须为正数的参数
+REQUIRED = {
+    'SOIC': ('Pin Count', 'Lead Pitch', 'Overall Width', 'Package Body Length', 'Package Body Width'),
+    'QFN': ('Pin Count X', 'Pin Count Y', 'Pad Width', 'Pad Length', 'Lead Pitch X', 'Lead Pitch Y',
+            'Package Body Size X', 'Package Body Size Y'),
+    'BGA': ('Ball Pitch X', 'Ball Pitch Y', 'Ball Count X', 'Ball Count Y', 'Ball Diameter',
+            'Package Body Size X', 'Package Body Size Y'),
+    'SOT': ('Pin Count', 'Lead Pitch', 'Pad Width', 'Pad Length', 'Overall Width',
+            'Package Body Length', 'Package Body Width'),
+    'DFN': ('Pin Count', 'Lead Pitch', 'Pad Width', 'Pad Length',
+            'Package Body Size X', 'Package Body Size Y'),
+    'QFP': ('Pin Count X', 'Pin Count Y', 'Pad Width', 'Pad Length', 'Lead Pitch X', 'Lead Pitch Y',
+            'Package Body Size X', 'Package Body Size Y', 'Overall Width X', 'Overall Width Y'),
+}
+
+# 必须为整数的参数
+INTEGERS = {
+    'SOIC': ('Pin Count',),
+    'QFN': ('Pin Count X', 'Pin Count Y'),
+    'BGA': ('Ball Count X', 'Ball Count Y'),
+    'SOT': ('Pin Count',),
+    'DFN': ('Pin Count',),
+    'QFP': ('Pin Count X', 'Pin Count Y'),
+}
+
+# 参数之间的约束：(涉及的参数, 规则, 错误信息)
+# 规则只用算术和比较运算，对 NumPy 列和单个数值都适用；c(name) 取参数列
+RULES = {
+    'SOIC': (
+        (('Pin Count',), lambda c: c('Pin Count') % 2 == 0,
+         "SOIC封装引脚数必须是偶数"),
+        (('Pad Length', 'Overall Width'), lambda c: c('Pad Length') < c('Overall Width'),
+         "焊盘长度必须小于总宽度"),
+        (('Pad Width', 'Lead Pitch'), lambda c: c('Pad Width') < c('Lead Pitch'),
+         "焊盘宽度必须小于引脚间距"),
+        (('Package Body Length', 'Pin Count', 'Lead Pitch'),
+         lambda c: (c('Pin Count') / 2 - 1) * c('Lead Pitch') + c('Pad Width') <= c('Package Body Length'),
+         "引脚排列超出封装体长度"),
+    ),
+    'QFN': (
+        (('Pad Width', 'Lead Pitch X'), lambda c: c('Pad Width') < c('Lead Pitch X'),
+         "焊盘宽度必须小于X方向间距"),
+        (('Pad Width', 'Lead Pitch Y'), lambda c: c('Pad Width') < c('Lead Pitch Y'),
+         "焊盘宽度必须小于Y方向间距"),
+        (('Package Body Size X', 'Pin Count X', 'Lead Pitch X'),
+         lambda c: (c('Pin Count X') - 1) * c('Lead Pitch X') + c('Pad Width') <= c('Package Body Size X'),
+         "X方向引脚排列超出封装体"),
+        (('Package Body Size Y', 'Pin Count Y', 'Lead Pitch Y'),
+         lambda c: (c('Pin Count Y') - 1) * c('Lead Pitch Y') + c('Pad Width') <= c('Package Body Size Y'),
+         "Y方向引脚排列超出封装体"),
+        (('Exposed Pad Size X', 'Package Body Size X'),
+         lambda c: c('Exposed Pad Size X') < c('Package Body Size X'),
+         "散热焊盘X尺寸必须小于封装体"),
+        (('Exposed Pad Size Y', 'Package Body Size Y'),
+         lambda c: c('Exposed Pad Size Y') < c('Package Body Size Y'),
+         "散热焊盘Y尺寸必须小于封装体"),
+    ),
+    'BGA': (
+        (('Ball Diameter', 'Ball Pitch X'), lambda c: c('Ball Diameter') < c('Ball Pitch X'),
+         "球直径必须小于X方向球间距"),
+        (('Ball Diameter', 'Ball Pitch Y'), lambda c: c('Ball Diameter') < c('Ball Pitch Y'),
+         "球直径必须小于Y方向球间距"),
+        (('Package Body Size X', 'Ball Count X', 'Ball Pitch X'),
+         lambda c: (c('Ball Count X') - 1) * c('Ball Pitch X') + c('Ball Diameter') <= c('Package Body Size X'),
+         "X方向球阵列超出封装体"),
+        (('Package Body Size Y', 'Ball Count Y', 'Ball Pitch Y'),
+         lambda c: (c('Ball Count Y') - 1) * c('Ball Pitch Y') + c('Ball Diameter') <= c('Package Body Size Y'),
+         "Y方向球阵列超出封装体"),
+    ),
+    'SOT': (
+        (('Pin Count',), lambda c: (c('Pin Count') == 3) | (c('Pin Count') == 5) | (c('Pin Count') == 6),
+         "SOT封装引脚数必须是3、5或6"),
+        (('Pad Length', 'Overall Width'), lambda c: c('Pad Length') < c('Overall Width'),
+         "焊盘长度必须小于总宽度"),
+        (('Pad Width', 'Lead Pitch'), lambda c: c('Pad Width') < c('Lead Pitch'),
+         "焊盘宽度必须小于引脚间距"),
+    ),
+    'DFN': (
+        (('Pin Count',), lambda c: c('Pin Count') % 2 == 0,
+         "DFN封装引脚数必须是偶数"),
+        (('Pad Width', 'Lead Pitch'), lambda c: c('Pad Width') < c('Lead Pitch'),
+         "焊盘宽度必须小于引脚间距"),
+        (('Package Body Size Y', 'Pin Count', 'Lead Pitch'),
+         lambda c: (c('Pin Count') / 2 - 1) * c('Lead Pitch') + c('Pad Width') <= c('Package Body Size Y'),
+         "引脚排列超出封装体"),
+        (('Exposed Pad Size X', 'Package Body Size X'),
+         lambda c: c('Exposed Pad Size X') < c('Package Body Size X'),
+         "散热焊盘X尺寸必须小于封装体"),
+        (('Exposed Pad Size Y', 'Package Body Size Y'),
+         lambda c: c('Exposed Pad Size Y') < c('Package Body Size Y'),
+         "散热焊盘Y尺寸必须小于封装体"),
+    ),
+    'QFP': (
+        (('Pad Width', 'Lead Pitch X'), lambda c: c('Pad Width') < c('Lead Pitch X'),
+         "焊盘宽度必须小于X方向间距"),
+        (('Pad Width', 'Lead Pitch Y'), lambda c: c('Pad Width') < c('Lead Pitch Y'),
+         "焊盘宽度必须小于Y方向间距"),
+        (('Package Body Size X', 'Overall Width X'),
+         lambda c: c('Package Body Size X') < c('Overall Width X'),
+         "X方向总宽度必须大于封装体"),
+        (('Package Body Size Y', 'Overall Width Y'),
+         lambda c: c('Package Body Size Y') < c('Overall Width Y'),
+         "Y方向总宽度必须大于封装体"),
+        (('Pad Length', 'Overall Width X'), lambda c: c('Pad Length') * 2 < c('Overall Width X'),
+         "焊盘长度必须小于X方向总宽度的一半"),
+        (('Pad Length', 'Overall Width Y'), lambda c: c('Pad Length') * 2 < c('Overall Width Y'),
+         "焊盘长度必须小于Y方向总宽度的一半"),
+    ),
+}
+# TSSOP与SOIC参数和规则相同
+REQUIRED['TSSOP'] = REQUIRED['SOIC']
+INTEGERS['TSSOP'] = INTEGERS['SOIC']
+RULES['TSSOP'] = RULES['SOIC']
+
+# 每种类型参与校验的参数列
+COLUMNS = {
+    'SOIC': ('Pin Count', 'Lead Pitch', 'Pad Width', 'Pad Length', 'Overall Width',
+             'Package Body Length', 'Package Body Width'),
+    'QFN': ('Pin Count X', 'Pin Count Y', 'Pad Width', 'Pad Length', 'Lead Pitch X', 'Lead Pitch Y',
+            'Package Body Size X', 'Package Body Size Y', 'Exposed Pad Size X', 'Exposed Pad Size Y'),
+    'BGA': ('Ball Pitch X', 'Ball Pitch Y', 'Ball Count X', 'Ball Count Y', 'Ball Diameter',
+            'Package Body Size X', 'Package Body Size Y'),
+    'SOT': ('Pin Count', 'Lead Pitch', 'Pad Width', 'Pad Length', 'Overall Width',
+            'Package Body Length', 'Package Body Width'),
+    'DFN': ('Pin Count', 'Lead Pitch', 'Pad Width', 'Pad Length', 'Package Body Size X',
+            'Package Body Size Y', 'Exposed Pad Size X', 'Exposed Pad Size Y'),
+    'QFP': ('Pin Count X', 'Pin Count Y', 'Pad Width', 'Pad Length', 'Lead Pitch X', 'Lead Pitch Y',
+            'Package Body Size X', 'Package Body Size Y', 'Overall Width X', 'Overall Width Y'),
+}
+COLUMNS['TSSOP'] = COLUMNS['SOIC']
+
+
+def _to_float(value):
+    if value is None or value == '':
+        return NAN
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return NAN
+
+
+def _soic_row(params):
+    """
+    SOIC焊盘尺寸缺失时与生成器一样按间距计算（'Lead Width/Length' 作为备选）
+    """
+    row = [_to_float(params.get(name)) for name in COLUMNS['SOIC']]
+    pitch = row[1]
+    for index, names, rule in ((2, ('Pad Width', 'Lead Width'), SOIC_PAD_WIDTH_RULE),
+                               (3, ('Pad Length', 'Lead Length'), SOIC_PAD_LENGTH_RULE)):
+        value = NAN
+        for name in names:
+            value = _to_float(params.get(name))
+            if not math.isnan(value):
+                break
+        if (math.isnan(value) or value <= 0) and pitch > 0:
+            value = soic_default_pad_dimension(pitch, rule)
+        row[index] = value
+    return row
+
+
+def _exposed_pad_row(package_type):
+    """没有散热焊盘时按0处理"""
+    columns = COLUMNS[package_type]
+    indices = [i for i, name in enumerate(columns) if name.startswith('Exposed Pad')]
+
+    def build(params):
+        row = [_to_float(params.get(name)) for name in columns]
+        for index in indices:
+            if math.isnan(row[index]):
+                row[index] = 0.0
+        return row
+    return build
+
+
+ROW_BUILDERS = {
+    'SOIC': _soic_row,
+    'TSSOP': _soic_row,
+    'QFN': _exposed_pad_row('QFN'),
+    'DFN': _exposed_pad_row('DFN'),
+}
+
+
+def _checks(package_type):
+    """
+    该类型的全部检查：(涉及的参数, 规则, 错误信息, 缺失值是否算作错误)
+    """
+    checks = []
+    for name in REQUIRED[package_type]:
+        checks.append(((name,), lambda c, name=name: c(name) > 0,
+                       f"{name} 必须是大于0的数值", True))
+    for name in INTEGERS[package_type]:
+        checks.append(((name,), lambda c, name=name: c(name) % 1 == 0,
+                       f"{name} 必须是整数", False))
+    for names, rule, message in RULES[package_type]:
+        checks.append((names, rule, message, False))
+    return checks
+
+
+def _failures_numpy(rows, columns, checks):
+    """
+    向量化：每条检查对整列计算一次，返回 [(行号, 检查序号)]
+    """
+    matrix = numpy.array(rows, dtype=float).reshape(len(rows), len(columns))
+    column_index = {name: i for i, name in enumerate(columns)}
+    finite = numpy.isfinite(matrix)
+
+    def column(name):
+        return matrix[:, column_index[name]]
+
+    failures = []
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        for check_index, (names, rule, _, strict) in enumerate(checks):
+            failed = ~numpy.asarray(rule(column), dtype=bool)
+            if not strict:
+                # 参数本身缺失或无效时不再检查其约束
+                for name in names:
+                    failed &= finite[:, column_index[name]]
+            failures.extend((int(row), check_index) for row in numpy.flatnonzero(failed))
+    return failures
+
+
+def _failures_python(rows, columns, checks):
+    """
+    没有 NumPy 时逐行计算同样的规则
+    """
+    column_index = {name: i for i, name in enumerate(columns)}
+    failures = []
+    for check_index, (names, rule, _, strict) in enumerate(checks):
+        for row_number, row in enumerate(rows):
+            if not strict and any(math.isnan(row[column_index[name]]) for name in names):
+                continue
+            try:
+                ok = rule(lambda name: row[column_index[name]])
+            except ZeroDivisionError:
+                ok = False
+            if not ok:
+                failures.append((row_number, check_index))
+    return failures
+
+
+def validate_packages(packages):
+    """
+    校验所有封装的数值规则
+
+    Args:
+        packages: [(package_type, params)]，params 为规范化后的参数字典
+
+    Returns:
+        与输入顺序一致的列表，每项为该封装的错误 [(参数名元组, 错误信息)]；
+        不支持的封装类型不做检查（生成时会报错）
+    """
+    results = [[] for _ in packages]
+
+    groups = {}
+    for index, (package_type, _) in enumerate(packages):
+        groups.setdefault(str(package_type or '').upper(), []).append(index)
+
+    for package_type, indices in groups.items():
+        if package_type not in RULES:
+            continue
+        columns = COLUMNS[package_type]
+        build_row = ROW_BUILDERS.get(package_type)
+        rows = []
+        for index in indices:
+            params = packages[index][1]
+            rows.append(build_row(params) if build_row
+                        else [_to_float(params.get(name)) for name in columns])
+
+        checks = _checks(package_type)
+        single_checks = len(REQUIRED[package_type]) + len(INTEGERS[package_type])
+        if numpy is not None:
+            failures = _failures_numpy(rows, columns, checks)
+        else:
+            failures = _failures_python(rows, columns, checks)
+
+        invalid_names = {}
+        for row_number, check_index in sorted(failures):
+            names, _, message, _ = checks[check_index]
+            bad = invalid_names.setdefault(row_number, set())
+            if check_index < single_checks:
+                bad.update(names)
+            elif bad.intersection(names):
+                # 参数本身已经无效时不再报告依赖它的约束
+                continue
+            results[indices[row_number]].append((names, message))
+
+    return results
+
+
+def error_cells(errors):
+    """
+    将错误列表转换为 参数名 -> 错误信息（用于标出表格中的单元格）
+    """
+    cells = {}
+    for names, message in errors:
+        for name in names:
+            cells.setdefault(name, message)
+    return cells